@@ -0,0 +1,299 @@
+"""
+Local HTTP API serving Tacoma 311 aggregates as JSON from the exported issues.
+
+Run from the repository root, next to exports/:
+
+    python -m api.server --port 8502
+
+Endpoints (GET):
+
+    /v1/district_counts          issues, acknowledged and closed per council district
+    /v1/department_resolution    median days to acknowledge, close and resolve per department
+    /v1/equity_per_capita        issues and issues per capita per equity tract
+    /v1/filters                  the values each filter parameter accepts
+
+Filters take the names of the dashboard's filter state: start_date and
+end_date (YYYY-MM-DD, whole days, defaulting to the whole export), district,
+police_district_sectors (repeatable), equity_index, summaries (repeatable),
+department, homeless_only and shelter_only (true or false). Values outside
+those /v1/filters lists are rejected with a 400:
+
+    /v1/district_counts?start_date=2025-01-01&summaries=Graffiti&summaries=Pothole
+
+Every response carries an ETag built from the filter state and the export's
+data version. Send it back in If-None-Match to get a 304 until the export
+changes. Responses are kept in an in-memory LRU cache, and the dataset is
+reloaded when the export file changes.
+
+Nothing here imports Streamlit, so the api container installs only the
+pinned packages in api/requirements.txt.
+"""
+import argparse
+import json
+import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+from streamlit_app.analytics.equity import tract_issue_counts
+from streamlit_app.analytics.frames import read_only
+from streamlit_app.analytics.group_metrics import compute_group_metrics
+from streamlit_app.data.dataset_identity import issues_data_version, canonical_value, view_key
+from streamlit_app.data.readers import read_issues, read_equity_attributes
+from streamlit_app.filters.bitmap_index import build_bitmap_index, select_bits, date_range_bits, bits_to_positions
+from streamlit_app.filters.selections import filter_selections, to_whole_days
+from streamlit_app.filters.time_index import created_bounds
+
+DEFAULT_PORT = 8502
+RESPONSE_CACHE_ENTRIES = 512
+
+LIST_PARAMS = ["police_district_sectors", "summaries"]
+SINGLE_PARAMS = ["start_date", "end_date", "district", "equity_index", "department", "homeless_only", "shelter_only"]
+TRUE_VALUES = {"1", "true", "yes"}
+FALSE_VALUES = {"0", "false", "no"}
+
+# Filter parameter and the indexed column whose values it accepts.
+# Keep in sync with filter_selections in streamlit_app/filters/selections.py.
+FILTER_COLUMNS = {
+    "district": "district_display",
+    "police_district_sectors": "police_district_sector",
+    "equity_index": "equityindex",
+    "summaries": "summary",
+    "department": "department",
+}
+PARAMS_BY_COLUMN = {column: param for param, column in FILTER_COLUMNS.items()}
+
+class BadRequest(ValueError):
+    pass
+
+# --- Aggregates
+
+def district_counts(view, dataset):
+    metrics = compute_group_metrics(view, 'district_display')
+    return metrics[['district_display', 'issue_count', 'acknowledged_count', 'closed_count']]
+
+def department_resolution(view, dataset):
+    metrics = compute_group_metrics(view, 'department')
+    return metrics[[
+        'department', 'issue_count', 'median_time_to_acknowledge', 'median_time_to_close', 'median_days_to_resolve',
+    ]]
+
+def equity_per_capita(view, dataset):
+    tracts = tract_issue_counts(view, dataset["equity_attributes"])
+    return tracts[['equity_id', 'equityindex', 'population', 'peopleofcolor', 'issue_count', 'issues_per_capita']]
+
+ENDPOINTS = {
+    "/v1/district_counts": district_counts,
+    "/v1/department_resolution": department_resolution,
+    "/v1/equity_per_capita": equity_per_capita,
+}
+
+# --- Dataset and response cache
+
+def new_state():
+    return {
+        "lock": threading.Lock(),
+        "dataset": None,
+        "responses": OrderedDict(),
+    }
+
+def load_dataset(version):
+    """The issues as a read-only view, their bitmap filter index and the equity tract attributes."""
+    df = read_issues()
+    return {
+        "version": version,
+        "issues": read_only(df),
+        "index": build_bitmap_index(df),
+        "equity_attributes": read_equity_attributes(),
+    }
+
+def current_dataset(state):
+    """The loaded dataset, reloaded (and the response cache emptied) when the export has changed."""
+    version = issues_data_version()
+    dataset = state["dataset"]
+    if dataset is not None and dataset["version"] == version:
+        return dataset
+
+    with state["lock"]:
+        if state["dataset"] is None or state["dataset"]["version"] != version:
+            logging.info(f"Loading issues export version {version}")
+            state["dataset"] = load_dataset(version)
+            state["responses"].clear()
+        return state["dataset"]
+
+def cached_response(state, etag, build):
+    """The response body for this ETag, built once and kept in the LRU cache."""
+    with state["lock"]:
+        if etag in state["responses"]:
+            state["responses"].move_to_end(etag)
+            return state["responses"][etag]
+
+    body = build()
+    with state["lock"]:
+        state["responses"][etag] = body
+        while len(state["responses"]) > RESPONSE_CACHE_ENTRIES:
+            state["responses"].popitem(last=False)
+    return body
+
+# --- Requests
+
+def parse_date(params, name):
+    try:
+        return datetime.strptime(params[name], "%Y-%m-%d")
+    except ValueError:
+        raise BadRequest(f"{name} must be a date like 2025-01-31")
+
+def parse_flag(params, name):
+    value = params.get(name, "false").lower()
+    if value not in TRUE_VALUES | FALSE_VALUES:
+        raise BadRequest(f"{name} must be true or false")
+    return value in TRUE_VALUES
+
+def parse_filter_state(query, dataset):
+    """The dashboard filter state for a query string, with the dataset's version."""
+    raw = parse_qs(query)
+    unknown = set(raw) - set(LIST_PARAMS) - set(SINGLE_PARAMS)
+    if unknown:
+        raise BadRequest(f"Unknown parameters: {', '.join(sorted(unknown))}")
+    params = {name: values[-1] for name, values in raw.items() if name in SINGLE_PARAMS}
+
+    if dataset["index"]["row_count"]:
+        first, last = (bound.to_pydatetime() for bound in created_bounds(dataset["index"]["time"]))
+    else:
+        first = last = datetime.today()
+    start_date = parse_date(params, "start_date") if "start_date" in params else first
+    end_date = parse_date(params, "end_date") if "end_date" in params else last
+    if start_date > end_date:
+        raise BadRequest("start_date must not be after end_date")
+
+    filter_state = {
+        "date_range": to_whole_days(start_date, end_date),
+        "district": params.get("district", "All"),
+        "police_district_sectors": raw.get("police_district_sectors", []),
+        "equity_index": params.get("equity_index", "All"),
+        "homeless_only": parse_flag(params, "homeless_only"),
+        "shelter_only": parse_flag(params, "shelter_only"),
+        "data_version": dataset["version"],
+    }
+    if "summaries" in raw:
+        filter_state["summaries"] = raw["summaries"]
+    if "department" in params:
+        filter_state["department"] = params["department"]
+    check_filter_values(filter_state, dataset)
+    return filter_state
+
+def check_filter_values(filter_state, dataset):
+    """Reject filter values the export does not have, which would otherwise match no issues."""
+    bitmaps = dataset["index"]["bitmaps"]
+    for column, values in filter_selections(filter_state):
+        if column not in PARAMS_BY_COLUMN:
+            continue
+        unknown = [value for value in values if value not in bitmaps[column]]
+        if unknown:
+            raise BadRequest(f"Unknown {PARAMS_BY_COLUMN[column]} values: {', '.join(unknown)}; see /v1/filters")
+
+def filtered_view(dataset, filter_state):
+    """The issues matching the filter state, selected through the bitmap index."""
+    index = dataset["index"]
+    bits = select_bits(index, filter_selections(filter_state)) & date_range_bits(index, filter_state["date_range"])
+    return dataset["issues"].take(bits_to_positions(index, bits))
+
+def filter_options(dataset):
+    """The values each filter parameter accepts, and the export's date bounds."""
+    bitmaps = dataset["index"]["bitmaps"]
+    options = {
+        param: sorted((value for value in bitmaps[column] if value is not None), key=str)
+        for param, column in FILTER_COLUMNS.items()
+    }
+    if dataset["index"]["row_count"]:
+        first, last = created_bounds(dataset["index"]["time"])
+        options["start_date"], options["end_date"] = first.date().isoformat(), last.date().isoformat()
+    return options
+
+def render(payload):
+    return json.dumps(canonical_value(payload), default=str).encode("utf-8")
+
+def aggregate_body(path, dataset, filter_state):
+    frame = ENDPOINTS[path](filtered_view(dataset, filter_state), dataset)
+    return render({
+        "data_version": dataset["version"],
+        "filters": {key: value for key, value in filter_state.items() if key != "data_version"},
+        "rows": json.loads(frame.to_json(orient="records")),
+    })
+
+def etag_matches(header, etag):
+    """Whether an If-None-Match header names this ETag (or any, with *)."""
+    if header is None:
+        return False
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+def make_handler(state):
+    class AggregateHandler(BaseHTTPRequestHandler):
+        server_version = "TacomaIssuesAPI/1.0"
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            try:
+                dataset = current_dataset(state)
+                if url.path == "/v1/filters":
+                    etag = f'"{view_key("filters", {"data_version": dataset["version"]})}"'
+                    build = lambda: render({"data_version": dataset["version"], "filters": filter_options(dataset)})
+                elif url.path in ENDPOINTS:
+                    filter_state = parse_filter_state(url.query, dataset)
+                    # The filter state carries the data version, so the ETag changes with the export.
+                    etag = f'"{view_key(url.path.rsplit("/", 1)[-1], filter_state)}"'
+                    build = lambda: aggregate_body(url.path, dataset, filter_state)
+                else:
+                    return self.send_json(404, {"error": f"Unknown endpoint {url.path}", "endpoints": list(ENDPOINTS) + ["/v1/filters"]})
+
+                if etag_matches(self.headers.get("If-None-Match"), etag):
+                    return self.send_body(304, None, etag)
+                return self.send_body(200, cached_response(state, etag, build), etag)
+            except BadRequest as e:
+                return self.send_json(400, {"error": str(e)})
+            except OSError as e:
+                logging.exception("Could not load the issues export")
+                return self.send_json(503, {"error": f"Issues export unavailable: {e}"})
+
+        def send_json(self, status, payload):
+            self.send_body(status, render(payload))
+
+        def send_body(self, status, body, etag=None):
+            self.send_response(status)
+            if etag is not None:
+                self.send_header("ETag", etag)
+                # Clients may keep responses but should revalidate them with the ETag.
+                self.send_header("Cache-Control", "no-cache")
+            if body is not None:
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            if body is not None:
+                self.wfile.write(body)
+
+    return AggregateHandler
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve Tacoma 311 aggregates as JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    state = new_state()
+    current_dataset(state)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    logging.info(f"Serving aggregates on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Check that the clustered map view resolves into single issues as it zooms in.
+
+    python -m benchmarks.cluster_check --rows 100000
+
+Clusters a synthetic workspace's issues around their mean location at every
+zoom level the map's slider offers. The issues in the deepest zoom's window
+are in every window, so each zoom level must show at least as many of them as
+single-issue points as the one below it, and the deepest more than the
+shallowest. Every issue in the viewport window must be in exactly one cluster,
+and the clusters must fit the window's cell grid. Exits with status 1 on any
+failure.
+"""
+import argparse
+import sys
+import numpy as np
+from streamlit.logger import set_log_level
+
+from benchmarks.suite import REPO_ROOT, DATA_DIR, prepare_workspace, working_directory
+
+# Keep in sync with the zoom slider in streamlit_app/visuals/issue_mapping.py.
+ZOOM_LEVELS = range(9, 17)
+
+def window_positions(pyramid, center, zoom):
+    """Row positions of the issues in the viewport window around the center."""
+    from streamlit_app.visuals.maps.point_pyramid import viewport_bounds
+    left, top, right, bottom = viewport_bounds(center, zoom)
+    x, y = pyramid["x"], pyramid["y"]
+    return pyramid["positions"][(x >= left) & (x <= right) & (y >= top) & (y <= bottom)]
+
+def max_clusters():
+    """Grid cells a viewport window can overlap: its size in cells plus a partial cell at each edge."""
+    from streamlit_app.visuals.maps.point_pyramid import VIEWPORT_PIXELS, CLUSTER_CELL_PIXELS
+    width, height = VIEWPORT_PIXELS
+    return (width // CLUSTER_CELL_PIXELS + 2) * (height // CLUSTER_CELL_PIXELS + 2)
+
+def run_checks(rows, seed, data_dir):
+    from streamlit_app.data.readers import read_issues
+    from streamlit_app.visuals.maps.point_pyramid import build_point_pyramid, cluster_points
+
+    workspace = prepare_workspace(rows, seed, data_dir)
+    with working_directory(workspace):
+        df = read_issues()
+    pyramid = build_point_pyramid(df)
+    center = (df['lat'].mean(), df['lng'].mean())
+
+    center_positions = window_positions(pyramid, center, ZOOM_LEVELS[-1])
+    print(f"{len(center_positions)} issues in the zoom {ZOOM_LEVELS[-1]} window around the center.")
+
+    failures = 0
+    center_singles = []
+    print(f"{'zoom':>4} {'clusters':>9} {'issues':>8} {'center singles':>15}")
+    for zoom in ZOOM_LEVELS:
+        clusters = cluster_points(pyramid, np.arange(len(df)), zoom, center)
+        single = clusters['count'].eq(1).to_numpy()
+        center_singles.append(int(np.isin(clusters['position'].to_numpy()[single], center_positions).sum()))
+        problems = []
+        if len(center_singles) > 1 and center_singles[-1] < center_singles[-2]:
+            problems.append("fewer single issues than the zoom level below")
+        if clusters['count'].sum() != len(window_positions(pyramid, center, zoom)):
+            problems.append("clusters do not cover the window's issues")
+        if len(clusters) > max_clusters():
+            problems.append(f"more than {max_clusters()} clusters")
+        failures += len(problems)
+        print(f"{zoom:>4} {len(clusters):>9} {int(clusters['count'].sum()):>8} {center_singles[-1]:>15}  {'; '.join(problems) or 'ok'}")
+
+    if center_singles[-1] <= center_singles[0]:
+        print(f"Zooming in from {ZOOM_LEVELS[0]} to {ZOOM_LEVELS[-1]} shows no more single issues.")
+        failures += 1
+    return 1 if failures else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check that the clustered map resolves into single issues when zooming in.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, REPO_ROOT)
+    set_log_level("error")
+    return run_checks(args.rows, args.seed, args.data_dir)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Run dashboard code without a Streamlit server.
+
+stub_streamlit() swaps the st.* display, layout and widget calls for no-ops
+that return each widget's default (or a scripted choice by label), so the
+data and visual functions can be timed on their own. Caching decorators are
+left alone. Install the stub before importing the visuals, since
+@st.fragment is applied at import time.
+"""
+from contextlib import contextmanager
+import streamlit as st
+
+DISPLAY_CALLS = [
+    "markdown", "write", "title", "header", "subheader", "caption", "text", "metric", "plotly_chart",
+    "dataframe", "table", "info", "warning", "error", "success", "divider", "json", "image", "html",
+]
+LAYOUT_CALLS = ["expander", "container", "empty", "spinner"]
+
+class SessionState(dict):
+    """Attribute and key access, like st.session_state."""
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __setattr__(self, name, value):
+        self[name] = value
+
+class Block:
+    """A layout block: a context manager whose display calls do nothing."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        if name not in DISPLAY_CALLS:
+            raise AttributeError(name)
+        return lambda *args, **kwargs: None
+
+def fragment(func=None, **kwargs):
+    """@st.fragment and @st.fragment(...) both leave the function as is."""
+    return func if func is not None else (lambda f: f)
+
+def widget_stubs(choices):
+    """Widgets returning choices[label] when scripted, otherwise their default."""
+    def choice(label, default):
+        return choices.get(label, default)
+
+    def radio(label, options, index=0, **kwargs):
+        return choice(label, list(options)[index])
+
+    def selectbox(label, options, index=0, **kwargs):
+        return choice(label, list(options)[index] if index is not None else None)
+
+    def multiselect(label, options, default=None, **kwargs):
+        return choice(label, list(default or []))
+
+    def slider(label, min_value=None, max_value=None, value=None, **kwargs):
+        return choice(label, value if value is not None else min_value)
+
+    def toggle(label, value=False, **kwargs):
+        return choice(label, value)
+
+    def button(label, **kwargs):
+        return choice(label, False)
+
+    def columns(spec, **kwargs):
+        return [Block() for _ in range(spec if isinstance(spec, int) else len(spec))]
+
+    return {
+        "radio": radio,
+        "selectbox": selectbox,
+        "multiselect": multiselect,
+        "slider": slider,
+        "toggle": toggle,
+        "checkbox": toggle,
+        "button": button,
+        "columns": columns,
+    }
+
+@contextmanager
+def stub_streamlit(choices=None):
+    """Replace Streamlit's display, layout and widget calls for the duration of the block."""
+    replacements = {name: (lambda *args, **kwargs: None) for name in DISPLAY_CALLS}
+    replacements.update({name: (lambda *args, **kwargs: Block()) for name in LAYOUT_CALLS})
+    replacements.update(widget_stubs(choices or {}))
+    replacements.update({
+        "fragment": fragment,
+        "session_state": SessionState(),
+        "query_params": {},
+    })
+
+    missing = object()
+    originals = {name: st.__dict__.get(name, missing) for name in replacements}
+    for name, replacement in replacements.items():
+        setattr(st, name, replacement)
+    try:
+        yield st.session_state
+    finally:
+        for name, original in originals.items():
+            if original is missing:
+                delattr(st, name)
+            else:
+                setattr(st, name, original)
@@ -0,0 +1,218 @@
+"""
+Concurrent-session load test for the dashboard.
+
+Runs N simulated sessions against streamlit_app.py at once through
+Streamlit's AppTest, each following a scripted sequence of tab and filter
+changes, and reports rerun latency, CPU use and resident memory for each
+session count:
+
+    python -m benchmarks.load_test --sessions 1,2,4,8
+    python -m benchmarks.load_test --sessions 1,4,16 --rows 500000 --think 1
+
+The sessions are threads in this process, as they are in a Streamlit server,
+so they share the process-wide caches and compete for the same GIL. A warm-up
+session runs first so the numbers reflect a server that has been up a while.
+"""
+import argparse
+import json
+import os
+import resource
+import sys
+import threading
+import time
+import numpy as np
+
+from benchmarks.suite import REPO_ROOT, DATA_DIR, prepare_workspace, working_directory
+
+APP_PATH = os.path.join(REPO_ROOT, "streamlit_app.py")
+RERUN_TIMEOUT_SECONDS = 300
+RSS_SAMPLE_SECONDS = 0.1
+
+# Scripted interactions. Each step is (widget, label, value): "section" switches
+# tabs, the other widgets are found by label. Selectbox values are option indexes,
+# since the options depend on the data.
+SCENARIOS = {
+    "browse_tabs": [
+        ("section", None, "Issue Overview"),
+        ("section", None, "Issues Over Time"),
+        ("section", None, "Aging Analysis"),
+        ("section", None, "Map"),
+        ("section", None, "City Council Districts"),
+        ("section", None, "Department Performance"),
+        ("section", None, "Equity Map"),
+    ],
+    "change_filters": [
+        ("section", None, "Issues Over Time"),
+        ("radio", "Select Date Range", "Rolling 1 Year"),
+        ("toggle", "Show only homeless-related issues", True),
+        ("selectbox", "Select Council District", 1),
+        ("toggle", "Show only homeless-related issues", False),
+        ("selectbox", "Select Council District", 0),
+        ("radio", "Select Date Range", "Previous 30 Days"),
+    ],
+    "district_review": [
+        ("section", None, "City Council Districts"),
+        ("selectbox", "Select Council District", 2),
+        ("section", None, "Equity Issues Analysis"),
+        ("selectbox", "Select Equity Index", 1),
+        ("section", None, "Data Table"),
+        ("selectbox", "Select Equity Index", 0),
+        ("selectbox", "Select Council District", 0),
+    ],
+}
+
+def find_widget(at, widget, label):
+    if widget == "section":
+        return at.radio(key="section")
+    for element in getattr(at, widget):
+        if element.label == label:
+            return element
+    raise LookupError(f"No {widget} labeled {label!r} on the page")
+
+def apply_step(at, step):
+    """Make one scripted change and rerun the app."""
+    widget, label, value = step
+    element = find_widget(at, widget, label)
+    if widget == "selectbox":
+        value = element.options[min(value, len(element.options) - 1)]
+    element.set_value(value).run(timeout=RERUN_TIMEOUT_SECONDS)
+
+def run_session(scenario, iterations, think_seconds, result):
+    """One simulated user: open the app, then repeat the scenario."""
+    from streamlit.testing.v1 import AppTest
+
+    try:
+        at = AppTest.from_file(APP_PATH, default_timeout=RERUN_TIMEOUT_SECONDS)
+        start = time.perf_counter()
+        at.run()
+        result["first_load"] = time.perf_counter() - start
+
+        for _ in range(iterations):
+            for step in SCENARIOS[scenario]:
+                if think_seconds:
+                    time.sleep(think_seconds)
+                start = time.perf_counter()
+                apply_step(at, step)
+                result["reruns"].append(time.perf_counter() - start)
+                result["errors"] += len(at.exception)
+    except Exception as e:
+        result["failure"] = f"{type(e).__name__}: {e}"
+
+def resident_megabytes():
+    """Current resident memory of this process, from /proc where available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError):
+        # Peak rather than current, in kilobytes on Linux and bytes on macOS.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def cpu_seconds():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+def run_load(session_count, iterations, think_seconds):
+    """Run session_count sessions at once and summarize their reruns."""
+    results = [
+        {"scenario": scenario, "reruns": [], "errors": 0, "first_load": None}
+        for scenario in (list(SCENARIOS)[i % len(SCENARIOS)] for i in range(session_count))
+    ]
+    threads = [
+        threading.Thread(target=run_session, args=(result["scenario"], iterations, think_seconds, result))
+        for result in results
+    ]
+
+    # Sample resident memory in the background for the peak while sessions run.
+    idle_rss = resident_megabytes()
+    peak_rss = [idle_rss]
+    done = threading.Event()
+
+    def sample_rss():
+        while not done.wait(RSS_SAMPLE_SECONDS):
+            peak_rss[0] = max(peak_rss[0], resident_megabytes())
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+
+    cpu_start = cpu_seconds()
+    wall_start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - wall_start
+    cpu = cpu_seconds() - cpu_start
+    done.set()
+    sampler.join()
+
+    reruns = np.array([latency for result in results for latency in result["reruns"]])
+    first_loads = np.array([result["first_load"] for result in results if result["first_load"] is not None])
+    return {
+        "sessions": session_count,
+        "reruns": len(reruns),
+        "p50_ms": round(float(np.percentile(reruns, 50)) * 1000, 1) if len(reruns) else None,
+        "p95_ms": round(float(np.percentile(reruns, 95)) * 1000, 1) if len(reruns) else None,
+        "max_ms": round(float(reruns.max()) * 1000, 1) if len(reruns) else None,
+        "first_load_p50_ms": round(float(np.percentile(first_loads, 50)) * 1000, 1) if len(first_loads) else None,
+        "reruns_per_second": round(len(reruns) / wall, 2),
+        "cpu_percent": round(cpu / wall * 100, 1),
+        "peak_rss_mb": round(peak_rss[0], 1),
+        "rss_per_session_mb": round((peak_rss[0] - idle_rss) / session_count, 1),
+        "errors": sum(result["errors"] for result in results),
+        "failures": [result["failure"] for result in results if "failure" in result],
+    }
+
+def format_row(summary):
+    return (
+        f"{summary['sessions']:>8} {summary['p50_ms']:>10} {summary['p95_ms']:>10} {summary['max_ms']:>10} "
+        f"{summary['reruns_per_second']:>10} {summary['cpu_percent']:>8} {summary['peak_rss_mb']:>10} "
+        f"{summary['rss_per_session_mb']:>12} {summary['errors'] + len(summary['failures']):>7}"
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the dashboard with concurrent simulated sessions.")
+    parser.add_argument("--sessions", default="1,2,4,8", help="Comma-separated concurrent session counts.")
+    parser.add_argument("--iterations", type=int, default=2, help="Times each session repeats its scenario.")
+    parser.add_argument("--think", type=float, default=0.5, help="Seconds each session pauses between interactions.")
+    parser.add_argument("--rows", type=int, help="Run against a synthetic dataset of this many rows instead of exports/.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--output", help="Also write the results as JSON to this path.")
+    args = parser.parse_args(argv)
+
+    from streamlit.logger import set_log_level
+    set_log_level("error")
+    sys.path.insert(0, REPO_ROOT)
+
+    workspace = REPO_ROOT
+    if args.rows:
+        workspace = prepare_workspace(args.rows, args.seed, args.data_dir)
+        styles = os.path.join(workspace, "styles.css")
+        if not os.path.exists(styles):
+            os.symlink(os.path.join(REPO_ROOT, "styles.css"), styles)
+
+    summaries = []
+    with working_directory(workspace):
+        # Warm the process-wide caches, as on a server that has been up a while.
+        warm_up = {"reruns": [], "errors": 0}
+        run_session("browse_tabs", 1, 0, warm_up)
+        if "failure" in warm_up:
+            print(f"Warm-up session failed: {warm_up['failure']}")
+            return 1
+
+        print(f"{'sessions':>8} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10} {'reruns/s':>10} {'cpu %':>8} {'rss MB':>10} {'MB/session':>12} {'errors':>7}")
+        for session_count in [int(count) for count in args.sessions.split(",")]:
+            summary = run_load(session_count, args.iterations, args.think)
+            summaries.append(summary)
+            print(format_row(summary), flush=True)
+            for failure in summary["failures"]:
+                print(f"  session failed: {failure}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(summaries, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
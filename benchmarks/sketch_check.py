@@ -0,0 +1,97 @@
+"""
+Check that the medians the views merge from the export's quantile sketches
+match the row-level medians they compute without them.
+
+    python -m benchmarks.sketch_check --rows 100000
+
+Builds the sketches with the export DAG on a synthetic workspace, then
+compares each sketch-backed view's median with its row-level fallback, per
+group, over the whole dataset. Below SKETCH_EXACT_DAYS the buckets hold exact
+day counts, so the medians must be equal; above it they must agree within
+half a bucket. Exits with status 1 on any mismatch.
+"""
+import argparse
+import sys
+import numpy as np
+import pandas as pd
+from streamlit.logger import set_log_level
+
+from benchmarks.suite import REPO_ROOT, DATA_DIR, prepare_workspace, working_directory, load_export_dag
+
+def district_resolution(df, sketches):
+    from streamlit_app.analytics.group_metrics import compute_group_metrics
+    from streamlit_app.analytics.resolution import resolution_by_group
+    from streamlit_app.data.load_sketches import merge_sketches
+    rows = resolution_by_group(compute_group_metrics(df, 'district_display'), 'district_display')
+    merged = resolution_by_group(merge_sketches(sketches['days_to_resolve'], ['district_display'], (0.5,)), 'district_display')
+    return rows.set_index('district_display')['median_days_to_resolve'], merged.set_index('district_display')['median_days_to_resolve']
+
+def department_resolution(df, sketches):
+    from streamlit_app.analytics.group_metrics import compute_group_metrics
+    from streamlit_app.analytics.resolution import resolution_by_group
+    from streamlit_app.data.load_sketches import merge_sketches
+    rows = resolution_by_group(compute_group_metrics(df, 'department'), 'department')
+    merged = resolution_by_group(merge_sketches(sketches['days_to_resolve'], ['department'], (0.5,)), 'department')
+    return rows.set_index('department')['median_days_to_resolve'], merged.set_index('department')['median_days_to_resolve']
+
+def aging(df, sketches):
+    from streamlit_app.analytics.aging import aging_summary, aging_summary_from_quantiles
+    from streamlit_app.data.load_sketches import merge_sketches
+    open_sketches = sketches['time_to_acknowledge'][sketches['time_to_acknowledge']['open_issue']]
+    rows = aging_summary(df)
+    merged = aging_summary_from_quantiles(merge_sketches(open_sketches, ['summary'], (0.5,)))
+    return rows.set_index('summary')['median_days_to_acknowledge'], merged.set_index('summary')['median_days_to_acknowledge']
+
+# View name and a function returning its row-level and sketch medians per group.
+CHECKS = {
+    "district resolution": district_resolution,
+    "department resolution": department_resolution,
+    "aging": aging,
+}
+
+def mismatches(row_medians, sketch_medians):
+    """Groups whose sketch median is off: exact below SKETCH_EXACT_DAYS, within half a bucket above."""
+    from streamlit_app.data.load_sketches import SKETCH_EXACT_DAYS, SKETCH_GROWTH
+
+    both = pd.concat([row_medians.rename('rows'), sketch_medians.rename('sketches')], axis=1)
+    tolerance = np.where(both['rows'] < SKETCH_EXACT_DAYS, 1e-9, both['rows'].abs() * (np.sqrt(SKETCH_GROWTH) - 1) + 1)
+    off = (both['rows'] - both['sketches']).abs() > tolerance
+    off |= both['rows'].isna() != both['sketches'].isna()
+    return both[off.to_numpy()]
+
+def run_checks(rows, seed, data_dir):
+    from streamlit_app.data.dataset_identity import issues_data_version
+    from streamlit_app.data.load_sketches import load_sketches
+    from streamlit_app.data.readers import read_issues
+
+    workspace = prepare_workspace(rows, seed, data_dir)
+    with working_directory(workspace):
+        load_export_dag(workspace).build_quantile_sketches()
+        df = read_issues()
+        sketches = load_sketches(issues_data_version())
+        if sketches is None:
+            print("The sketches were not built from the workspace's export.")
+            return 1
+
+        failures = 0
+        for name, check in CHECKS.items():
+            off = mismatches(*check(df, sketches))
+            failures += len(off)
+            print(f"{name:<24} {'ok' if off.empty else f'{len(off)} group(s) off'}")
+            if not off.empty:
+                print(off.to_string())
+    return 1 if failures else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare sketch medians with row-level medians on synthetic data.")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, REPO_ROOT)
+    set_log_level("error")
+    return run_checks(args.rows, args.seed, args.data_dir)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,475 @@
+"""
+Benchmarks for the export enrichment, data loading, filtering and visual
+compute paths, run headlessly on synthetic datasets of several sizes.
+
+    python -m benchmarks.suite --sizes 10000,100000 --save-baseline
+    python -m benchmarks.suite --sizes 10000,100000 --time-threshold 0.2
+
+Each stage reports its median time and peak traced memory per dataset size.
+Results are compared with the stored baseline; a stage that is slower or
+uses more memory than the baseline by more than its threshold is a
+regression and makes the run exit with status 1.
+
+The export's rollup cube, hotspot cells, quantile sketches and profile are
+built in each workspace with the export DAG's own functions. The plain visual
+stages run with filter_state=None, so they measure the row-level fallbacks;
+the _cold and _warm stages pass the filters' state, so they read the sidecars
+and go through the shared view and figure caches, starting from empty caches
+or from the caches the warm-up run filled.
+"""
+import argparse
+import gc
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+import types
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from streamlit.logger import set_log_level
+
+from benchmarks.headless import stub_streamlit
+from benchmarks import synthetic_issues
+from streamlit_app.analytics.frames import read_only
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = "bench_data"
+BASELINE_PATH = "benchmarks/baseline.json"
+DEFAULT_SIZES = [10_000, 100_000, 500_000]
+
+# The export DAG's per-record enrichment is slow, so it runs on at most this many rows.
+ENRICH_ROWS = 20_000
+
+# Widget choices for the benchmark runs: a year of data instead of the default 30 days.
+WIDGET_CHOICES = {
+    "Select Date Range": "Rolling 1 Year",
+}
+
+GEOJSON_FILES = [
+    synthetic_issues.COUNCIL_GEOJSON,
+    synthetic_issues.EQUITY_GEOJSON,
+    synthetic_issues.POLICE_GEOJSON,
+    synthetic_issues.SHELTER_GEOJSON,
+]
+
+# --- Datasets
+
+def prepare_workspace(rows, seed, data_dir=DATA_DIR, exports_dir=synthetic_issues.EXPORTS_DIR):
+    """
+    A directory laid out like the app's working directory, with a synthetic
+    export of this size and links to the boundary GeoJSONs. Reused when it exists.
+    """
+    workspace = os.path.abspath(os.path.join(data_dir, f"rows-{rows}-seed-{seed}"))
+    workspace_exports = os.path.join(workspace, "exports")
+    os.makedirs(workspace_exports, exist_ok=True)
+
+    for filename in GEOJSON_FILES:
+        target = os.path.join(workspace_exports, filename)
+        if not os.path.exists(target):
+            os.symlink(os.path.abspath(os.path.join(exports_dir, filename)), target)
+
+    dump_path = os.path.join(workspace_exports, "seeclickfix_issues_dump.parquet")
+    if not os.path.exists(dump_path):
+        layers = synthetic_issues.load_layers(exports_dir)
+        synthetic_issues.write_parquet(synthetic_issues.generate_issues(rows, seed, layers=layers), dump_path, layers)
+    return workspace
+
+@contextmanager
+def working_directory(path):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+def load_export_dag(workspace):
+    """
+    The export DAG module with its export and GeoJSON paths pointed at the workspace.
+    Airflow is replaced by placeholders when it is not installed, since only
+    the module's functions are used.
+    """
+    try:
+        import airflow  # noqa: F401
+    except ImportError:
+        placeholder = type("Placeholder", (), {
+            "__init__": lambda self, *args, **kwargs: None,
+            "__rshift__": lambda self, other: other,
+        })
+        for name in ["airflow", "airflow.operators", "airflow.operators.python"]:
+            sys.modules.setdefault(name, types.ModuleType(name))
+        sys.modules["airflow"].DAG = placeholder
+        sys.modules["airflow.operators.python"].PythonOperator = placeholder
+
+    # The DAGs import their shared helpers from the dags folder, as Airflow puts it on the path.
+    dags_dir = os.path.join(REPO_ROOT, "dags")
+    if dags_dir not in sys.path:
+        sys.path.insert(0, dags_dir)
+    path = os.path.join(dags_dir, "export_seeclickfix_issues.py")
+    spec = importlib.util.spec_from_file_location("export_seeclickfix_issues", path)
+    dag = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(dag)
+
+    for constant, filename in [
+        ("OUTPUT_FILE_PATH", "seeclickfix_issues_dump.parquet"),
+        ("ROLLUP_FILE_PATH", "seeclickfix_issues_rollup.parquet"),
+        ("HOTSPOT_FILE_PATH", "seeclickfix_hotspot_cells.parquet"),
+        ("PROFILE_FILE_PATH", "seeclickfix_issues_profile.json"),
+        ("SKETCH_FILE_PATH", "seeclickfix_issues_sketches.parquet"),
+        ("COUNCIL_GEOJSON_PATH", synthetic_issues.COUNCIL_GEOJSON),
+        ("EQUITY_GEOJSON_PATH", synthetic_issues.EQUITY_GEOJSON),
+        ("POLICE_GEOJSON_PATH", synthetic_issues.POLICE_GEOJSON),
+        ("SHELTER_GEOJSON_PATH", synthetic_issues.SHELTER_GEOJSON),
+    ]:
+        setattr(dag, constant, os.path.join(workspace, "exports", filename))
+    return dag
+
+SIDECAR_BUILDERS = ["build_rollup_cube", "update_hotspot_cells", "build_quantile_sketches", "write_dataset_profile"]
+
+def build_sidecars(workspace):
+    """Build the files the export DAG writes next to the export, from the workspace's export."""
+    dag = load_export_dag(workspace)
+    # A full hotspot count rather than an incremental update of the previous one.
+    if os.path.exists(dag.HOTSPOT_FILE_PATH):
+        os.remove(dag.HOTSPOT_FILE_PATH)
+    for builder in SIDECAR_BUILDERS:
+        getattr(dag, builder)()
+
+# --- Stages
+# Each stage is (name, setup, run): setup builds fresh inputs outside the timing,
+# run is the measured call. setup receives the shared context for the dataset.
+
+def export_stage(context):
+    dag = load_export_dag(context["workspace"])
+    raw = next(synthetic_issues.generate_issues(min(context["rows"], ENRICH_ROWS), context["seed"]))
+    output_path = os.path.join(tempfile.mkdtemp(), "export.parquet")
+
+    def setup():
+        return (raw.to_dict("records"),)
+
+    def run(records):
+        dag.enrich_records(records)
+        pd.DataFrame(records).to_parquet(output_path, engine="pyarrow", index=False)
+        return len(records)
+
+    return setup, run
+
+def load_issues_stage(context):
+    from streamlit_app.data.load_issues import load_issues
+    return (lambda: ()), (lambda: len(load_issues.__wrapped__()))
+
+def filter_index_stage(context):
+    from streamlit_app.filters.bitmap_index import build_bitmap_index
+    def run(df):
+        build_bitmap_index(df)
+        return len(df)
+
+    return (lambda: (context["df"],)), run
+
+def apply_filters_stage(context):
+    from streamlit_app.filters.filters import apply_filters
+    from streamlit_app.data.view_cache import get_view_cache
+
+    def setup():
+        get_view_cache.clear()
+        return context["df"], context["filter_index"]
+
+    def run(df, filter_index):
+        return len(apply_filters(df, filter_index)[0])
+
+    return setup, run
+
+def sidecar_stage(context):
+    def run():
+        build_sidecars(context["workspace"])
+        return context["rows"]
+
+    return (lambda: ()), run
+
+def visual_stage(call, cache=None):
+    """
+    A stage calling a visual on read-only views of the filtered and non-date
+    filtered rows. Without a cache mode the visual gets filter_state=None; with
+    "cold" or "warm" it gets the filters' state, and cold runs clear the app's
+    caches first, so the sidecars are read and the views computed again.
+    """
+    def stage(context):
+        import streamlit as st
+        filter_state = context["filter_state"] if cache else None
+
+        def setup():
+            if cache == "cold":
+                st.cache_data.clear()
+                st.cache_resource.clear()
+            return read_only(context["filtered_df"]), read_only(context["non_date_filtered_df"]), filter_state
+
+        def run(filtered_df, non_date_filtered_df, filter_state):
+            call(filtered_df, non_date_filtered_df, filter_state)
+            return len(filtered_df)
+
+        return setup, run
+    return stage
+
+def equity_tract_counts(filtered_df, non_date_filtered_df, filter_state):
+    from streamlit_app.visuals.equity_map import get_equity_data
+    get_equity_data(filtered_df)
+
+def heads_up(filtered_df, non_date_filtered_df, filter_state):
+    from streamlit_app.visuals.heads_up import heads_up
+    heads_up(non_date_filtered_df, filter_state)
+
+def issues_over_time(filtered_df, non_date_filtered_df, filter_state):
+    from streamlit_app.visuals.issues_over_time import display_issues_over_time
+    display_issues_over_time(filtered_df, filter_state)
+
+def aging_analysis(filtered_df, non_date_filtered_df, filter_state):
+    from streamlit_app.visuals.aging_analysis import display_aging_analysis
+    display_aging_analysis(filtered_df, filter_state, non_date_filtered_df)
+
+def council_districts(filtered_df, non_date_filtered_df, filter_state):
+    from streamlit_app.visuals.council_district_review import council_districts
+    council_districts(filtered_df, filter_state)
+
+def department_performance(filtered_df, non_date_filtered_df, filter_state):
+    from streamlit_app.visuals.department_performance import display_department_performance
+    display_department_performance(filtered_df, filter_state)
+
+def issue_summary(filtered_df, non_date_filtered_df, filter_state):
+    from streamlit_app.visuals.issue_summary_chart import display_issue_summary
+    display_issue_summary(filtered_df, filter_state)
+
+def assignee_resolution_time(filtered_df, non_date_filtered_df, filter_state):
+    from streamlit_app.visuals.assignee_resolution_time import display_assignee_resolution_time
+    display_assignee_resolution_time(filtered_df, filter_state)
+
+def assignee_performance(filtered_df, non_date_filtered_df, filter_state):
+    from streamlit_app.visuals.assignee_performance import display_assignee_performance
+    display_assignee_performance(filtered_df, filter_state)
+
+def equity_issues_analysis(filtered_df, non_date_filtered_df, filter_state):
+    from streamlit_app.data.load_equity import load_equity_population
+    from streamlit_app.visuals.equity_issues_analysis import display_equity_issues_analysis
+    display_equity_issues_analysis(filtered_df, load_equity_population(), filter_state)
+
+def chronic_areas(filtered_df, non_date_filtered_df, filter_state):
+    from streamlit_app.visuals.chronic_areas import display_chronic_areas
+    display_chronic_areas(filter_state)
+
+STAGES = {
+    "export_to_parquet": export_stage,
+    "load_issues": load_issues_stage,
+    "load_filter_index": filter_index_stage,
+    "apply_filters": apply_filters_stage,
+    "equity_tract_counts": visual_stage(equity_tract_counts),
+    "heads_up": visual_stage(heads_up),
+    "issues_over_time": visual_stage(issues_over_time),
+    "aging_analysis": visual_stage(aging_analysis),
+    "council_districts": visual_stage(council_districts),
+    "department_performance": visual_stage(department_performance),
+    "issue_summary": visual_stage(issue_summary),
+    "assignee_resolution_time": visual_stage(assignee_resolution_time),
+    "assignee_performance": visual_stage(assignee_performance),
+    "equity_issues_analysis": visual_stage(equity_issues_analysis),
+    "build_sidecars": sidecar_stage,
+}
+
+# The visuals that read the rollup cube, sketches or hotspot cells, or go
+# through the view or figure cache when given a filter state.
+CACHED_VISUALS = {
+    "heads_up": heads_up,
+    "issues_over_time": issues_over_time,
+    "aging_analysis": aging_analysis,
+    "council_districts": council_districts,
+    "department_performance": department_performance,
+    "issue_summary": issue_summary,
+    "assignee_resolution_time": assignee_resolution_time,
+    "equity_issues_analysis": equity_issues_analysis,
+    "chronic_areas": chronic_areas,
+}
+for name, call in CACHED_VISUALS.items():
+    for cache in ["cold", "warm"]:
+        STAGES[f"{name}_{cache}"] = visual_stage(call, cache)
+
+# --- Measurement
+
+def measure(setup, run, repeat):
+    """
+    Median and best time over repeat runs, after one untimed warm-up run that
+    also loads any lazily imported modules, then peak traced memory from one more run.
+    """
+    run(*setup())
+
+    seconds = []
+    for _ in range(repeat):
+        args = setup()
+        gc.collect()
+        start = time.perf_counter()
+        rows = run(*args)
+        seconds.append(time.perf_counter() - start)
+
+    # Tracing slows allocations down, so memory is measured on its own run.
+    args = setup()
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(*args)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "rows": rows,
+        "seconds": round(float(np.median(seconds)), 4),
+        "best_seconds": round(min(seconds), 4),
+        "peak_mb": round(peak / (1024 * 1024), 2),
+    }
+
+def build_context(rows, seed, data_dir):
+    """
+    Build the export's sidecars, load the dataset once and run the filters
+    with the benchmark's widget choices.
+    """
+    from streamlit_app.data.load_issues import load_issues
+    from streamlit_app.filters.bitmap_index import build_bitmap_index
+    from streamlit_app.filters.filters import apply_filters
+    from streamlit_app.data.dataset_identity import issues_data_version
+
+    workspace = prepare_workspace(rows, seed, data_dir)
+    build_sidecars(workspace)
+    with working_directory(workspace):
+        df = load_issues.__wrapped__()
+        filter_index = build_bitmap_index(df)
+        filter_index["data_version"] = issues_data_version()
+        filtered_df, non_date_filtered_df, filter_state = apply_filters(df, filter_index)
+
+    return {
+        "rows": rows,
+        "seed": seed,
+        "workspace": workspace,
+        "df": df,
+        "filter_index": filter_index,
+        "filtered_df": filtered_df,
+        "non_date_filtered_df": non_date_filtered_df,
+        "filter_state": filter_state,
+    }
+
+def run_suite(sizes, stages, seed=0, repeat=3, data_dir=DATA_DIR):
+    """Results keyed by 'stage@rows'."""
+    import streamlit as st
+
+    results = {}
+    with stub_streamlit(WIDGET_CHOICES):
+        for rows in sizes:
+            context = build_context(rows, seed, data_dir)
+            with working_directory(context["workspace"]):
+                for name in stages:
+                    st.cache_data.clear()
+                    st.cache_resource.clear()
+                    setup, run = STAGES[name](context)
+                    results[f"{name}@{rows}"] = {"stage": name, "dataset_rows": rows, **measure(setup, run, repeat)}
+                    print(format_row(f"{name}@{rows}", results[f"{name}@{rows}"]), flush=True)
+    return results
+
+# --- Baseline comparison
+
+def compare(results, baseline, time_threshold, memory_threshold, time_floor=0.0):
+    """
+    Compare results with the baseline. Returns one entry per stage found in
+    both, flagged as a regression when time or memory grew past its threshold.
+    Slowdowns of less than time_floor seconds are treated as noise.
+    """
+    comparisons = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        base = baseline[key]
+        time_ratio = result["seconds"] / base["seconds"] if base["seconds"] else None
+        slower = result["seconds"] - base["seconds"] > time_floor
+        memory_ratio = result["peak_mb"] / base["peak_mb"] if base["peak_mb"] else None
+        comparisons.append({
+            "key": key,
+            "time_ratio": time_ratio,
+            "memory_ratio": memory_ratio,
+            "regression": bool(
+                (time_ratio is not None and slower and time_ratio > 1 + time_threshold)
+                or (memory_ratio is not None and memory_ratio > 1 + memory_threshold)
+            ),
+        })
+    return comparisons
+
+def format_row(key, result):
+    return f"{key:<40} {result['seconds'] * 1000:>10.1f} ms {result['peak_mb']:>10.1f} MB  ({result['rows']} rows)"
+
+def format_ratio(ratio):
+    return "n/a" if ratio is None else f"{ratio:.2f}x"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard's data and compute paths on synthetic data.")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated dataset sizes in rows.")
+    parser.add_argument("--stages", default=",".join(STAGES), help="Comma-separated stages to run.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage.")
+    parser.add_argument("--data-dir", default=DATA_DIR, help="Where the synthetic datasets are kept.")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the baseline.")
+    parser.add_argument("--time-threshold", type=float, default=0.25, help="Allowed slowdown, as a fraction.")
+    parser.add_argument("--time-floor", type=float, default=0.01,
+                        help="Slowdowns shorter than this many seconds are not regressions.")
+    parser.add_argument("--memory-threshold", type=float, default=0.25, help="Allowed peak memory growth, as a fraction.")
+    parser.add_argument("--output", help="Also write the results as JSON to this path.")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")]
+    stages = args.stages.split(",")
+    unknown = [name for name in stages if name not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages: {', '.join(unknown)}")
+
+    # Stages run inside the dataset workspaces, so import the app from the repo root.
+    sys.path.insert(0, REPO_ROOT)
+    # Caches warn on every call without a Streamlit runtime.
+    set_log_level("error")
+    results = run_suite(sizes, stages, args.seed, args.repeat, args.data_dir)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Saved {len(results)} results to {args.baseline}.")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to store one.")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    comparisons = compare(results, baseline, args.time_threshold, args.memory_threshold, args.time_floor)
+
+    print()
+    print(f"{'Compared with ' + args.baseline:<40} {'time':>13} {'memory':>13}")
+    for comparison in comparisons:
+        flag = "  REGRESSION" if comparison["regression"] else ""
+        print(f"{comparison['key']:<40} {format_ratio(comparison['time_ratio']):>13} {format_ratio(comparison['memory_ratio']):>13}{flag}")
+
+    regressions = [comparison for comparison in comparisons if comparison["regression"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) past the thresholds.")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
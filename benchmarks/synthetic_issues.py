@@ -0,0 +1,532 @@
+"""
+Synthetic Tacoma issues for scale testing.
+
+Writes seeclickfix_issues rows at any scale, reproducible from a seed and
+without network access. Points are sampled inside the equity tract polygons
+in exports/ (weighted by tract population, with a share piled onto a fixed
+set of chronic locations), summaries and assignees follow a realistic mix,
+and each issue gets a consistent created / acknowledged / closed lifecycle.
+
+Either load the rows into Postgres, where the export DAG picks them up:
+
+    python -m benchmarks.synthetic_issues --rows 1000000 --postgres --host localhost
+
+or skip the database and write the enriched Parquet export directly:
+
+    python -m benchmarks.synthetic_issues --rows 1000000 --parquet exports/seeclickfix_issues_dump.parquet
+"""
+import argparse
+import json
+import logging
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import shapely
+from shapely.geometry import shape
+
+EXPORTS_DIR = "exports"
+COUNCIL_GEOJSON = "City_Council_Districts.geojson"
+EQUITY_GEOJSON = "Equity_Index_2024_(Tacoma).geojson"
+POLICE_GEOJSON = "Police_Districts_(Tacoma).geojson"
+SHELTER_GEOJSON = "Estimated10BlockDistancefromShelterView_-7990954508892049150.geojson"
+
+# Rows are generated and written in fixed-size chunks, each from its own
+# child seed, so memory stays flat and output depends only on seed and rows.
+CHUNK_ROWS = 250_000
+
+# Synthetic ids start well above SeeClickFix's so they never overwrite real issues.
+SYNTHETIC_ID_START = 1_000_000_000
+
+# Share of issues reported at a small set of chronic locations, and how many there are.
+CHRONIC_SHARE = 0.15
+CHRONIC_LOCATIONS = 400
+CHRONIC_JITTER_DEGREES = 0.0005
+
+# Issues that closed this long before the end of the range are archived.
+ARCHIVE_AFTER_DAYS = 90
+
+# Same connection as the DAGs, reached from the host through the published port by default.
+# Keep in sync with DB_CONN_PARAMS in dags/seeclickfix.py.
+DB_CONN_PARAMS = {
+    "dbname": "airflow",
+    "user": "airflow",
+    "password": "airflow",
+    "host": "postgres",
+    "port": 5432,
+}
+
+# Columns of the seeclickfix_issues table, in table order.
+# Keep in sync with store_data in dags/seeclickfix.py.
+ISSUE_COLUMNS = [
+    "id", "description", "status", "created_at", "updated_at", "lat", "lng", "acknowledged_at",
+    "address", "closed_at", "comment_url", "comment_count", "html_url", "rating", "shortened_url",
+    "summary", "url", "vote_count", "votes", "assignee_id", "assignee_name", "assignee_role",
+    "reporter_id", "reporter_name", "reporter_role", "request_type_id", "request_type_title",
+    "request_type_organization",
+]
+
+CREATE_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS seeclickfix_issues (
+    id BIGINT PRIMARY KEY,
+    description TEXT,
+    status TEXT,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    lat DOUBLE PRECISION,
+    lng DOUBLE PRECISION,
+    acknowledged_at TIMESTAMP,
+    address TEXT,
+    closed_at TIMESTAMP,
+    comment_url TEXT,
+    comment_count INT,
+    html_url TEXT,
+    rating TEXT,
+    shortened_url TEXT,
+    summary TEXT,
+    url TEXT,
+    vote_count INT,
+    votes TEXT,
+    assignee_id BIGINT,
+    assignee_name TEXT,
+    assignee_role TEXT,
+    reporter_id BIGINT,
+    reporter_name TEXT,
+    reporter_role TEXT,
+    request_type_id BIGINT,
+    request_type_title TEXT,
+    request_type_organization TEXT
+);
+"""
+
+# Spatial attributes the export DAG adds, keyed by export column with the GeoJSON property they come from.
+# Keep in sync with export_to_parquet in dags/export_seeclickfix_issues.py.
+COUNCIL_ATTRIBUTES = {
+    "councilmember": "councilmember",
+    "councilmember_email": "councilmember_email",
+    "councilmember_photo": "councilmember_photo",
+    "council_district": "dist_id",
+    "councilmember_phonenumber": "phonenumber",
+    "councilmember_supportstaff": "supportstaff",
+    "councilmember_supportstaff_email": "supportstaff_email",
+    "councilmember_webpage": "webpage",
+}
+EQUITY_ATTRIBUTES = {
+    "equityindex": "equityindex",
+    "livabilityindex": "livabilityindex",
+    "accessibilityindex": "accessibilityindex",
+    "economicindex": "economicindex",
+    "educationindex": "educationindex",
+    "environmentalindex": "environmentalindex",
+    "averagepavementcondition": "averagepavementcondition",
+    "householdvehicleaccess": "householdvehicleaccess",
+    "parksopenspace": "parksopenspace",
+    "equity_objectid": "objectid",
+}
+POLICE_ATTRIBUTES = {
+    "police_sector": "sector",
+    "police_district": "district",
+}
+SHELTER_NAME_PROPERTY = "Shelter_Name"
+
+# Request types: share of issues, assignees, acknowledge and close rates, median
+# days to each step, and descriptions. Assignee prefixes are DEPARTMENT_MAPPING keys.
+REQUEST_TYPES = [
+    {
+        "summary": "Illegal Dumping",
+        "weight": 0.22,
+        "assignees": ["ES_Illegal Dumping Response", "ES_Solid Waste Field Ops"],
+        "acknowledge_rate": 0.92, "close_rate": 0.88, "acknowledge_days": 1.0, "close_days": 6.0,
+        "descriptions": ["Couch and mattress dumped on the sidewalk", "Pile of garbage bags in the alley",
+                         "Tires dumped by the side of the road", "Construction debris left on the curb"],
+    },
+    {
+        "summary": "Homeless Encampment",
+        "weight": 0.14,
+        "assignees": ["NCS_Homeless Engagement", "NCS_Encampment Response"],
+        "acknowledge_rate": 0.85, "close_rate": 0.7, "acknowledge_days": 2.0, "close_days": 21.0,
+        "descriptions": ["Tents set up on the sidewalk", "Homeless camp near the overpass",
+                         "Encampment blocking the path", "RV with people living in it parked for weeks"],
+    },
+    {
+        "summary": "Someone Living On Public Property",
+        "weight": 0.04,
+        "assignees": ["NCS_Homeless Engagement"],
+        "acknowledge_rate": 0.8, "close_rate": 0.65, "acknowledge_days": 2.0, "close_days": 18.0,
+        "descriptions": ["Person sleeping in the park shelter", "Someone living under the bridge"],
+    },
+    {
+        "summary": "Graffiti",
+        "weight": 0.1,
+        "assignees": ["ES_Graffiti Abatement", "PW_Graffiti Crew"],
+        "acknowledge_rate": 0.9, "close_rate": 0.86, "acknowledge_days": 1.5, "close_days": 9.0,
+        "descriptions": ["Tagging on the retaining wall", "Graffiti on the bus shelter", "Spray paint on the utility box"],
+    },
+    {
+        "summary": "Pothole",
+        "weight": 0.1,
+        "assignees": ["PW_Street Maintenance", "Public Works - Streets - TD"],
+        "acknowledge_rate": 0.9, "close_rate": 0.75, "acknowledge_days": 2.0, "close_days": 25.0,
+        "descriptions": ["Large pothole in the travel lane", "Pothole keeps getting bigger", "Deep hole near the crosswalk"],
+    },
+    {
+        "summary": "Abandoned Vehicle",
+        "weight": 0.09,
+        "assignees": ["TPD_Abandoned Vehicles", "Police Department - Traffic - JN"],
+        "acknowledge_rate": 0.88, "close_rate": 0.8, "acknowledge_days": 3.0, "close_days": 14.0,
+        "descriptions": ["Car with expired tabs parked for a month", "Vehicle with flat tires hasn't moved",
+                         "Abandoned trailer on the street"],
+    },
+    {
+        "summary": "Overgrown Vegetation",
+        "weight": 0.07,
+        "assignees": ["NCS_Code Compliance", "PDS Code Case"],
+        "acknowledge_rate": 0.8, "close_rate": 0.7, "acknowledge_days": 4.0, "close_days": 40.0,
+        "descriptions": ["Blackberries covering the sidewalk", "Tree branches blocking the stop sign",
+                         "Overgrown yard at a vacant house"],
+    },
+    {
+        "summary": "Street Light Out",
+        "weight": 0.06,
+        "assignees": ["TPU_Street Lighting"],
+        "acknowledge_rate": 0.85, "close_rate": 0.8, "acknowledge_days": 3.0, "close_days": 12.0,
+        "descriptions": ["Street light out at the corner", "Light flickering all night", "Several lights out on the block"],
+    },
+    {
+        "summary": "Traffic Signal Issue",
+        "weight": 0.04,
+        "assignees": ["Public Works - Traffic - JK", "PW_Traffic Signals"],
+        "acknowledge_rate": 0.95, "close_rate": 0.9, "acknowledge_days": 0.5, "close_days": 3.0,
+        "descriptions": ["Signal stuck on red", "Walk signal not working", "Left turn arrow never turns green"],
+    },
+    {
+        "summary": "Sidewalk Damage",
+        "weight": 0.05,
+        "assignees": ["PW_Sidewalk Program", "Public Works - D.S."],
+        "acknowledge_rate": 0.75, "close_rate": 0.5, "acknowledge_days": 5.0, "close_days": 60.0,
+        "descriptions": ["Sidewalk lifted by tree roots", "Broken curb ramp", "Trip hazard in the sidewalk"],
+    },
+    {
+        "summary": "Nuisance Property",
+        "weight": 0.05,
+        "assignees": ["NCS_Code Compliance", "PDS Code Case", "CED_Neighborhood Business"],
+        "acknowledge_rate": 0.78, "close_rate": 0.6, "acknowledge_days": 5.0, "close_days": 45.0,
+        "descriptions": ["Junk piled in the front yard", "Vacant house left open", "Trash accumulating behind the building"],
+    },
+    {
+        "summary": "Other",
+        "weight": 0.04,
+        "assignees": ["311 Customer Support Center", "CMO_Community Relations", "OEHR_Intake", "Fire_Prevention"],
+        "acknowledge_rate": 0.7, "close_rate": 0.65, "acknowledge_days": 3.0, "close_days": 10.0,
+        "descriptions": ["General question for the city", "Not sure who to contact about this", "Follow-up on an earlier report"],
+    },
+]
+
+# Log-normal spread of response times around each request type's median.
+RESPONSE_SIGMA = 1.1
+
+# Relative reporting volume by weekday (Monday first) and hour of day.
+WEEKDAY_WEIGHTS = [1.15, 1.1, 1.1, 1.05, 1.0, 0.75, 0.7]
+HOUR_WEIGHTS = [0.2, 0.1, 0.1, 0.1, 0.2, 0.4, 0.8, 1.2, 1.6, 1.8, 1.8, 1.7,
+                1.6, 1.6, 1.5, 1.5, 1.4, 1.3, 1.1, 1.0, 0.9, 0.7, 0.5, 0.3]
+
+STREET_NAMES = [
+    "Pacific Ave", "S Tacoma Way", "6th Ave", "N Pearl St", "Portland Ave E", "S 38th St", "S 56th St",
+    "Hosmer St", "McKinley Ave E", "S Union Ave", "N Proctor St", "E 72nd St", "S Sprague Ave",
+    "Martin Luther King Jr Way", "E 34th St", "S 19th St", "Yakima Ave", "E Portland Ave", "S 96th St",
+]
+
+def load_layer(exports_dir, filename):
+    """Parsed geometries and properties of a boundary GeoJSON in exports/."""
+    with open(os.path.join(exports_dir, filename), "r", encoding="utf-8") as f:
+        features = json.load(f)["features"]
+    geometries = [shape(feature["geometry"]) for feature in features]
+    for geometry in geometries:
+        shapely.prepare(geometry)
+    return geometries, [feature["properties"] for feature in features]
+
+def load_layers(exports_dir=EXPORTS_DIR):
+    return {
+        "council": load_layer(exports_dir, COUNCIL_GEOJSON),
+        "equity": load_layer(exports_dir, EQUITY_GEOJSON),
+        "police": load_layer(exports_dir, POLICE_GEOJSON),
+        "shelter": load_layer(exports_dir, SHELTER_GEOJSON),
+    }
+
+def sample_in_polygon(rng, geometry, count):
+    """Rejection-sample count points inside a polygon from its bounding box."""
+    min_x, min_y, max_x, max_y = geometry.bounds
+    lng = np.empty(0)
+    lat = np.empty(0)
+    while len(lng) < count:
+        # Oversample by the polygon's share of its bounding box.
+        fill = max(geometry.area / ((max_x - min_x) * (max_y - min_y)), 0.05)
+        batch = int((count - len(lng)) / fill * 1.2) + 8
+        x = rng.uniform(min_x, max_x, batch)
+        y = rng.uniform(min_y, max_y, batch)
+        inside = shapely.contains_xy(geometry, x, y)
+        lng = np.concatenate([lng, x[inside]])
+        lat = np.concatenate([lat, y[inside]])
+    return lng[:count], lat[:count]
+
+def sample_points(rng, tracts, weights, count):
+    """Sample points across the equity tracts, weighted per tract."""
+    tract = rng.choice(len(tracts), size=count, p=weights)
+    lng = np.empty(count)
+    lat = np.empty(count)
+    for index in np.unique(tract):
+        rows = np.flatnonzero(tract == index)
+        lng[rows], lat[rows] = sample_in_polygon(rng, tracts[index], len(rows))
+    return lng, lat
+
+def build_plan(seed, layers, start, end):
+    """
+    Everything shared across chunks: tract weights, the chronic locations
+    and the calendar's daily reporting weights.
+    """
+    rng = np.random.default_rng(np.random.SeedSequence(seed).spawn(1)[0])
+    tracts, tract_properties = layers["equity"]
+    population = np.array([max(properties.get("population") or 0, 1) for properties in tract_properties], dtype=float)
+    tract_weights = population / population.sum()
+
+    chronic_lng, chronic_lat = sample_points(rng, tracts, tract_weights, CHRONIC_LOCATIONS)
+    chronic_weights = rng.pareto(1.2, CHRONIC_LOCATIONS) + 1
+    chronic_summary = rng.choice(len(REQUEST_TYPES), size=CHRONIC_LOCATIONS, p=summary_weights())
+
+    days = pd.date_range(start, end, freq="D", inclusive="left")
+    # A mild seasonal swing, busiest in late summer.
+    seasonal = 1 + 0.2 * np.sin(2 * np.pi * (days.dayofyear.to_numpy() - 140) / 365.25)
+    day_weights = np.array(WEEKDAY_WEIGHTS)[days.dayofweek.to_numpy()] * seasonal
+
+    return {
+        "tract_weights": tract_weights,
+        "chronic_lng": chronic_lng,
+        "chronic_lat": chronic_lat,
+        "chronic_weights": chronic_weights / chronic_weights.sum(),
+        "chronic_summary": chronic_summary,
+        "days": days.to_numpy(),
+        "day_weights": day_weights / day_weights.sum(),
+        "end": np.datetime64(pd.Timestamp(end)),
+    }
+
+def summary_weights():
+    weights = np.array([request_type["weight"] for request_type in REQUEST_TYPES])
+    return weights / weights.sum()
+
+def generate_chunk(rng, plan, layers, first_id, count):
+    """One chunk of seeclickfix_issues rows, as a frame with the table's columns."""
+    # --- Where: population-weighted points, with a share at chronic locations
+    lng, lat = sample_points(rng, layers["equity"][0], plan["tract_weights"], count)
+    type_index = rng.choice(len(REQUEST_TYPES), size=count, p=summary_weights())
+
+    chronic = rng.random(count) < CHRONIC_SHARE
+    location = rng.choice(CHRONIC_LOCATIONS, size=chronic.sum(), p=plan["chronic_weights"])
+    lng[chronic] = plan["chronic_lng"][location] + rng.normal(0, CHRONIC_JITTER_DEGREES, len(location))
+    lat[chronic] = plan["chronic_lat"][location] + rng.normal(0, CHRONIC_JITTER_DEGREES, len(location))
+    # Most reports at a chronic location are about the same thing.
+    same_type = rng.random(len(location)) < 0.7
+    type_index[np.flatnonzero(chronic)[same_type]] = plan["chronic_summary"][location[same_type]]
+
+    # --- When: weighted days and hours, then the lifecycle
+    day = rng.choice(plan["days"], size=count, p=plan["day_weights"])
+    hours = np.array(HOUR_WEIGHTS) / np.sum(HOUR_WEIGHTS)
+    seconds = rng.choice(24, size=count, p=hours) * 3600 + rng.integers(0, 3600, count)
+    created_at = day + seconds.astype("timedelta64[s]")
+
+    acknowledge_rate = np.array([t["acknowledge_rate"] for t in REQUEST_TYPES])[type_index]
+    close_rate = np.array([t["close_rate"] for t in REQUEST_TYPES])[type_index]
+    acknowledge_days = np.array([t["acknowledge_days"] for t in REQUEST_TYPES])[type_index]
+    close_days = np.array([t["close_days"] for t in REQUEST_TYPES])[type_index]
+
+    to_seconds = lambda days: (days * 86400).astype("int64").astype("timedelta64[s]")
+    acknowledged_at = created_at + to_seconds(rng.lognormal(np.log(acknowledge_days), RESPONSE_SIGMA))
+    closed_at = np.maximum(created_at, acknowledged_at) + to_seconds(rng.lognormal(np.log(close_days), RESPONSE_SIGMA))
+    # Some issues are closed without ever being acknowledged.
+    closed_unacknowledged = rng.random(count) < 0.05
+    closed_at[closed_unacknowledged] = created_at[closed_unacknowledged] + to_seconds(
+        rng.lognormal(np.log(close_days[closed_unacknowledged]), RESPONSE_SIGMA))
+
+    end = plan["end"]
+    acknowledged = (rng.random(count) < acknowledge_rate) & ~closed_unacknowledged & (acknowledged_at < end)
+    closed = (rng.random(count) < close_rate) & (closed_at < end) & (acknowledged | closed_unacknowledged)
+    acknowledged_at = np.where(acknowledged, acknowledged_at, np.datetime64("NaT"))
+    closed_at = np.where(closed, closed_at, np.datetime64("NaT"))
+
+    archived = closed & (closed_at < end - np.timedelta64(ARCHIVE_AFTER_DAYS, "D"))
+    status = np.select([archived, closed, acknowledged], ["Archived", "Closed", "Acknowledged"], "Open")
+    updated_at = np.fmax(np.fmax(created_at, acknowledged_at), closed_at)
+
+    # --- Who: assignees and descriptions per request type, reporters at random
+    summary = np.array([t["summary"] for t in REQUEST_TYPES], dtype=object)[type_index]
+    assignee_name = np.empty(count, dtype=object)
+    description = np.empty(count, dtype=object)
+    for index, request_type in enumerate(REQUEST_TYPES):
+        rows = np.flatnonzero(type_index == index)
+        assignee_name[rows] = np.array(request_type["assignees"], dtype=object)[rng.integers(0, len(request_type["assignees"]), len(rows))]
+        description[rows] = np.array(request_type["descriptions"], dtype=object)[rng.integers(0, len(request_type["descriptions"]), len(rows))]
+    # Issues still open may not have been assigned yet.
+    unassigned = ~acknowledged & ~closed & (rng.random(count) < 0.5)
+    assignee_name[unassigned] = None
+
+    assignee_ids = {name: 5_000_000 + i for i, name in enumerate(sorted({n for t in REQUEST_TYPES for n in t["assignees"]}))}
+    reporter_id = rng.integers(1, max(count // 4, 2), count) + 20_000_000
+    ids = np.arange(first_id, first_id + count)
+    street = np.array(STREET_NAMES, dtype=object)[rng.integers(0, len(STREET_NAMES), count)]
+    house_number = rng.integers(1, 120, count) * 100 + rng.integers(0, 99, count)
+    urls = pd.Series(ids).astype(str)
+
+    return pd.DataFrame({
+        "id": ids,
+        "description": description,
+        "status": status,
+        "created_at": created_at.astype("datetime64[ns]"),
+        "updated_at": updated_at.astype("datetime64[ns]"),
+        "lat": lat,
+        "lng": lng,
+        "acknowledged_at": acknowledged_at.astype("datetime64[ns]"),
+        "address": pd.Series(house_number).astype(str).to_numpy() + " " + street + ", Tacoma, WA",
+        "closed_at": closed_at.astype("datetime64[ns]"),
+        "comment_url": ("https://seeclickfix.com/api/v2/issues/" + urls + "/comments").to_numpy(),
+        "comment_count": rng.poisson(0.6, count),
+        "html_url": ("https://seeclickfix.com/issues/" + urls).to_numpy(),
+        "rating": json.dumps(2),
+        "shortened_url": None,
+        "summary": summary,
+        "url": ("https://seeclickfix.com/api/v2/issues/" + urls).to_numpy(),
+        "vote_count": rng.poisson(0.3, count),
+        "votes": None,
+        "assignee_id": pd.array([assignee_ids.get(name) for name in assignee_name], dtype="Int64"),
+        "assignee_name": assignee_name,
+        "assignee_role": np.where(pd.isna(assignee_name), None, "Verified Official"),
+        "reporter_id": reporter_id,
+        "reporter_name": ("Resident " + pd.Series(reporter_id).astype(str)).to_numpy(),
+        "reporter_role": "Registered User",
+        "request_type_id": 90_000 + type_index,
+        "request_type_title": summary,
+        "request_type_organization": "City of Tacoma",
+    }, columns=ISSUE_COLUMNS)
+
+def generate_issues(rows, seed=0, start="2023-01-01", end="2025-07-01", layers=None):
+    """
+    Yield synthetic seeclickfix_issues rows in chunks of CHUNK_ROWS.
+
+    The same seed, rows and date range always produce the same issues.
+    """
+    layers = layers or load_layers()
+    plan = build_plan(seed, layers, start, end)
+    chunk_count = -(-rows // CHUNK_ROWS)
+    chunk_seeds = np.random.SeedSequence(seed).spawn(chunk_count + 1)[1:]
+    for chunk, chunk_seed in enumerate(chunk_seeds):
+        first = chunk * CHUNK_ROWS
+        count = min(CHUNK_ROWS, rows - first)
+        yield generate_chunk(np.random.default_rng(chunk_seed), plan, layers, SYNTHETIC_ID_START + first, count)
+
+def assign_layer(df, layer, attributes):
+    """Add the attributes of the first feature containing each point, like the export DAG does."""
+    geometries, properties = layer
+    lng = df["lng"].to_numpy()
+    lat = df["lat"].to_numpy()
+    match = np.full(len(df), -1)
+    for index, geometry in enumerate(geometries):
+        unmatched = match < 0
+        inside = shapely.contains_xy(geometry, lng[unmatched], lat[unmatched])
+        match[np.flatnonzero(unmatched)[inside]] = index
+    for column, key in attributes.items():
+        values = np.array([feature.get(key) for feature in properties] + [None], dtype=object)
+        df[column] = values[match]
+    return match
+
+def enrich_issues(df, layers):
+    """
+    Add the spatial columns the export DAG writes, so the frame matches
+    exports/seeclickfix_issues_dump.parquet.
+    """
+    assign_layer(df, layers["council"], COUNCIL_ATTRIBUTES)
+    assign_layer(df, layers["equity"], EQUITY_ATTRIBUTES)
+    assign_layer(df, layers["police"], POLICE_ATTRIBUTES)
+    shelter = assign_layer(df, layers["shelter"], {"nearby_shelter_name": SHELTER_NAME_PROPERTY})
+    df["nearby_shelter_name"] = np.where(shelter >= 0, df["nearby_shelter_name"].fillna("Unknown"), None)
+    df["within_10_blocks_of_shelter"] = shelter >= 0
+    return df
+
+def parquet_schema(table):
+    """Schema for every chunk; columns that happen to be all null in the first chunk are strings."""
+    return pa.schema([
+        field.with_type(pa.string()) if pa.types.is_null(field.type) else field
+        for field in table.schema
+    ])
+
+def write_parquet(chunks, path, layers):
+    """Enrich each chunk and write them all to one Parquet file."""
+    writer = None
+    total = 0
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(enrich_issues(chunk, layers), preserve_index=False)
+            if writer is None:
+                schema = parquet_schema(table)
+                writer = pq.ParquetWriter(path, schema)
+            writer.write_table(table.cast(schema))
+            total += len(chunk)
+            logging.info(f"Wrote {total} issues to {path}.")
+    finally:
+        if writer is not None:
+            writer.close()
+    return total
+
+def load_postgres(chunks, conn_params):
+    """Upsert each chunk into seeclickfix_issues, creating the table if needed."""
+    import psycopg2
+    from psycopg2.extras import execute_values
+
+    insert_query = f"""
+    INSERT INTO seeclickfix_issues ({", ".join(ISSUE_COLUMNS)}) VALUES %s
+    ON CONFLICT (id) DO UPDATE SET
+    {", ".join(f"{column} = EXCLUDED.{column}" for column in ISSUE_COLUMNS[1:])};
+    """
+
+    conn = psycopg2.connect(**conn_params)
+    total = 0
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(CREATE_TABLE_QUERY)
+            for chunk in chunks:
+                chunk = chunk.astype(object).where(chunk.notna(), None)
+                execute_values(cursor, insert_query, chunk.itertuples(index=False, name=None), page_size=5000)
+                conn.commit()
+                total += len(chunk)
+                logging.info(f"Loaded {total} issues into seeclickfix_issues.")
+    finally:
+        conn.close()
+    return total
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic Tacoma SeeClickFix issues for scale testing.")
+    parser.add_argument("--rows", type=int, default=100_000, help="Number of issues to generate.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start", default="2023-01-01", help="First day issues are created.")
+    parser.add_argument("--end", default="2025-07-01", help="End of the range; nothing happens on or after it.")
+    parser.add_argument("--exports-dir", default=EXPORTS_DIR, help="Directory with the boundary GeoJSONs.")
+    parser.add_argument("--parquet", metavar="PATH", help="Write the enriched export to PATH.")
+    parser.add_argument("--postgres", action="store_true", help="Upsert the rows into seeclickfix_issues.")
+    parser.add_argument("--host", default="localhost", help="Postgres host; the DAGs use 'postgres' inside compose.")
+    parser.add_argument("--port", type=int, default=DB_CONN_PARAMS["port"])
+    args = parser.parse_args(argv)
+
+    if not args.parquet and not args.postgres:
+        parser.error("choose --parquet PATH, --postgres, or both")
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    layers = load_layers(args.exports_dir)
+
+    def chunks():
+        return generate_issues(args.rows, args.seed, args.start, args.end, layers)
+
+    if args.postgres:
+        load_postgres(chunks(), {**DB_CONN_PARAMS, "host": args.host, "port": args.port})
+    if args.parquet:
+        write_parquet(chunks(), args.parquet, layers)
+
+if __name__ == "__main__":
+    main()
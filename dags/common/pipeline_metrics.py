@@ -0,0 +1,129 @@
+"""
+Structured metrics for the SeeClickFix DAG tasks.
+
+Each task collects its metrics while it runs and writes them once at the end:
+one row per value into the pipeline_metrics table, and optionally a
+Prometheus textfile per task when PIPELINE_METRICS_TEXTFILE_DIR is set
+(for node_exporter's textfile collector). Writing metrics never fails a task.
+"""
+from bisect import bisect_left
+from contextlib import contextmanager
+import json
+import logging
+import os
+import time
+import psycopg2
+
+# Database connection parameters
+DB_CONN_PARAMS = {
+    "dbname": "airflow",
+    "user": "airflow",
+    "password": "airflow",
+    "host": "postgres",
+    "port": 5432,
+}
+
+TEXTFILE_DIR_ENV = "PIPELINE_METRICS_TEXTFILE_DIR"
+PROMETHEUS_PREFIX = "seeclickfix_pipeline_"
+
+# Upper bounds, in seconds, of the request latency histogram buckets.
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30]
+
+CREATE_METRICS_TABLE_QUERY = """
+CREATE TABLE IF NOT EXISTS pipeline_metrics (
+    id BIGSERIAL PRIMARY KEY,
+    recorded_at TIMESTAMP NOT NULL DEFAULT (now() AT TIME ZONE 'utc'),
+    dag_id TEXT NOT NULL,
+    task_id TEXT NOT NULL,
+    run_id TEXT,
+    metric TEXT NOT NULL,
+    value DOUBLE PRECISION,
+    labels JSONB NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS pipeline_metrics_metric_recorded_at ON pipeline_metrics (metric, recorded_at);
+"""
+
+def new_task_metrics(dag_id, task_id, run_id=None):
+    """An empty metrics collection for one task run."""
+    return {"dag_id": dag_id, "task_id": task_id, "run_id": run_id, "values": [], "histograms": set()}
+
+def add_metric(metrics, name, value, **labels):
+    metrics["values"].append((name, float(value), labels))
+
+@contextmanager
+def timer(metrics, name, **labels):
+    """Record the seconds spent in the block as a metric."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_metric(metrics, name, time.perf_counter() - start, **labels)
+
+def add_histogram(metrics, name, observations, buckets=LATENCY_BUCKETS):
+    """
+    Record observations as a Prometheus-style histogram: cumulative
+    name_bucket counts per upper bound (le), name_sum and name_count.
+    """
+    counts = [0] * (len(buckets) + 1)
+    for observation in observations:
+        counts[bisect_left(buckets, observation)] += 1
+
+    cumulative = 0
+    for bound, count in zip([str(bound) for bound in buckets] + ["+Inf"], counts):
+        cumulative += count
+        add_metric(metrics, f"{name}_bucket", cumulative, le=bound)
+    add_metric(metrics, f"{name}_sum", sum(observations))
+    add_metric(metrics, f"{name}_count", len(observations))
+    metrics["histograms"].add(name)
+
+def write_metrics(metrics, conn_params=DB_CONN_PARAMS):
+    """Write the task's metrics to Postgres and the Prometheus textfile, logging instead of raising on failure."""
+    try:
+        conn = psycopg2.connect(**conn_params)
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(CREATE_METRICS_TABLE_QUERY)
+                cursor.executemany(
+                    "INSERT INTO pipeline_metrics (dag_id, task_id, run_id, metric, value, labels) VALUES (%s, %s, %s, %s, %s, %s)",
+                    [
+                        (metrics["dag_id"], metrics["task_id"], metrics["run_id"], name, value, json.dumps(labels))
+                        for name, value, labels in metrics["values"]
+                    ],
+                )
+            conn.commit()
+        finally:
+            conn.close()
+    except Exception as e:
+        logging.warning(f"Could not write pipeline metrics to Postgres: {e}")
+
+    textfile_dir = os.environ.get(TEXTFILE_DIR_ENV)
+    if textfile_dir:
+        try:
+            write_textfile(metrics, textfile_dir)
+        except OSError as e:
+            logging.warning(f"Could not write pipeline metrics textfile: {e}")
+
+    logging.info(f"Recorded {len(metrics['values'])} pipeline metrics for {metrics['dag_id']}.{metrics['task_id']}.")
+
+def write_textfile(metrics, textfile_dir):
+    """
+    Replace this task's .prom file with its latest metrics. The file is written
+    next to its final name and renamed, so the collector never reads half of it.
+    """
+    lines = []
+    typed = set()
+    for name, value, labels in metrics["values"]:
+        base = name.rsplit("_", 1)[0] if name.rsplit("_", 1)[0] in metrics["histograms"] else name
+        if base not in typed:
+            kind = "histogram" if base in metrics["histograms"] else "gauge"
+            lines.append(f"# TYPE {PROMETHEUS_PREFIX}{base} {kind}")
+            typed.add(base)
+        all_labels = {"dag": metrics["dag_id"], "task": metrics["task_id"], **labels}
+        label_text = ",".join(f'{key}="{value_text}"' for key, value_text in all_labels.items())
+        lines.append(f"{PROMETHEUS_PREFIX}{name}{{{label_text}}} {value}")
+
+    os.makedirs(textfile_dir, exist_ok=True)
+    path = os.path.join(textfile_dir, f"seeclickfix_{metrics['dag_id']}_{metrics['task_id']}.prom")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+    os.replace(path + ".tmp", path)
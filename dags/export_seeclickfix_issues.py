@@ -3,8 +3,21 @@ from airflow.operators.python import PythonOperator
 from datetime import datetime, timedelta
 import psycopg2
 import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 from shapely.geometry import shape, Point
+from common.pipeline_metrics import new_task_metrics, add_metric, timer, write_metrics
+# From the dashboard's streamlit_app package, mounted into the Airflow container.
+from streamlit_app.data.dataset_identity import SOURCE_VERSION_KEY, issues_data_version
+from streamlit_app.analytics.hotspots import hotspot_cell_counts
 
 # Database connection parameters
 DB_CONN_PARAMS = {
@@ -15,13 +28,101 @@ DB_CONN_PARAMS = {
     "port": 5432,
 }
 
+DAG_ID = "export_seeclickfix_issues"
+
 # File paths
 OUTPUT_FILE_PATH = "/opt/airflow/exports/seeclickfix_issues_dump.parquet"
+ROLLUP_FILE_PATH = "/opt/airflow/exports/seeclickfix_issues_rollup.parquet"
+HOTSPOT_FILE_PATH = "/opt/airflow/exports/seeclickfix_hotspot_cells.parquet"
+PROFILE_FILE_PATH = "/opt/airflow/exports/seeclickfix_issues_profile.json"
+SKETCH_FILE_PATH = "/opt/airflow/exports/seeclickfix_issues_sketches.parquet"
+EXPORTS_DIR = "/opt/airflow/exports"
+REPORTS_DIR = "/opt/airflow/exports/reports"
+# The weekly report renderer's worker processes, kept small on the shared Airflow
+# worker, and how long it may run before it is stopped.
+REPORT_WORKERS = 2
+REPORT_TIMEOUT_SECONDS = 30 * 60
 COUNCIL_GEOJSON_PATH = "/opt/airflow/exports/City_Council_Districts.geojson"
 EQUITY_GEOJSON_PATH = "/opt/airflow/exports/Equity_Index_2024_(Tacoma).geojson"
 POLICE_GEOJSON_PATH = "/opt/airflow/exports/Police_Districts_(Tacoma).geojson"
 SHELTER_GEOJSON_PATH = "/opt/airflow/exports/Estimated10BlockDistancefromShelterView_-7990954508892049150.geojson"
 
+# Dimensions and measures of the daily rollup cube read by the dashboard. Police
+# sector, equity index and department are left out: crossed with day and summary
+# they give nearly a cell per issue, and views filtered on them read the rows instead.
+# Keep in sync with streamlit_app/data/load_rollup.py.
+ROLLUP_DIMENSIONS = [
+    "summary",
+    "district_display",
+    "homeless_related",
+    "within_10_blocks_of_shelter",
+]
+ROLLUP_MEASURES = [
+    "issue_count",
+    "acknowledged_count",
+    "closed_count",
+    "time_to_acknowledge_sum",
+    "time_to_close_sum",
+]
+
+# Quantile sketches: one bucket per day below SKETCH_EXACT_DAYS, then buckets growing by
+# SKETCH_GROWTH (about 5% relative error); bucket -1 counts issues without a value.
+# Keep in sync with streamlit_app/data/load_sketches.py.
+SKETCH_DIMENSIONS = [
+    "summary",
+    "district_display",
+    "police_district_sector",
+    "equityindex",
+    "department",
+    "homeless_related",
+    "within_10_blocks_of_shelter",
+]
+SKETCH_METRICS = ["time_to_acknowledge", "time_to_close", "days_to_resolve"]
+SKETCH_EXACT_DAYS = 32
+SKETCH_GROWTH = 1.1
+SKETCH_MISSING_BUCKET = -1
+OPEN_STATUSES = ["Open", "Acknowledged"]
+
+# Issues the dashboard shows, and the filter dimensions it lists values for.
+# Keep in sync with SHOW_ISSUES_AFTER_DATE in streamlit_app/data/load_issues.py.
+SHOW_ISSUES_AFTER_DATE = '2024-01-01'
+PROFILE_DIMENSIONS = [
+    "district_display",
+    "police_district_sector",
+    "equityindex",
+    "summary",
+    "department",
+]
+
+# Raw assignee prefix to department.
+# Keep in sync with prepare_department_data in streamlit_app/data/load_issues.py.
+DEPARTMENT_MAPPING = {
+    "NCS": "Neighborhood and Community Services",
+    "TPD": "Tacoma Police Department",
+    "Police Department - Traffic - JN": "Tacoma Police Department",
+    "Police Department - Traffic - HM": "Tacoma Police Department",
+    "ES": "Environmental Services",
+    "PW": "Public Works",
+    "311 Customer Support Center": "311 Support",
+    "PDS Code Case": "Planning and Development Services",
+    "T&L": "Public Works",
+    "CMO": "City Manager’s Office",
+    "PDS": "Planning and Development Services",
+    "OEHR": "Office of Equity and Human Rights",
+    "Public Works - D.S.": "Public Works",
+    "Public Works - Streets - TD": "Public Works",
+    "Public Works - Traffic - JK": "Public Works",
+    "Public Works - Streets - NG": "Public Works",
+    "Fire": "Tacoma Fire Department",
+    "PPW Water Quality Specialist - Davidson": "Public Works",
+    "PPW – Asst Airport Administrator - Propst": "Public Works",
+    "PPW Water Quality Specialist - Thompson": "Public Works",
+    "IT": "Information Technology",
+    "TPU": "Tacoma Public Utilities",
+    "TVE": "Tacoma Venues & Events",
+    "CED": "Community & Economic Development"
+}
+
 def load_geojson(file_path, attribute_mapping):
     """Load a GeoJSON file and parse polygons with associated attributes."""
     with open(file_path, "r", encoding="utf-8") as f:
@@ -55,21 +156,50 @@ def assign_shelter_proximity(issue, shelters):
     issue["nearby_shelter_name"] = None
     issue["within_10_blocks_of_shelter"] = False
 
-def export_to_parquet():
+def export_to_parquet(**kwargs):
     """Fetch all records from seeclickfix_issues, enrich with spatial data, and save as Parquet."""
+    metrics = new_task_metrics(DAG_ID, "export_to_parquet", kwargs.get("run_id"))
+    export_start = time.perf_counter()
+
     # Connect to the database
-    conn = psycopg2.connect(**DB_CONN_PARAMS)
-    cursor = conn.cursor()
+    with timer(metrics, "query_seconds"):
+        conn = psycopg2.connect(**DB_CONN_PARAMS)
+        cursor = conn.cursor()
 
-    query = "SELECT * FROM seeclickfix_issues ORDER BY id"
-    cursor.execute(query)
-    
-    columns = [desc[0] for desc in cursor.description]
-    records = [dict(zip(columns, row)) for row in cursor.fetchall()]
-    
-    cursor.close()
-    conn.close()
+        query = "SELECT * FROM seeclickfix_issues ORDER BY id"
+        cursor.execute(query)
+
+        columns = [desc[0] for desc in cursor.description]
+        records = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        cursor.close()
+        conn.close()
+
+    layer_seconds = {}
+    enrich_records(records, layer_seconds)
+    for layer, seconds in layer_seconds.items():
+        add_metric(metrics, "enrichment_seconds", seconds, layer=layer)
+
+    # Convert to DataFrame and save as Parquet
+    with timer(metrics, "parquet_write_seconds"):
+        df = pd.DataFrame(records)
+        df.to_parquet(OUTPUT_FILE_PATH, engine='pyarrow', index=False)
 
+    add_metric(metrics, "rows_exported", len(df))
+    add_metric(metrics, "parquet_bytes_written", os.path.getsize(OUTPUT_FILE_PATH))
+    add_metric(metrics, "task_seconds", time.perf_counter() - export_start)
+    if len(df) and df['updated_at'].notna().any():
+        # Stored timestamps are UTC without a zone; how far the newest exported change lags behind now.
+        newest = pd.Timestamp(df['updated_at'].max())
+        add_metric(metrics, "freshness_lag_seconds", (pd.Timestamp.now(tz="UTC").tz_localize(None) - newest).total_seconds())
+    write_metrics(metrics)
+
+def enrich_records(records, layer_seconds=None):
+    """
+    Assign council district, equity index, police district and shelter proximity attributes to each record in place.
+    When layer_seconds is given, the time spent on each layer is added to it.
+    """
+    start = time.perf_counter()
     # Load geojson data
     council_districts = load_geojson(COUNCIL_GEOJSON_PATH, {
         "councilmember": "councilmember",
@@ -104,25 +234,209 @@ def export_to_parquet():
         "shelter_name": "Shelter_Name"
     })
     
-    # Assign attributes
-    for issue in records:
-        if "lat" in issue and "lng" in issue:
-            assign_attributes(issue, council_districts, [
-                "councilmember", "councilmember_email", "councilmember_photo", "council_district",
-                "councilmember_phonenumber", "councilmember_supportstaff", "councilmember_supportstaff_email",
-                "councilmember_webpage"
-            ])
-            assign_attributes(issue, equity_index, [
-                "equityindex", "livabilityindex", "accessibilityindex", "economicindex", "educationindex",
-                "environmentalindex", "averagepavementcondition", "householdvehicleaccess", "parksopenspace",
-                "equity_objectid"
-            ])
-            assign_attributes(issue, police_districts, ["police_sector", "police_district"])
-            assign_shelter_proximity(issue, shelters)
+    timings = {"load_geojson": time.perf_counter() - start}
 
-    # Convert to DataFrame and save as Parquet
-    df = pd.DataFrame(records)
-    df.to_parquet(OUTPUT_FILE_PATH, engine='pyarrow', index=False)
+    # Assign attributes, one layer at a time so each layer can be timed
+    located = [issue for issue in records if "lat" in issue and "lng" in issue]
+    layers = [
+        ("council", lambda issue: assign_attributes(issue, council_districts, [
+            "councilmember", "councilmember_email", "councilmember_photo", "council_district",
+            "councilmember_phonenumber", "councilmember_supportstaff", "councilmember_supportstaff_email",
+            "councilmember_webpage"
+        ])),
+        ("equity", lambda issue: assign_attributes(issue, equity_index, [
+            "equityindex", "livabilityindex", "accessibilityindex", "economicindex", "educationindex",
+            "environmentalindex", "averagepavementcondition", "householdvehicleaccess", "parksopenspace",
+            "equity_objectid"
+        ])),
+        ("police", lambda issue: assign_attributes(issue, police_districts, ["police_sector", "police_district"])),
+        ("shelter", lambda issue: assign_shelter_proximity(issue, shelters)),
+    ]
+    for layer, assign in layers:
+        start = time.perf_counter()
+        for issue in located:
+            assign(issue)
+        timings[layer] = time.perf_counter() - start
+
+    if layer_seconds is not None:
+        layer_seconds.update(timings)
+    return records
+
+def add_rollup_dimensions(df):
+    """Derive the dashboard's display columns, matching streamlit_app/data/load_issues.py."""
+    df['homeless_related'] = df['summary'].str.contains("homeless|someone living on", case=False, na=False) | \
+                            df['description'].str.contains("homeless", case=False, na=False)
+    df['homeless_related'] = df['homeless_related'].map({True: 'homeless-related', False: 'other issues'})
+
+    df['district_display'] = df['council_district'].fillna(0).astype(int).astype(str) + " - " + df['councilmember'].fillna("Unknown")
+    df['police_district_sector'] = df['police_sector'].astype(str) + " - " + df['police_district'].astype(str)
+    df['within_10_blocks_of_shelter'] = df['within_10_blocks_of_shelter'].fillna(False).astype(bool)
+    df['department'] = df['assignee_name'].str.split("_").str[0].map(DEPARTMENT_MAPPING)
+    return df
+
+def write_sidecar_parquet(df, path, source_version):
+    """Write a file built from the export, recording the export's data version in its Parquet metadata."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {**(table.schema.metadata or {}), SOURCE_VERSION_KEY.encode(): source_version.encode()}
+    pq.write_table(table.replace_schema_metadata(metadata), path)
+
+def build_rollup_cube():
+    """Aggregate the exported issues into a daily rollup cube over the dashboard's filter dimensions."""
+    # Read the export back so the derived columns see exactly what the dashboard sees.
+    source_version = issues_data_version(OUTPUT_FILE_PATH)
+    df = pd.read_parquet(OUTPUT_FILE_PATH)
+    for column in ["created_at", "acknowledged_at", "closed_at"]:
+        df[column] = pd.to_datetime(df[column])
+
+    # Only the days the dashboard shows.
+    df = add_rollup_dimensions(df[df['created_at'] >= SHOW_ISSUES_AFTER_DATE].copy())
+    df['day'] = df['created_at'].dt.floor('D')
+    df['issue_count'] = 1
+    df['acknowledged_count'] = df['acknowledged_at'].notna().astype(int)
+    df['closed_count'] = df['closed_at'].notna().astype(int)
+    df['time_to_acknowledge_sum'] = (df['acknowledged_at'] - df['created_at']).dt.days
+    df['time_to_close_sum'] = (df['closed_at'] - df['created_at']).dt.days
+
+    cube = (
+        df.groupby(["day"] + ROLLUP_DIMENSIONS, dropna=False)[ROLLUP_MEASURES]
+        .sum()
+        .reset_index()
+    )
+    write_sidecar_parquet(cube, ROLLUP_FILE_PATH, source_version)
+    logging.info(f"Wrote rollup cube with {len(cube)} groups from {len(df)} issues.")
+
+def update_hotspot_cells():
+    """
+    Maintain per-cell issue counts by quarter for the chronic hotspot view.
+
+    Quarters before the latest stored one are kept from the previous run; only
+    the latest stored quarter onward is recounted from the export. Counting is
+    shared with the dashboard's fallback, so both cover the same quarters.
+    """
+    source_version = issues_data_version(OUTPUT_FILE_PATH)
+    df = pd.read_parquet(OUTPUT_FILE_PATH, columns=['lat', 'lng', 'created_at', 'summary'])
+    df['created_at'] = pd.to_datetime(df['created_at'])
+
+    kept = None
+    if os.path.exists(HOTSPOT_FILE_PATH):
+        previous = pd.read_parquet(HOTSPOT_FILE_PATH)
+        if len(previous):
+            since = previous['quarter'].max()
+            kept = previous[(previous['quarter'] >= SHOW_ISSUES_AFTER_DATE) & (previous['quarter'] < since)]
+            df = df[df['created_at'] >= since]
+
+    recounted = hotspot_cell_counts(df)
+    cells = recounted if kept is None else pd.concat([kept, recounted], ignore_index=True)
+    write_sidecar_parquet(cells, HOTSPOT_FILE_PATH, source_version)
+    logging.info(f"Recounted {len(recounted)} hotspot cell groups from {len(df)} issues; {len(cells)} in total.")
+
+def sketch_bucket(days):
+    """Quantile sketch bucket of each day count; negative counts fall in bucket 0."""
+    days = np.asarray(days, dtype=float)
+    clipped = np.maximum(days, 0)
+    growth = SKETCH_EXACT_DAYS + np.floor(np.log(np.maximum(clipped, SKETCH_EXACT_DAYS) / SKETCH_EXACT_DAYS) / np.log(SKETCH_GROWTH))
+    buckets = np.where(clipped < SKETCH_EXACT_DAYS, np.floor(clipped), growth)
+    return np.where(np.isnan(days), SKETCH_MISSING_BUCKET, buckets).astype('int64')
+
+def build_quantile_sketches():
+    """
+    Store a bucketed histogram of each response-time metric per day and filter
+    dimensions, so the dashboard can merge them into medians and percentiles.
+    """
+    source_version = issues_data_version(OUTPUT_FILE_PATH)
+    df = pd.read_parquet(OUTPUT_FILE_PATH)
+    for column in ["created_at", "acknowledged_at", "closed_at"]:
+        df[column] = pd.to_datetime(df[column])
+
+    df = add_rollup_dimensions(df)
+    df['day'] = df['created_at'].dt.floor('D')
+    df['open_issue'] = df['status'].isin(OPEN_STATUSES)
+    df['time_to_acknowledge'] = (df['acknowledged_at'] - df['created_at']).dt.days
+    df['time_to_close'] = (df['closed_at'] - df['created_at']).dt.days
+    df['days_to_resolve'] = (df[['acknowledged_at', 'closed_at']].min(axis=1) - df['created_at']).dt.days
+
+    keys = ["day"] + SKETCH_DIMENSIONS + ["open_issue"]
+    sketches = []
+    for metric in SKETCH_METRICS:
+        counts = (
+            df[keys].assign(bucket=sketch_bucket(df[metric]))
+            .groupby(keys + ["bucket"], dropna=False)
+            .size()
+            .reset_index(name="count")
+        )
+        counts.insert(len(keys), "metric", metric)
+        sketches.append(counts)
+
+    sketches = pd.concat(sketches, ignore_index=True)
+    write_sidecar_parquet(sketches, SKETCH_FILE_PATH, source_version)
+    logging.info(f"Wrote {len(sketches)} quantile sketch buckets from {len(df)} issues.")
+
+def write_dataset_profile():
+    """
+    Write a JSON profile of the issues the dashboard shows: date bounds, the
+    distinct values and counts of each filter dimension, and column statistics.
+    """
+    source_version = issues_data_version(OUTPUT_FILE_PATH)
+    df = pd.read_parquet(OUTPUT_FILE_PATH)
+    df['created_at'] = pd.to_datetime(df['created_at'])
+    df = add_rollup_dimensions(df[df['created_at'] >= SHOW_ISSUES_AFTER_DATE].copy())
+
+    profile = {
+        SOURCE_VERSION_KEY: source_version,
+        "row_count": len(df),
+        "created_at": {
+            "min": df['created_at'].min().isoformat() if len(df) else None,
+            "max": df['created_at'].max().isoformat() if len(df) else None,
+        },
+        "dimensions": {
+            column: [
+                {"value": None if pd.isna(value) else value, "count": int(count)}
+                for value, count in df[column].value_counts(dropna=False).items()
+            ]
+            for column in PROFILE_DIMENSIONS
+        },
+        "columns": {
+            "names": df.columns.tolist(),
+            "dtypes": {column: str(dtype) for column, dtype in df.dtypes.items()},
+            "describe": json.loads(df.describe(include='all').to_json(date_format='iso', default_handler=str)),
+        },
+    }
+
+    with open(PROFILE_FILE_PATH, "w", encoding="utf-8") as f:
+        json.dump(profile, f, default=str)
+    logging.info(f"Wrote dataset profile for {len(df)} issues.")
+
+def render_weekly_reports(**kwargs):
+    """
+    Render the weekly council district and department reports from the new
+    export, once per ISO week. The renderer comes from the dashboard's
+    streamlit_app package, which is mounted into the Airflow container. It
+    runs in a process of its own: the task's process is daemonic, so the
+    renderer could not start its worker pool here.
+    """
+    from airflow.exceptions import AirflowSkipException
+
+    metrics = new_task_metrics(DAG_ID, "render_weekly_reports", kwargs.get("run_id"))
+    render_start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as result_dir:
+        result_path = os.path.join(result_dir, "result.json")
+        completed = subprocess.run(
+            [sys.executable, "-m", "streamlit_app.reports.weekly",
+             "--exports-dir", EXPORTS_DIR, "--output", REPORTS_DIR, "--workers", str(REPORT_WORKERS),
+             "--skip-existing", "--result", result_path],
+            capture_output=True, text=True, timeout=REPORT_TIMEOUT_SECONDS,
+        )
+        if completed.returncode != 0:
+            raise RuntimeError(f"Weekly report rendering failed:\n{completed.stderr}")
+        with open(result_path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+    if result is None:
+        raise AirflowSkipException("This week's reports are already written.")
+
+    add_metric(metrics, "reports_rendered", len(result["reports"]))
+    add_metric(metrics, "task_seconds", time.perf_counter() - render_start)
+    write_metrics(metrics)
+    logging.info(f"Wrote {len(result['reports'])} weekly reports to {result['directory']}.")
 
 default_args = {
     "owner": "airflow",
@@ -133,9 +447,9 @@ default_args = {
 }
 
 dag = DAG(
-    "export_seeclickfix_issues",
+    DAG_ID,
     default_args=default_args,
-    description="Export seeclickfix_issues table to Parquet after enriching with council, equity index, police district, and shelter proximity data.",
+    description="Export seeclickfix_issues table to Parquet after enriching with council, equity index, police district, and shelter proximity data, then build the daily rollup cube, quantile sketches, hotspot cells and dataset profile, and render the weekly reports.",
     schedule_interval="@hourly",
     catchup=False,
 )
@@ -146,4 +460,34 @@ export_task = PythonOperator(
     dag=dag,
 )
 
-export_task
+rollup_task = PythonOperator(
+    task_id="build_rollup_cube",
+    python_callable=build_rollup_cube,
+    dag=dag,
+)
+
+hotspot_task = PythonOperator(
+    task_id="update_hotspot_cells",
+    python_callable=update_hotspot_cells,
+    dag=dag,
+)
+
+profile_task = PythonOperator(
+    task_id="write_dataset_profile",
+    python_callable=write_dataset_profile,
+    dag=dag,
+)
+
+sketch_task = PythonOperator(
+    task_id="build_quantile_sketches",
+    python_callable=build_quantile_sketches,
+    dag=dag,
+)
+
+report_task = PythonOperator(
+    task_id="render_weekly_reports",
+    python_callable=render_weekly_reports,
+    dag=dag,
+)
+
+export_task >> [rollup_task, sketch_task, hotspot_task, profile_task, report_task]
@@ -9,6 +9,7 @@ import json
 import time
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from common.pipeline_metrics import new_task_metrics, add_metric, add_histogram, write_metrics
 
 # Database connection parameters
 DB_CONN_PARAMS = {
@@ -25,6 +26,8 @@ PLACE_URL = "tacoma"
 PER_PAGE = 20  
 SLEEP_SECONDS = 60 / 20  
 
+DAG_ID = "seeclickfix_tacoma_dag"
+
 DEFAULT_UPDATED_AT = "2010-01-01T00:00:00Z"
 CREATED_AT_AFTER = "2023-01-01T00:00:00Z"
 
@@ -37,6 +40,11 @@ def fetch_data(**kwargs):
     updated_at = get_updated_at()
     page = 1
     issues = []
+    metrics = new_task_metrics(DAG_ID, "fetch_data", kwargs.get("run_id"))
+    latencies = []
+    pages_fetched = 0
+    api_errors = 0
+    fetch_start = time.perf_counter()
 
     session = requests.Session()
     retries = Retry(total=5, backoff_factor=1, status_forcelist=[500, 502, 503, 504])
@@ -45,14 +53,19 @@ def fetch_data(**kwargs):
     while True:
         url = f"{BASE_URL}?place_url={PLACE_URL}&details=true&status=archived,open,acknowledged,closed&after={CREATED_AT_AFTER}&sort=updated_at&sort_direction=ASC&page={page}&per_page={PER_PAGE}&updated_at_after={updated_at}"
         logging.info(f"Fetching data from: {url}")
+        request_start = time.perf_counter()
         response = session.get(url)
+        latencies.append(time.perf_counter() - request_start)
         time.sleep(SLEEP_SECONDS)
         data = response.json()
 
         if response.status_code != 200:
             logging.error(f"API error {response.status_code}: {data}")
+            api_errors += 1
             break
 
+        pages_fetched += 1
+
         if "issues" in data:
             issues.extend(data["issues"])
 
@@ -64,12 +77,22 @@ def fetch_data(**kwargs):
     kwargs['ti'].xcom_push(key='issues', value=issues)
     logging.info(f"Fetched {len(issues)} issues.")
 
+    add_metric(metrics, "pages_fetched", pages_fetched)
+    add_metric(metrics, "issues_fetched", len(issues))
+    add_metric(metrics, "api_errors", api_errors)
+    add_metric(metrics, "task_seconds", time.perf_counter() - fetch_start)
+    add_histogram(metrics, "request_latency_seconds", latencies)
+    write_metrics(metrics)
+
 def store_data(**kwargs):
     """Store fetched issues in database and update latest updated_at timestamp."""
     ti = kwargs['ti']
     issues = ti.xcom_pull(task_ids='fetch_data', key='issues')
+    metrics = new_task_metrics(DAG_ID, "store_data", kwargs.get("run_id"))
     if not issues:
         logging.info("No new issues to store.")
+        add_metric(metrics, "rows_upserted", 0)
+        write_metrics(metrics)
         return
     
     conn = psycopg2.connect(**DB_CONN_PARAMS)
@@ -135,10 +158,15 @@ def store_data(**kwargs):
     reporter_role = EXCLUDED.reporter_role,
     request_type_id = EXCLUDED.request_type_id,
     request_type_title = EXCLUDED.request_type_title,
-    request_type_organization = EXCLUDED.request_type_organization;
+    request_type_organization = EXCLUDED.request_type_organization
+    RETURNING (xmax = 0) AS inserted;
     """
     
     latest_updated_at = None
+    rows_inserted = 0
+    rows_updated = 0
+    rows_failed = 0
+    store_start = time.perf_counter()
     for issue in issues:
         try:
             assignee = issue.get("assignee", {})
@@ -174,6 +202,11 @@ def store_data(**kwargs):
                 request_type.get("organization", "")
             )
             cursor.execute(insert_query, values)
+            # xmax is 0 for a freshly inserted row and set when an existing row was updated.
+            if cursor.fetchone()[0]:
+                rows_inserted += 1
+            else:
+                rows_updated += 1
             
             issue_updated_at = datetime.fromisoformat(issue["updated_at"].replace("Z", "+00:00"))
             if latest_updated_at is None or issue_updated_at > latest_updated_at:
@@ -181,11 +214,22 @@ def store_data(**kwargs):
 
         except Exception as e:
             logging.error(f"Error inserting issue {issue.get('id')}: {e}")
+            rows_failed += 1
 
     conn.commit()
     cursor.close()
     conn.close()
 
+    add_metric(metrics, "rows_upserted", rows_inserted + rows_updated)
+    add_metric(metrics, "rows_inserted", rows_inserted)
+    add_metric(metrics, "rows_updated", rows_updated)
+    add_metric(metrics, "rows_failed", rows_failed)
+    add_metric(metrics, "task_seconds", time.perf_counter() - store_start)
+    if latest_updated_at:
+        # How far the newest stored change lags behind now.
+        add_metric(metrics, "freshness_lag_seconds", (datetime.now(timezone.utc) - latest_updated_at).total_seconds())
+    write_metrics(metrics)
+
     if latest_updated_at:
         latest_updated_at_utc = latest_updated_at.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
         Variable.set("seeclickfix_last_updated", latest_updated_at_utc)
@@ -200,7 +244,7 @@ default_args = {
 }
 
 dag = DAG(
-    "seeclickfix_tacoma_dag",
+    DAG_ID,
     default_args=default_args,
     description="Fetch and store SeeClickFix data for Tacoma",
     schedule_interval=timedelta(hours=6),
@@ -1,31 +1,14 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 
 # Import data loaders
-from streamlit_app.data.load_issues import load_issues  
-from streamlit_app.data.load_equity import load_equity_population  
-
-# Import filters and visualizations
-from streamlit_app.filters.filters import apply_filters  
-from streamlit_app.visuals import (
-    heads_up,
-    display_map,
-    council_districts,
-    display_department_performance,
-    display_issues_over_time,
-    display_issue_summary,
-    display_aging_analysis,
-    display_assignee_resolution_time,
-    display_assignee_performance,
-    display_equity_issues_analysis,
-    display_equity_map,
-    display_equity_scatterplot,
-    display_311_impact,
-    issue_data_table,
-    stats,
-)
+from streamlit_app.data.load_issues import load_issues, load_filter_index
+
+# Import filters
+from streamlit_app.filters.filters import apply_filters
+from streamlit_app.analytics.frames import read_only
+
+# Per-rerun timings, shown in the debug panel and appended to a local log when switched on
+from streamlit_app.instrumentation import instrumentation_enabled, start_rerun, timed, finish_rerun
 
 # Set up page configuration
 st.set_page_config(page_title="Tacoma 311 Issues Dashboard", layout="wide")
@@ -34,79 +17,71 @@ st.set_page_config(page_title="Tacoma 311 Issues Dashboard", layout="wide")
 with open("styles.css") as f:
     st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
 
-# Load data
-df = load_issues()
-equity_population_df = load_equity_population()
-total_population = equity_population_df["population"].sum()
-
-# UI Layout
-st.title("Tacoma 311 Issues Dashboard")
-
-with st.sidebar:
-    st.header("Filters")
-    filtered_df, non_date_filtered_df = apply_filters(df)
+# Each section imports its visuals when it is shown, so only the selected
+# section loads its plotting libraries and computes its aggregates.
+def issue_overview_section():
+    from streamlit_app.visuals.heads_up import heads_up
+    heads_up(non_date_filtered_df, filter_state, load_filter_index()["time"])
 
-# Define the tab labels
-tab_labels = [
-    "Issue Overview",
-    "Issues Over Time",
-    "Aging Analysis",
-    "Map",
-    "City Council Districts",
-    "Department Performance",
-    "Issue Summary",
-    "Assignee Resolution Time",
-    "Assignee Performance",
-    "Equity Issues Analysis",
-    "Equity Map",
-    "Data Table",
-    "311 Impact",
-    "Data Details"
-]
+def issues_over_time_section():
+    from streamlit_app.visuals.issues_over_time import display_issues_over_time
+    display_issues_over_time(filtered_df, filter_state)
 
-tabs = st.tabs(tab_labels)
+def aging_analysis_section():
+    from streamlit_app.visuals.aging_analysis import display_aging_analysis
+    display_aging_analysis(filtered_df, filter_state, non_date_filtered_df)
 
-with tabs[0]:
-    heads_up(non_date_filtered_df)
+def map_section():
+    from streamlit_app.visuals.issue_mapping import display_map
+    display_map(filtered_df, filter_state)
 
-with tabs[1]:
-    display_issues_over_time(filtered_df)
+def council_districts_section():
+    from streamlit_app.visuals.council_district_review import council_districts
+    council_districts(filtered_df, filter_state)
 
-with tabs[2]:
-    display_aging_analysis(filtered_df)
+def department_performance_section():
+    from streamlit_app.visuals.department_performance import display_department_performance
+    display_department_performance(filtered_df, filter_state)
 
-with tabs[3]:
-    display_map(filtered_df)
+def issue_summary_section():
+    from streamlit_app.visuals.issue_summary_chart import display_issue_summary
+    display_issue_summary(filtered_df, filter_state)
 
-with tabs[4]:
-    council_districts(filtered_df)
+def assignee_resolution_time_section():
+    from streamlit_app.visuals.assignee_resolution_time import display_assignee_resolution_time
+    display_assignee_resolution_time(filtered_df, filter_state)
 
-with tabs[5]:
-    display_department_performance(filtered_df)
+def assignee_performance_section():
+    from streamlit_app.visuals.assignee_performance import display_assignee_performance
+    display_assignee_performance(filtered_df, filter_state)
 
-with tabs[6]:
-    display_issue_summary(filtered_df)
+def equity_issues_analysis_section():
+    from streamlit_app.data.load_equity import load_equity_population
+    from streamlit_app.visuals.equity_issues_analysis import display_equity_issues_analysis
+    display_equity_issues_analysis(filtered_df, load_equity_population(), filter_state)
 
-with tabs[7]:
-    display_assignee_resolution_time(filtered_df)
-
-with tabs[8]:
-    display_assignee_performance(filtered_df)
-
-with tabs[9]:
-    display_equity_issues_analysis(filtered_df, equity_population_df)
-
-with tabs[10]:
-    display_equity_map(filtered_df)
+def equity_map_section():
+    from streamlit_app.visuals.equity_map import display_equity_map
+    display_equity_map(filtered_df, filter_state)
     # display_equity_scatterplot(filtered_df)
 
-with tabs[11]:
-    issue_data_table(filtered_df)
+def chronic_areas_section():
+    from streamlit_app.visuals.chronic_areas import display_chronic_areas
+    display_chronic_areas(filter_state)
+
+def data_table_section():
+    from streamlit_app.visuals.issue_data_table import issue_data_table
+    issue_data_table(filtered_df, filter_state)
 
-with tabs[12]:
+def impact_section():
+    from streamlit_app.visuals.about_311_impact import display_311_impact
     display_311_impact()
 
-with tabs[13]:
+def pipeline_health_section():
+    from streamlit_app.visuals.pipeline_health import display_pipeline_health
+    display_pipeline_health()
+
+def data_details_section():
     # stats(df)
 
     st.markdown(
@@ -124,19 +99,89 @@ with tabs[13]:
 
 
     st.header("DataFrame Description")
-    
+
+    # Column statistics come from the export's dataset profile when it is current.
+    from streamlit_app.data.load_profile import load_dataset_profile, describe_table
+    profile = load_dataset_profile(filter_state["data_version"])
+
     # Display column names
     st.subheader("Column Names")
-    st.write(df.columns.tolist())
-    
+    st.write(profile["columns"]["names"] if profile is not None else df.columns.tolist())
+
     # Display summary statistics (including non-numeric columns)
     st.subheader("Summary Statistics")
-    st.write(df.describe(include='all'))
-    
+    st.write(describe_table(profile) if profile is not None else df.describe(include='all'))
+
     # Display data types for each column
     st.subheader("Data Types")
-    st.write(df.dtypes)
-    
+    st.write(profile["columns"]["dtypes"] if profile is not None else df.dtypes)
+
     # Optionally, display a sample of the data
     st.subheader("Data Preview")
-    st.dataframe(df.head())
\ No newline at end of file
+    st.dataframe(df.head())
+
+# Define the dashboard sections
+sections = {
+    "Issue Overview": issue_overview_section,
+    "Issues Over Time": issues_over_time_section,
+    "Aging Analysis": aging_analysis_section,
+    "Map": map_section,
+    "City Council Districts": council_districts_section,
+    "Department Performance": department_performance_section,
+    "Issue Summary": issue_summary_section,
+    "Assignee Resolution Time": assignee_resolution_time_section,
+    "Assignee Performance": assignee_performance_section,
+    "Equity Issues Analysis": equity_issues_analysis_section,
+    "Equity Map": equity_map_section,
+    "Chronic Areas": chronic_areas_section,
+    "Data Table": data_table_section,
+    "311 Impact": impact_section,
+    "Pipeline Health": pipeline_health_section,
+    "Data Details": data_details_section,
+}
+
+start_rerun(instrumentation_enabled(st.query_params))
+
+# Everything after start_rerun runs inside the try, so the rerun is closed even
+# when a widget change interrupts it or a stage raises.
+selected_section = None
+debug_slot = None
+try:
+    # Load data
+    with timed("load_issues") as stage:
+        df = load_issues()
+        if stage is not None:
+            stage["rows_out"] = len(df)
+
+    # UI Layout
+    st.title("Tacoma 311 Issues Dashboard")
+
+    with st.sidebar:
+        st.header("Filters")
+        with timed("apply_filters", rows_in=len(df)) as stage:
+            filtered_df, non_date_filtered_df, filter_state = apply_filters(df, load_filter_index())
+            # Views compute from these without changing them, so hand them out read-only.
+            filtered_df, non_date_filtered_df = read_only(filtered_df), read_only(non_date_filtered_df)
+            if stage is not None:
+                stage["rows_out"] = len(filtered_df)
+
+        # Hidden diagnostics, shown when the app is opened with ?debug=1; filled in after the section runs
+        debug_slot = st.empty() if st.query_params.get("debug") else None
+
+    # Only the selected section runs on each rerun.
+    selected_section = st.radio(
+        "Section",
+        list(sections),
+        horizontal=True,
+        label_visibility="collapsed",
+        key="section"
+    )
+    with timed(f"section:{selected_section}"):
+        sections[selected_section]()
+finally:
+    rerun_record = finish_rerun(selected_section)
+
+if debug_slot is not None:
+    from streamlit_app.visuals.debug_panel import display_debug_panel
+    with debug_slot.container():
+        display_debug_panel(rerun_record)
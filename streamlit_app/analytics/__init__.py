@@ -0,0 +1,4 @@
+# Streamlit-free aggregates behind the dashboard views. Every function takes a
+# read-only view of the issues (see frames.read_only), never modifies it, and
+# returns a small result frame, so results can be cached, computed in threads
+# and benchmarked without a Streamlit server.
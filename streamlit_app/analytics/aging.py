@@ -0,0 +1,29 @@
+import pandas as pd
+
+def aging_summary(view):
+    """Median days to acknowledge and acknowledgment rate of open issues, per summary, largest first."""
+    open_issues = view[view['status'].isin(["Open", "Acknowledged"])]
+    days_to_acknowledge = (open_issues['acknowledged_at'] - open_issues['created_at']).dt.days
+
+    summary = pd.DataFrame({
+        'summary': open_issues['summary'],
+        'days_to_acknowledge': days_to_acknowledge,
+        'acknowledged': open_issues['acknowledged_at'].notna(),
+    }).groupby('summary').agg(
+        median_days_to_acknowledge=('days_to_acknowledge', 'median'),
+        count_acknowledged=('acknowledged', 'sum'),
+        issue_count=('summary', 'count')
+    ).reset_index()
+
+    summary['percent_acknowledged'] = summary['count_acknowledged'] / summary['issue_count'] * 100
+    return summary.sort_values(by='issue_count', ascending=False)
+
+def aging_summary_from_quantiles(acknowledge_times):
+    """aging_summary from the open issues' merged time_to_acknowledge sketches."""
+    return pd.DataFrame({
+        'summary': acknowledge_times['summary'],
+        'median_days_to_acknowledge': acknowledge_times['p50'],
+        'count_acknowledged': acknowledge_times['value_count'],
+        'issue_count': acknowledge_times['issue_count'],
+        'percent_acknowledged': acknowledge_times['value_count'] / acknowledge_times['issue_count'] * 100,
+    }).sort_values(by='issue_count', ascending=False)
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+ONE_DAY = np.timedelta64(1, 'D')
+
+def backlog_series(df, by, end_column='closed_at'):
+    """
+    Open issues at the end of each day, per value of the by column.
+
+    Each issue adds +1 on the day it was created and -1 on the day in
+    end_column (never, while it is still open). The events are counted into
+    one (group, day) array and a cumulative sum along the days gives the
+    backlog for the whole history in one pass. Missing groups are labeled
+    "Unknown". Returns a frame indexed by day with one column per group.
+    """
+    created = df['created_at'].to_numpy().astype('datetime64[D]')
+    ended = df[end_column].to_numpy().astype('datetime64[D]')
+    if len(created) == 0:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name='day'))
+
+    codes, groups = pd.factorize(df[by].fillna("Unknown"), sort=True)
+    is_ended = ~np.isnat(ended)
+    first_day = created.min()
+    last_day = max(created.max(), ended[is_ended].max()) if is_ended.any() else created.max()
+    day_count = int((last_day - first_day) // ONE_DAY) + 1
+
+    # An issue ending before it was created counts as ending the day it was created.
+    start = ((created - first_day) // ONE_DAY).astype(np.int64)
+    end = np.maximum(((ended[is_ended] - first_day) // ONE_DAY).astype(np.int64), start[is_ended])
+
+    cells = len(groups) * day_count
+    events = np.bincount(codes * day_count + start, minlength=cells).astype(np.int64)
+    events -= np.bincount(codes[is_ended] * day_count + end, minlength=cells)
+    open_counts = np.cumsum(events.reshape(len(groups), day_count), axis=1)
+
+    days = pd.date_range(pd.Timestamp(first_day), periods=day_count, freq='D', name='day')
+    return pd.DataFrame(open_counts.T, index=days, columns=pd.Index(groups, name=by))
+
+def backlog_window(backlog, start, end):
+    """The backlog rows for the days from start to end, inclusive."""
+    return backlog.loc[pd.Timestamp(start).floor('D'):pd.Timestamp(end)]
+
+def top_backlog_groups(backlog, top_n):
+    """
+    Keep the top_n groups with the largest backlog on the last day and sum
+    the rest into an "Other" column.
+    """
+    top_groups = backlog.iloc[-1].nlargest(top_n).index
+    lumped = backlog[top_groups].copy()
+    if len(backlog.columns) > len(top_groups):
+        lumped["Other"] = backlog.drop(columns=top_groups).sum(axis=1)
+    return lumped
@@ -0,0 +1,30 @@
+def issues_per_period(view, period_code):
+    """Issues created per time period ("D", "W", "M" or "Y"), one row per period with issues."""
+    time_period = view['created_at'].dt.to_period(period_code).dt.start_time.rename('time_period')
+    return view.groupby(time_period).size().rename('issue_count').reset_index()
+
+def rollup_issues_per_period(daily_rollup, period_code):
+    """issues_per_period from the rollup cube's daily counts."""
+    time_period = daily_rollup['day'].dt.to_period(period_code).dt.start_time.rename('time_period')
+    return daily_rollup['issue_count'].groupby(time_period).sum().reset_index()
+
+def summary_counts(view):
+    """Issue count per summary, smallest first."""
+    return view['summary'].value_counts().sort_values(ascending=True)
+
+def rollup_summary_counts(summary_rollup):
+    """summary_counts from the rollup cube's per-summary counts."""
+    return summary_rollup.set_index('summary')['issue_count'].sort_values(ascending=True)
+
+def issues_per_department_day(view):
+    """Issues created per department per day."""
+    day = view['created_at'].dt.date.rename('created_at')
+    return view.groupby([day, view['department']]).size().reset_index(name='issue_count')
+
+def top_issue_per_department(view):
+    """The most reported summary of each department and its issue count."""
+    issue_counts = view.groupby(['department', 'summary']).size().reset_index(name='issue_count')
+    return (
+        issue_counts.sort_values(['department', 'issue_count'], ascending=[True, False])
+        .drop_duplicates(subset=['department'], keep='first')
+    )
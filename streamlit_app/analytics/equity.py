@@ -0,0 +1,36 @@
+import pandas as pd
+
+HIGHLIGHT_OPTIONS = [
+    "Issues per Capita",
+    "Issues per People of Color Population",
+    "Weighted Issue Count",
+]
+
+def tract_issue_counts(view, equity_attributes):
+    """
+    Join issue counts onto the equity attribute table. Returns one row per
+    tract with issue_count and issues_per_capita added.
+    """
+    issue_counts = view["equity_objectid"].value_counts()
+    issue_count = equity_attributes["equity_id"].map(issue_counts).fillna(0).astype(int)
+    population = equity_attributes["population"]
+    return equity_attributes.assign(
+        issue_count=issue_count,
+        issues_per_capita=(issue_count / population).where(population > 0, 0),
+    )
+
+def highlight_values(tract_counts, highlight_option):
+    """The per-tract value the equity map is colored by, for one of HIGHLIGHT_OPTIONS."""
+    if highlight_option == "Issues per People of Color Population":
+        poc_population = tract_counts["peopleofcolor_population"]
+        return (tract_counts["issue_count"] / poc_population).where(poc_population > 0, 0)
+    if highlight_option == "Weighted Issue Count":
+        # Multiply issue count by peopleofcolor fraction.
+        return tract_counts["issue_count"] * tract_counts["peopleofcolor"]
+    return tract_counts["issues_per_capita"]
+
+def equity_issues_population(view, equity_population):
+    """Issue counts next to population for every equity ID."""
+    issues_by_equity = view.groupby("equity_objectid")["id"].count().rename("issue_count").reset_index()
+    population_by_equity = equity_population.groupby("equity_objectid")["population"].sum().reset_index()
+    return pd.merge(issues_by_equity, population_by_equity, on="equity_objectid", how="outer").fillna(0)
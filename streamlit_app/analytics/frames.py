@@ -0,0 +1,21 @@
+import numpy as np
+import pandas as pd
+
+def read_only(df):
+    """
+    A view of df whose columns can't be written in place.
+
+    The view shares df's data without copying it. Writing into it (df.loc[...] = ...,
+    inplace=True) raises ValueError, while adding or replacing a column only
+    changes the view, so a function handed a read-only view can't change the
+    frame other views and sessions are reading. Extension-typed columns are
+    shared as they are.
+    """
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if isinstance(column.dtype, np.dtype):
+            column = column.to_numpy(copy=False).view()
+            column.flags.writeable = False
+        columns[name] = column
+    return pd.DataFrame(columns, index=df.index, copy=False)
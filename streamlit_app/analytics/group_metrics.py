@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+def group_sizes(codes, group_count, weights=None):
+    return np.bincount(codes, weights=weights, minlength=group_count)
+
+def group_medians(codes, values, group_count):
+    """Median of values per group code, ignoring missing values."""
+    present = ~np.isnan(values)
+    codes, values = codes[present], values[present]
+
+    # Sort by group, then value; each group's values are then one contiguous sorted run.
+    order = np.lexsort((values, codes))
+    codes, values = codes[order], values[order]
+    sizes = group_sizes(codes, group_count)
+    starts = np.r_[0, np.cumsum(sizes)[:-1]]
+
+    medians = np.full(group_count, np.nan)
+    has_values = sizes > 0
+    low = starts[has_values] + (sizes[has_values] - 1) // 2
+    high = starts[has_values] + sizes[has_values] // 2
+    medians[has_values] = (values[low] + values[high]) / 2
+    return medians
+
+def group_means(codes, values, group_count):
+    """Mean of values per group code, ignoring missing values."""
+    present = ~np.isnan(values)
+    totals = group_sizes(codes[present], group_count, weights=values[present])
+    counts = group_sizes(codes[present], group_count)
+    return np.divide(totals, counts, out=np.full(group_count, np.nan), where=counts > 0)
+
+def compute_group_metrics(df, by):
+    """
+    Issue counts, response times and top issue type per value of the by
+    column, from one factorization of the group and summary columns.
+
+    Rows with a missing group are left out, as in a groupby.
+    """
+    group_codes, groups = pd.factorize(df[by], sort=True)
+    in_group = group_codes >= 0
+    codes = group_codes[in_group]
+    group_count = len(groups)
+
+    def column(name):
+        return df[name].to_numpy(dtype=float)[in_group]
+
+    metrics = pd.DataFrame({
+        by: groups,
+        'issue_count': group_sizes(codes, group_count),
+        'acknowledged_count': group_sizes(codes, group_count, weights=df['acknowledged_at'].notna().to_numpy()[in_group]).astype(int),
+        'closed_count': group_sizes(codes, group_count, weights=df['closed_at'].notna().to_numpy()[in_group]).astype(int),
+        'avg_time_to_acknowledge': group_means(codes, column('time_to_acknowledge'), group_count),
+        'avg_time_to_close': group_means(codes, column('time_to_close'), group_count),
+        'median_time_to_acknowledge': group_medians(codes, column('time_to_acknowledge'), group_count),
+        'median_time_to_close': group_medians(codes, column('time_to_close'), group_count),
+        'median_days_to_resolve': group_medians(codes, column('days_to_resolve'), group_count),
+    })
+
+    # --- Top summary per group: count (group, summary) pairs, then keep each group's largest ---
+    summary_codes, summaries = pd.factorize(df['summary'], sort=True)
+    summary_codes = summary_codes[in_group]
+    has_summary = summary_codes >= 0
+    pair_keys, pair_counts = np.unique(
+        codes[has_summary].astype(np.int64) * len(summaries) + summary_codes[has_summary],
+        return_counts=True
+    )
+    pair_groups = pair_keys // max(len(summaries), 1)
+    pair_summaries = pair_keys % max(len(summaries), 1)
+
+    # Largest count first within each group; ties go to the alphabetically first summary.
+    order = np.lexsort((pair_summaries, -pair_counts, pair_groups))
+    first = order[np.r_[True, pair_groups[order][1:] != pair_groups[order][:-1]]] if len(order) else order
+
+    top_summary = np.full(group_count, None, dtype=object)
+    top_summary_count = np.zeros(group_count, dtype=int)
+    top_summary[pair_groups[first]] = np.asarray(summaries)[pair_summaries[first]]
+    top_summary_count[pair_groups[first]] = pair_counts[first]
+    metrics['top_summary'] = top_summary
+    metrics['top_summary_count'] = top_summary_count
+
+    return metrics
+
+def performance_table(metrics, by):
+    """Counts, rates, mean response times and top issue type per group, largest first."""
+    stats = pd.DataFrame({
+        by: metrics[by],
+        'total_issues': metrics['issue_count'],
+        'acknowledged_issues': metrics['acknowledged_count'],
+        'closed_issues': metrics['closed_count'],
+        'avg_time_to_acknowledge': metrics['avg_time_to_acknowledge'],
+        'avg_time_to_close': metrics['avg_time_to_close'],
+        'acknowledgment_rate': metrics['acknowledged_count'] / metrics['issue_count'] * 100,
+        'closure_rate': metrics['closed_count'] / metrics['issue_count'] * 100,
+        'top_issue_type': metrics['top_summary'],
+    })
+    return stats.sort_values(by='total_issues', ascending=False)
+
+def top_summary_table(metrics, by):
+    """The most common issue type per group and its count, leaving out groups without one."""
+    table = metrics.loc[metrics['top_summary_count'] > 0, [by, 'top_summary', 'top_summary_count']]
+    return table.rename(columns={'top_summary': 'issue', 'top_summary_count': 'count'})
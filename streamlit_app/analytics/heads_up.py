@@ -0,0 +1,97 @@
+from datetime import timedelta
+
+import numpy as np
+import pandas as pd
+from streamlit_app.filters.time_index import build_time_index, subset_created_range, subset_resolved_range
+
+def rolling_weeks(current_date):
+    """
+    The last 7 days up to current_date and the 7 days before them, as dates
+    for display and [start, end) timestamp windows for selecting issues.
+    """
+    current_start = current_date - timedelta(days=6)
+    previous_start = current_start - timedelta(days=7)
+    previous_end = current_date - timedelta(days=7)
+    return {
+        "current_start": current_start,
+        "current_end": current_date,
+        "previous_start": previous_start,
+        "previous_end": previous_end,
+        # The current window leaves out the current date, which is still filling up.
+        "current_window": (pd.Timestamp(current_start), pd.Timestamp(current_date)),
+        "previous_window": (pd.Timestamp(previous_start), pd.Timestamp(previous_end + timedelta(days=1))),
+    }
+
+def weekly_issues(view, time_index=None, current_date=None):
+    """
+    The rolling weeks ending at current_date (by default the day of the newest
+    issue in view), and the issues created and resolved in each of them.
+    view must be in created_at order.
+
+    time_index is the index of the full frame view was taken from, whose row
+    labels are its positions (as from load_issues); the windows are then binary
+    searches in it. Without one, an index is built for view.
+    """
+    if time_index is None:
+        time_index = build_time_index(view)
+        positions = np.arange(len(view))
+    else:
+        positions = view.index.to_numpy()
+    weeks = rolling_weeks(current_date or pd.Timestamp(view['created_at'].iloc[-1]).date())
+
+    def created(window):
+        return view.iloc[subset_created_range(time_index, positions, *window, include_end=False)]
+
+    def resolved(window):
+        return view.take(subset_resolved_range(time_index, positions, *window, include_end=False))
+
+    return weeks, {
+        "created_current": created(weeks["current_window"]),
+        "created_previous": created(weeks["previous_window"]),
+        "resolved_current": resolved(weeks["current_window"]),
+        "resolved_previous": resolved(weeks["previous_window"]),
+    }
+
+def change_percent(current_count, previous_count):
+    """Percent change from the previous count, or None when there was nothing before."""
+    if previous_count == 0:
+        return None
+    return (current_count - previous_count) / previous_count * 100
+
+def top_value_share(view, column="summary"):
+    """The most common value of column, its count and its percent of the non-missing values, or None when there are none."""
+    if column not in view.columns:
+        raise ValueError(f"Column '{column}' not found in DataFrame.")
+    counts = view[column].value_counts()
+    if counts.empty:
+        return None
+    return counts.index[0], int(counts.iloc[0]), counts.iloc[0] / counts.sum() * 100
+
+def value_shares(view, column):
+    """Count and percent of the whole for each value of column, most common first."""
+    counts = view[column].value_counts()
+    return pd.DataFrame({
+        'Category': counts.index.astype(str),
+        'Count': counts.values,
+        'Percentage': (counts / counts.sum() * 100).round(2).values,
+    })
+
+def treemap_nodes(view, column="summary", threshold=5):
+    """
+    Treemap nodes (ids, labels, parents, values, percents) for the values of
+    column under an "All Records" root. Values below threshold percent of the
+    whole are grouped under an "Other" node.
+    """
+    counts = view[column].value_counts()
+    total = counts.sum()
+    percentages = (counts / total * 100).round(2)
+    significant = percentages >= threshold
+    small = counts[~significant]
+
+    nodes = [("All Records", "All Records", "", total, 100)]
+    nodes += [(value, value, "All Records", counts[value], percentages[value]) for value in counts[significant].index]
+    if not small.empty:
+        nodes.append(("Other", "Other", "All Records", small.sum(), percentages[~significant].sum()))
+        nodes += [("Other_" + value, value, "Other", counts[value], percentages[value]) for value in small.index]
+
+    return pd.DataFrame(nodes, columns=['ids', 'labels', 'parents', 'values', 'percents'])
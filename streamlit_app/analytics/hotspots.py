@@ -0,0 +1,70 @@
+# Quarter-mile hotspot cells, shared by the export DAG (which maintains the
+# per-quarter counts) and the dashboard (which falls back to counting the
+# loaded issues), so both count the same issues the same way.
+import numpy as np
+import pandas as pd
+from streamlit_app.data.readers import SHOW_ISSUES_AFTER_DATE
+
+# Quarter-mile grid, square at Tacoma's latitude.
+QUARTER_MILE_METERS = 402.336
+METERS_PER_DEGREE_LAT = 111320
+HOTSPOT_REFERENCE_LAT = 47.25
+HOTSPOT_CELL_LAT = QUARTER_MILE_METERS / METERS_PER_DEGREE_LAT
+HOTSPOT_CELL_LNG = HOTSPOT_CELL_LAT / np.cos(np.radians(HOTSPOT_REFERENCE_LAT))
+
+def hotspot_cell_counts(df):
+    """
+    Count issues per quarter-mile cell, calendar quarter and summary, from the
+    quarters the dashboard shows (created on or after SHOW_ISSUES_AFTER_DATE).
+    """
+    df = df.dropna(subset=['lat', 'lng', 'created_at'])
+    df = df[df['created_at'] >= SHOW_ISSUES_AFTER_DATE]
+    cells = pd.DataFrame({
+        'cell_row': np.floor(df['lat'].to_numpy() / HOTSPOT_CELL_LAT).astype('int64'),
+        'cell_col': np.floor(df['lng'].to_numpy() / HOTSPOT_CELL_LNG).astype('int64'),
+        'quarter': df['created_at'].dt.to_period('Q').dt.start_time.to_numpy(),
+        'summary': df['summary'].to_numpy(),
+    })
+    counts = cells.groupby(['cell_row', 'cell_col', 'quarter', 'summary'], dropna=False).size().reset_index(name='issue_count')
+    counts['lat'] = (counts['cell_row'] + 0.5) * HOTSPOT_CELL_LAT
+    counts['lng'] = (counts['cell_col'] + 0.5) * HOTSPOT_CELL_LNG
+    return counts
+
+def rank_chronic_cells(cells, threshold, min_quarters):
+    """
+    Rank cells that reach threshold issues in at least min_quarters consecutive quarters.
+
+    Returns one row per chronic cell with its longest and current streak of hot
+    quarters, hot quarter count and total issues, longest streaks first.
+    """
+    per_quarter = cells.groupby(['cell_row', 'cell_col', 'quarter'], as_index=False).agg(
+        issue_count=('issue_count', 'sum'), lat=('lat', 'first'), lng=('lng', 'first')
+    )
+    latest_quarter = per_quarter['quarter'].max()
+    totals = per_quarter.groupby(['cell_row', 'cell_col'])['issue_count'].sum().rename('total_issues')
+
+    hot = per_quarter[per_quarter['issue_count'] >= threshold].sort_values(['cell_row', 'cell_col', 'quarter'])
+    if hot.empty:
+        return pd.DataFrame(columns=['cell_row', 'cell_col', 'lat', 'lng', 'longest_streak', 'current_streak', 'hot_quarters', 'total_issues'])
+
+    # A new run starts when the cell changes or a quarter is skipped.
+    quarter_number = hot['quarter'].dt.year.to_numpy() * 4 + hot['quarter'].dt.quarter.to_numpy()
+    row = hot['cell_row'].to_numpy()
+    col = hot['cell_col'].to_numpy()
+    run_start = np.r_[True, (row[1:] != row[:-1]) | (col[1:] != col[:-1]) | (quarter_number[1:] != quarter_number[:-1] + 1)]
+    hot = hot.assign(run=np.cumsum(run_start))
+
+    runs = hot.groupby('run').agg(
+        cell_row=('cell_row', 'first'), cell_col=('cell_col', 'first'),
+        lat=('lat', 'first'), lng=('lng', 'first'),
+        length=('quarter', 'size'), last_quarter=('quarter', 'max')
+    )
+    runs['current'] = runs['length'].where(runs['last_quarter'] == latest_quarter, 0)
+
+    chronic = runs.groupby(['cell_row', 'cell_col']).agg(
+        lat=('lat', 'first'), lng=('lng', 'first'),
+        longest_streak=('length', 'max'), current_streak=('current', 'max'), hot_quarters=('length', 'sum')
+    ).join(totals).reset_index()
+
+    chronic = chronic[chronic['longest_streak'] >= min_quarters]
+    return chronic.sort_values(['longest_streak', 'current_streak', 'total_issues'], ascending=False).reset_index(drop=True)
@@ -0,0 +1,10 @@
+def assignee_resolution_stats(view):
+    """Issue count and mean days to acknowledge or close, per assignee."""
+    return view.groupby('assignee_name').agg(
+        num_issues=('id', 'count'),
+        avg_time_to_resolution=('time_to_resolution', 'mean')
+    ).reset_index()
+
+def resolution_by_group(metrics, by):
+    """Issue count and median days to acknowledge or close per group, from grouped metrics or merged sketches."""
+    return metrics.rename(columns={'p50': 'median_days_to_resolve'})[[by, 'issue_count', 'median_days_to_resolve']]
@@ -0,0 +1,11 @@
+from streamlit_app.analytics.backlog import backlog_series
+from streamlit_app.data.view_cache import cached_view
+from streamlit_app.data.dataset_identity import without_date_range
+
+def query_backlog(df, filter_state, by, end_column='closed_at'):
+    """
+    Backlog curves for the rows of df, which should not be limited to the date
+    range. Results are shared through the view cache and must not be modified.
+    """
+    # The backlog covers the whole history, so the date range does not affect it.
+    return cached_view("backlog", without_date_range(filter_state), lambda: backlog_series(df, by, end_column), by, end_column)
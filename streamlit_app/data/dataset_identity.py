@@ -0,0 +1,58 @@
+import hashlib
+import json
+import os
+from datetime import date, datetime
+
+import numpy as np
+
+ISSUES_PATH = "exports/seeclickfix_issues_dump.parquet"
+
+# The export DAG stores the data version of the export each sidecar file
+# (rollup cube, sketches, hotspot cells, profile) was built from under this key.
+SOURCE_VERSION_KEY = "source_version"
+
+def file_version(path):
+    """Identify a file by its modification time and size."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return "missing"
+    return f"{stat.st_mtime_ns:x}-{stat.st_size:x}"
+
+def issues_data_version(path=ISSUES_PATH):
+    """Identify the issues export by its modification time and size."""
+    return file_version(path)
+
+def canonical_value(value):
+    """
+    Convert a filter value into a JSON-ready form that does not depend on
+    selection order. Lists are treated as sets; tuples keep their order.
+    """
+    if isinstance(value, dict):
+        return {str(key): canonical_value(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [canonical_value(item) for item in value]
+    if isinstance(value, (list, set, frozenset)):
+        return sorted((canonical_value(item) for item in value), key=repr)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+def filter_fingerprint(filter_state):
+    """Short, stable hash of a filter state, including the data version it carries."""
+    canonical = json.dumps(canonical_value(filter_state), sort_keys=True, default=str)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:16]
+
+def without_date_range(filter_state):
+    """The filter state of a view that covers the whole history, such as the non-date filtered rows."""
+    if filter_state is None:
+        return None
+    return {key: value for key, value in filter_state.items() if key != "date_range"}
+
+def view_key(name, filter_state):
+    """Widget or cache key for a view of the filtered data, without hashing the rows."""
+    if filter_state is None:
+        return name
+    return f"{name}_{filter_fingerprint(filter_state)}"
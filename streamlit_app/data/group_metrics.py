@@ -0,0 +1,9 @@
+from streamlit_app.analytics.group_metrics import compute_group_metrics
+from streamlit_app.data.view_cache import cached_view
+
+def group_metrics(df, by, filter_state=None):
+    """
+    Grouped metrics for df by the given column, shared across sessions per
+    filter state. The result is cached, so callers must not modify it.
+    """
+    return cached_view("group_metrics", filter_state, lambda: compute_group_metrics(df, by), by)
@@ -1,19 +1,23 @@
 import pandas as pd
 import streamlit as st
-import json
+from streamlit_app.data.readers import EQUITY_GEOJSON_PATH, read_equity_attributes
+
+@st.cache_data
+def load_equity_attributes():
+    """
+    Loads the equity tract properties into a typed table with one row per
+    tract, keyed by equity_id (the tract objectid).
+    """
+    return read_equity_attributes()
 
 @st.cache_data
 def load_equity_population():
     """Loads equity population data from GeoJSON."""
-    with open("exports/Equity_Index_2024_(Tacoma).geojson", "r", encoding="utf-8") as f:
-        data = json.load(f)
+    equity_attributes = load_equity_attributes()
+
+    equity_population_df = pd.DataFrame({
+        "equity_objectid": equity_attributes["equity_id"],
+        "population": equity_attributes["population"].fillna(0)  # Default to 0 if missing
+    })
 
-    equity_population_df = pd.DataFrame([
-        {
-            "equity_objectid": feature["properties"].get("objectid"),
-            "population": feature["properties"].get("population", 0)  # Default to 0 if missing
-        }
-        for feature in data["features"]
-    ])
-    
     return equity_population_df
@@ -0,0 +1,44 @@
+import pandas as pd
+import streamlit as st
+from streamlit_app.analytics.hotspots import hotspot_cell_counts, rank_chronic_cells
+from streamlit_app.data.load_issues import load_issues
+from streamlit_app.data.dataset_identity import file_version, issues_data_version
+from streamlit_app.data.readers import read_sidecar_parquet
+from streamlit_app.data.view_cache import cached_view
+
+HOTSPOT_PATH = "exports/seeclickfix_hotspot_cells.parquet"
+
+def load_hotspot_cells(data_version):
+    """
+    Loads the per-cell quarterly counts maintained by the export DAG, or counts
+    them from the loaded issues when the file is missing or was built from a
+    different export than the loaded issues (data_version).
+    """
+    return read_hotspot_cells(data_version, file_version(HOTSPOT_PATH))
+
+@st.cache_data(max_entries=2)
+def read_hotspot_cells(data_version, hotspot_version):
+    # The cells' own file version is part of the key, so a rewritten file is read again.
+    if hotspot_version != "missing":
+        cells, source_version = read_sidecar_parquet(HOTSPOT_PATH)
+        if source_version == data_version:
+            cells['quarter'] = pd.to_datetime(cells['quarter'])
+            return cells
+    return hotspot_cell_counts(load_issues())
+
+def query_chronic_cells(filter_state, threshold, min_quarters):
+    """
+    Chronic cells over every quarter the dashboard shows, limited to the selected summaries.
+    Results are shared through the view cache and must not be modified.
+    """
+    summaries = (filter_state or {}).get("summaries") or []
+    data_version = (filter_state or {}).get("data_version") or issues_data_version()
+
+    def compute():
+        cells = load_hotspot_cells(data_version)
+        if summaries:
+            cells = cells[cells['summary'].isin(summaries)]
+        return rank_chronic_cells(cells, threshold, min_quarters)
+
+    # Only the summary selection applies, so key the cache on it alone.
+    return cached_view("chronic_cells", {"summaries": summaries, "data_version": data_version}, compute, threshold, min_quarters)
@@ -0,0 +1,85 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# Same database as the DAGs; the dashboard container reaches it on the compose network.
+# Keep in sync with DB_CONN_PARAMS in dags/common/pipeline_metrics.py.
+DB_CONN_PARAMS = {
+    "dbname": "airflow",
+    "user": "airflow",
+    "password": "airflow",
+    "host": "postgres",
+    "port": 5432,
+}
+
+# How much metric history the dashboard reads.
+PIPELINE_METRICS_DAYS = 30
+
+@st.cache_data(ttl=300)
+def load_pipeline_metrics(days=PIPELINE_METRICS_DAYS):
+    """
+    Loads the last few days of DAG task metrics from the pipeline_metrics table.
+
+    Returns None when the database or the table can't be reached, so the
+    dashboard still works from the Parquet export alone.
+    """
+    try:
+        import psycopg2
+    except ImportError:
+        return None
+
+    try:
+        conn = psycopg2.connect(**DB_CONN_PARAMS, connect_timeout=3)
+    except psycopg2.Error:
+        return None
+
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT recorded_at, dag_id, task_id, run_id, metric, value, labels FROM pipeline_metrics "
+                "WHERE recorded_at >= (now() AT TIME ZONE 'utc') - %s * INTERVAL '1 day' ORDER BY recorded_at",
+                (days,),
+            )
+            rows = cursor.fetchall()
+    except psycopg2.Error:
+        return None
+    finally:
+        conn.close()
+
+    metrics = pd.DataFrame(rows, columns=["recorded_at", "dag_id", "task_id", "run_id", "metric", "value", "labels"])
+    metrics['recorded_at'] = pd.to_datetime(metrics['recorded_at'])
+    return metrics
+
+def metric_series(metrics, metric, task_id=None, label=None):
+    """
+    One row per recording of a metric, with the value of one label pulled
+    out into its own column when label is given.
+    """
+    series = metrics[metrics['metric'] == metric]
+    if task_id is not None:
+        series = series[series['task_id'] == task_id]
+    series = series[['recorded_at', 'task_id', 'run_id', 'value', 'labels']].copy()
+    if label is not None:
+        series[label] = series['labels'].map(lambda labels: (labels or {}).get(label))
+    return series.drop(columns='labels')
+
+def histogram_quantiles(metrics, name, quantiles=(0.5, 0.95)):
+    """
+    Quantiles of a recorded histogram per run, read off the cumulative bucket
+    counts as the upper bound of the first bucket reaching each rank.
+    """
+    buckets = metric_series(metrics, f"{name}_bucket", label="le")
+    if buckets.empty:
+        return pd.DataFrame(columns=["recorded_at", "run_id"] + [f"p{round(q * 100)}" for q in quantiles])
+
+    buckets['le'] = buckets['le'].astype(float)
+    rows = []
+    for (recorded_at, run_id), run in buckets.groupby(['recorded_at', 'run_id'], dropna=False):
+        run = run.sort_values('le')
+        total = run['value'].iloc[-1]
+        row = {"recorded_at": recorded_at, "run_id": run_id}
+        for q in quantiles:
+            reached = run[run['value'] >= max(np.ceil(q * total), 1)]
+            row[f"p{round(q * 100)}"] = reached['le'].iloc[0] if total and not reached.empty else np.nan
+        rows.append(row)
+    return pd.DataFrame(rows)
@@ -0,0 +1,40 @@
+import json
+import pandas as pd
+import streamlit as st
+from streamlit_app.data.dataset_identity import SOURCE_VERSION_KEY, file_version
+
+PROFILE_PATH = "exports/seeclickfix_issues_profile.json"
+
+def load_dataset_profile(data_version):
+    """
+    Loads the dataset profile written by the export DAG.
+
+    Returns None when the profile is missing or was built from a different
+    export than the loaded issues (data_version), so callers fall back to
+    scanning the loaded issues.
+    """
+    return read_dataset_profile(data_version, file_version(PROFILE_PATH))
+
+@st.cache_data(max_entries=2)
+def read_dataset_profile(data_version, profile_version):
+    # The profile's own file version is part of the key, so a rewritten profile is read again.
+    if profile_version == "missing":
+        return None
+
+    with open(PROFILE_PATH, "r", encoding="utf-8") as f:
+        profile = json.load(f)
+    return profile if profile.get(SOURCE_VERSION_KEY) == data_version else None
+
+def dimension_values(profile, column, dropna=True):
+    """Distinct values of a filter dimension, most frequent first."""
+    values = [entry["value"] for entry in profile["dimensions"][column]]
+    return [value for value in values if value is not None] if dropna else values
+
+def created_at_bounds(profile):
+    """First and last created_at in the profile as datetimes."""
+    return (pd.Timestamp(profile["created_at"]["min"]).to_pydatetime(),
+            pd.Timestamp(profile["created_at"]["max"]).to_pydatetime())
+
+def describe_table(profile):
+    """The export's describe(include='all') table."""
+    return pd.DataFrame(profile["columns"]["describe"])
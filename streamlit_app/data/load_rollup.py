@@ -0,0 +1,73 @@
+import pandas as pd
+import streamlit as st
+from streamlit_app.data.load_issues import SHOW_ISSUES_AFTER_DATE
+from streamlit_app.data.dataset_identity import file_version
+from streamlit_app.data.readers import read_sidecar_parquet
+from streamlit_app.filters.filters import filter_frame
+from streamlit_app.filters.selections import filter_selections
+from streamlit_app.data.view_cache import cached_view
+
+ROLLUP_PATH = "exports/seeclickfix_issues_rollup.parquet"
+
+# Filter dimensions kept in the cube; views filtered on any other read the rows.
+# Keep in sync with dags/export_seeclickfix_issues.py.
+ROLLUP_DIMENSIONS = [
+    "summary",
+    "district_display",
+    "homeless_related",
+    "within_10_blocks_of_shelter",
+]
+
+ROLLUP_MEASURES = [
+    "issue_count",
+    "acknowledged_count",
+    "closed_count",
+    "time_to_acknowledge_sum",
+    "time_to_close_sum",
+]
+
+def load_rollup(data_version):
+    """
+    Loads the daily rollup cube written by the export DAG.
+
+    Returns None when the cube is missing or was built from a different export
+    than the loaded issues (data_version), so callers fall back to the row-level data.
+    """
+    return read_rollup(data_version, file_version(ROLLUP_PATH))
+
+@st.cache_data(max_entries=2)
+def read_rollup(data_version, rollup_version):
+    # The cube's own file version is part of the key, so a rewritten cube is read again.
+    if rollup_version == "missing":
+        return None
+
+    cube, source_version = read_sidecar_parquet(ROLLUP_PATH)
+    if source_version != data_version:
+        return None
+    cube['day'] = pd.to_datetime(cube['day'])
+    cube = cube[cube['day'] >= SHOW_ISSUES_AFTER_DATE]
+    return cube
+
+def query_rollup(filter_state, by, use_date_range=True):
+    """
+    Answer a grouped count query from the rollup cube.
+
+    Applies the filter state to the cube and sums the measures per group in `by`.
+    Returns None when there is no filter state, no cube is available or the
+    filter state selects on a dimension the cube leaves out. Results are shared
+    through the view cache and must not be modified.
+    """
+    if filter_state is None:
+        return None
+    if any(column not in ROLLUP_DIMENSIONS for column, _ in filter_selections(filter_state)):
+        return None
+    cube = load_rollup(filter_state["data_version"])
+    if cube is None:
+        return None
+
+    def compute():
+        filtered_cube = filter_frame(cube, filter_state, date_column="day" if use_date_range else None)
+        return filtered_cube.groupby(by)[ROLLUP_MEASURES].sum().reset_index()
+
+    by_key = (by,) if isinstance(by, str) else tuple(by)
+    return cached_view("rollup", filter_state, compute, by_key, use_date_range)
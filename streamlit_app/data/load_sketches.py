@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit_app.data.load_issues import SHOW_ISSUES_AFTER_DATE
+from streamlit_app.data.dataset_identity import file_version
+from streamlit_app.data.readers import read_sidecar_parquet
+from streamlit_app.filters.filters import filter_frame
+from streamlit_app.data.view_cache import cached_view
+
+SKETCH_PATH = "exports/seeclickfix_issues_sketches.parquet"
+
+# Bucket layout of the quantile sketches written by the export DAG.
+# Keep in sync with dags/export_seeclickfix_issues.py.
+SKETCH_EXACT_DAYS = 32
+SKETCH_GROWTH = 1.1
+SKETCH_MISSING_BUCKET = -1
+
+def load_sketches(data_version):
+    """
+    Loads the per-day quantile sketches written by the export DAG, split by metric.
+
+    Returns None when the sketches are missing or were built from a different
+    export than the loaded issues (data_version), so callers fall back to the row-level data.
+    """
+    return read_sketches(data_version, file_version(SKETCH_PATH))
+
+@st.cache_data(max_entries=2)
+def read_sketches(data_version, sketch_version):
+    # The sketches' own file version is part of the key, so rewritten sketches are read again.
+    if sketch_version == "missing":
+        return None
+
+    sketches, source_version = read_sidecar_parquet(SKETCH_PATH)
+    if source_version != data_version:
+        return None
+    sketches['day'] = pd.to_datetime(sketches['day'])
+    sketches = sketches[sketches['day'] >= SHOW_ISSUES_AFTER_DATE]
+    return {metric: frame.drop(columns='metric') for metric, frame in sketches.groupby('metric')}
+
+def bucket_value(buckets):
+    """Representative day count of each bucket: exact below SKETCH_EXACT_DAYS, else the geometric midpoint."""
+    buckets = np.asarray(buckets, dtype=float)
+    growth = SKETCH_EXACT_DAYS * SKETCH_GROWTH ** (buckets - SKETCH_EXACT_DAYS + 0.5)
+    return np.where(buckets < SKETCH_EXACT_DAYS, buckets, growth)
+
+def merge_sketches(sketches, by, quantiles):
+    """
+    Merge sketch buckets per group and read off quantiles.
+
+    Returns one row per group with issue_count (all issues), value_count
+    (issues with a value) and one column per quantile, named like p50.
+    """
+    merged = sketches.groupby(by + ['bucket'])['count'].sum().reset_index()
+    totals = merged.groupby(by)['count'].sum().rename('issue_count')
+
+    valued = merged[merged['bucket'] != SKETCH_MISSING_BUCKET].sort_values(by + ['bucket'])
+    value_counts = valued.groupby(by)['count'].sum().rename('value_count')
+    result = pd.concat([totals, value_counts], axis=1).fillna({'value_count': 0})
+    result['value_count'] = result['value_count'].astype(int)
+
+    # Cumulative counts within each group; the value at a rank is the first bucket reaching it.
+    cumulative = valued.groupby(by)['count'].cumsum().to_numpy()
+    group_total = valued.groupby(by)['count'].transform('sum').to_numpy()
+
+    def value_at_rank(rank):
+        first = valued.loc[cumulative >= rank].groupby(by)['bucket'].first()
+        return pd.Series(bucket_value(first), index=first.index)
+
+    # Interpolate between the values at the ranks around (n - 1) * q, as pandas
+    # quantiles and medians do, so an even count's median averages the middle two.
+    for q in quantiles:
+        position = (group_total - 1) * q
+        low = value_at_rank(np.floor(position) + 1)
+        high = value_at_rank(np.ceil(position) + 1)
+        group_position = (value_counts - 1) * q
+        fraction = group_position - np.floor(group_position)
+        result[f"p{round(q * 100)}"] = low + fraction.reindex(low.index) * (high - low)
+
+    return result.reset_index()
+
+def query_quantiles(filter_state, by, metric, quantiles=(0.5,), open_only=False):
+    """
+    Answer grouped quantiles of a response-time metric from the sketches.
+
+    Applies the filter state to the sketches and merges them per group in `by`.
+    Returns None when there is no filter state or no sketches are available.
+    Results are shared through the view cache and must not be modified.
+    """
+    if filter_state is None:
+        return None
+    sketches = load_sketches(filter_state["data_version"])
+    if sketches is None:
+        return None
+
+    by = [by] if isinstance(by, str) else list(by)
+
+    def compute():
+        filtered = filter_frame(sketches[metric], filter_state, date_column="day")
+        if open_only:
+            filtered = filtered[filtered['open_issue']]
+        return merge_sketches(filtered, by, quantiles)
+
+    return cached_view("quantiles", filter_state, compute, tuple(by), metric, tuple(quantiles), open_only)
@@ -0,0 +1,143 @@
+# Readers for the exported files, without Streamlit, so tools outside the app
+# (the aggregates API, the report renderer in Airflow) load the data the same way.
+import json
+import pandas as pd
+import pyarrow.parquet as pq
+from streamlit_app.data.dataset_identity import ISSUES_PATH, SOURCE_VERSION_KEY
+
+SHOW_ISSUES_AFTER_DATE = '2024-01-01'
+
+EQUITY_GEOJSON_PATH = "exports/Equity_Index_2024_(Tacoma).geojson"
+
+# Categorical equity properties; every other attribute is numeric.
+EQUITY_CATEGORY_ATTRIBUTES = [
+    "equityindex", "livabilityindex", "accessibilityindex", "economicindex",
+    "educationindex", "environmentalindex",
+]
+EQUITY_NUMERIC_ATTRIBUTES = [
+    "equityindexvalue", "livabilityindexvalue", "accessibilityindexvalue", "economicindexvalue",
+    "educationindexvalue", "environmentalindexvalue", "averagepavementcondition",
+    "healthyfoodavailability", "householdvehicleaccess", "householdswithinternet", "parksopenspace",
+    "communityparks", "regionalparks", "neighborhoodparks", "transitaccessscore",
+    "voterparticipationrate", "sidewalksandbikeways", "f200__of_poverty", "povertyrate", "jobsindex",
+    "jobsdensity", "medianhouseholdincome", "employmentrate", "averagestudentmobility",
+    "percent25yearoldswithbachelorsd", "averagetestingproficiency", "educationalattainmentindex",
+    "highschoolgraduationrate", "kindergartenreadinessrate", "dieselemissions", "ozoneconcentration",
+    "pm25particulates", "toxicreleasesfromfacilities", "proximitytoheavytrafficroadways",
+    "urbanheatislandeffect", "urbantreecanopy", "costburdenedhouseholds", "ownercostburden",
+    "rentercostburden", "owneroccupiedunits", "medianhomevalue", "pedestrianbicyclistcrashes",
+    "tacomacrimerisk", "tacomapersonalcrime", "tacomapropertycrime", "insuredrate",
+    "averagelifeexpectancy", "population", "populationdensity", "limitedenglish", "populationunder18",
+    "population18to64", "population65andabove", "americanindianoralaskannative", "asian",
+    "blackorafricanamerican", "hispanicorlatino", "nativehawaiianorpacificislander", "otherrace",
+    "twoormoreraces", "white", "peopleofcolor",
+]
+
+def read_issues(path=ISSUES_PATH):
+    """Reads the issues export and adds the derived columns the views use."""
+    df = pd.read_parquet(path)
+    df['created_at'] = pd.to_datetime(df['created_at'])
+
+    df = df[df['created_at'] >= SHOW_ISSUES_AFTER_DATE]
+
+    # Keep issues in creation order so date windows are binary searches.
+    # Row labels are positions, so filtered frames can be mapped back to precomputed indexes.
+    df = df.sort_values('created_at', kind='stable').reset_index(drop=True)
+
+    df['updated_at'] = pd.to_datetime(df['updated_at'])
+    df['acknowledged_at'] = pd.to_datetime(df['acknowledged_at'])
+    df['closed_at'] = pd.to_datetime(df['closed_at'])
+
+    df['homeless_related'] = df['summary'].str.contains("homeless|someone living on", case=False, na=False) | \
+                            df['description'].str.contains("homeless", case=False, na=False)
+
+    df['homeless_related'] = df['homeless_related'].map({True: 'homeless-related', False: 'other issues'})
+
+    # Create formatted district display
+    df['district_display'] = df['council_district'].fillna(0).astype(int).astype(str) + " - " + df['councilmember'].fillna("Unknown")
+    
+    # Create formatted police district-sector display
+    df['police_district_sector'] = df['police_sector'].astype(str) + " - " + df['police_district'].astype(str)
+
+    # Fill missing values for shelter-related fields
+    df['within_10_blocks_of_shelter'] = df['within_10_blocks_of_shelter'].fillna(False)
+
+    # First resolution either acknowledged or closed
+    df['resolved_at'] = df[['acknowledged_at', 'closed_at']].min(axis=1)
+    df['time_to_resolution'] = (df['resolved_at'] - df['created_at']).dt.days
+
+    # --- Compute time-based metrics ---
+    df['time_to_acknowledge'] = (df['acknowledged_at'] - df['created_at']).dt.days
+    df['time_to_close'] = (df['closed_at'] - df['created_at']).dt.days
+
+    # Compute median days to acknowledge or close
+    df['days_to_resolve'] = (df[['acknowledged_at', 'closed_at']].min(axis=1) - df['created_at']).dt.days
+
+    df = prepare_department_data(df)
+
+    return df
+
+def prepare_department_data(df):
+    # --- Create department prefix from assignee_name ---
+    # Split the assignee name by "_" and take the first part.
+    df['assignee_department_prefix'] = df['assignee_name'].str.split("_").str[0]
+
+    # --- Mapping dictionary: raw prefix to department ---
+    department_mapping = {
+        "NCS": "Neighborhood and Community Services",
+        "TPD": "Tacoma Police Department",
+        "Police Department - Traffic - JN": "Tacoma Police Department",
+        "Police Department - Traffic - HM": "Tacoma Police Department",
+        "ES": "Environmental Services",
+        "PW": "Public Works",
+        "311 Customer Support Center": "311 Support",
+        "PDS Code Case": "Planning and Development Services",
+        "T&L": "Public Works",
+        "CMO": "City Manager’s Office",
+        "PDS": "Planning and Development Services",
+        "OEHR": "Office of Equity and Human Rights",
+        "Public Works - D.S.": "Public Works",
+        "Public Works - Streets - TD": "Public Works",
+        "Public Works - Traffic - JK": "Public Works",
+        "Public Works - Streets - NG": "Public Works",
+        "Fire": "Tacoma Fire Department",
+        "PPW Water Quality Specialist - Davidson": "Public Works",
+        "PPW – Asst Airport Administrator - Propst": "Public Works",
+        "PPW Water Quality Specialist - Thompson": "Public Works",
+        "IT": "Information Technology",
+        "TPU": "Tacoma Public Utilities",
+        "TVE": "Tacoma Venues & Events",
+        "CED": "Community & Economic Development"
+    }
+
+    # --- Map the raw department prefix to a new "department" column ---
+    df['department'] = df['assignee_department_prefix'].map(department_mapping)
+    
+    return df
+
+def read_sidecar_parquet(path):
+    """
+    Reads a Parquet file the export DAG builds from the issues export, with the
+    data version of the export it was built from (None when it was not recorded).
+    """
+    table = pq.read_table(path)
+    source_version = (table.schema.metadata or {}).get(SOURCE_VERSION_KEY.encode())
+    return table.to_pandas(), source_version.decode() if source_version is not None else None
+
+def read_equity_attributes(path=EQUITY_GEOJSON_PATH):
+    """
+    Reads the equity tract properties into a typed table with one row per
+    tract, keyed by equity_id (the tract objectid).
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    properties = pd.DataFrame([feature["properties"] for feature in data["features"]])
+    properties = properties.reindex(columns=["objectid"] + EQUITY_CATEGORY_ATTRIBUTES + EQUITY_NUMERIC_ATTRIBUTES)
+
+    equity_df = properties[EQUITY_CATEGORY_ATTRIBUTES].astype("category")
+    equity_df[EQUITY_NUMERIC_ATTRIBUTES] = properties[EQUITY_NUMERIC_ATTRIBUTES].apply(pd.to_numeric, errors="coerce")
+    equity_df.insert(0, "equity_id", properties["objectid"])
+    equity_df["peopleofcolor_population"] = equity_df["peopleofcolor"] * equity_df["population"]
+
+    return equity_df
@@ -0,0 +1,129 @@
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit_app.data.dataset_identity import filter_fingerprint
+from streamlit_app.instrumentation import timed, annotate, current_rerun
+
+# Upper bound on the memory held by cached views across all sessions.
+VIEW_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+@st.cache_resource
+def get_view_cache():
+    """Process-wide LRU cache of filter results and tab aggregates, shared by every session."""
+    return {
+        "entries": OrderedDict(),
+        "bytes": 0,
+        "hits": 0,
+        "misses": 0,
+        "evictions": 0,
+        "lock": threading.Lock(),
+    }
+
+def estimate_size(value):
+    """Approximate memory held by a cached value."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if hasattr(value, "to_plotly_json"):
+        return figure_size(value)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+def figure_size(figure):
+    """
+    Approximate memory held by a Plotly figure: the arrays and lists in its
+    traces. Serializing the figure or copying it with to_dict() can cost more
+    than building it, so this reads the trace properties the figure holds.
+    """
+    def data_size(value):
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, dict):
+            return sum(data_size(item) for item in value.values())
+        if isinstance(value, (tuple, list)):
+            return sys.getsizeof(value) + sum(data_size(item) for item in value)
+        return sys.getsizeof(value)
+
+    return data_size(figure._data)
+
+def cached_view(view, filter_state, compute, *params):
+    """
+    Return the result of compute() for this view, filter state and params,
+    reusing a result computed by any session for the same key.
+
+    Cached results are shared, so callers must not modify them. Without a
+    filter state the result is computed directly.
+    """
+    with timed(view) as stage:
+        value, outcome = lookup_or_compute(view, filter_state, compute, params)
+        if stage is not None:
+            stage["cache"] = outcome
+            if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+                stage["rows_out"] = len(value)
+    return value
+
+def lookup_or_compute(view, filter_state, compute, params):
+    """The cached or freshly computed value, and whether it was a hit, a miss or uncached."""
+    if filter_state is None:
+        return compute(), "off"
+
+    key = (view, filter_fingerprint(filter_state), params)
+    cache = get_view_cache()
+
+    with cache["lock"]:
+        if key in cache["entries"]:
+            cache["entries"].move_to_end(key)
+            cache["hits"] += 1
+            return cache["entries"][key][0], "hit"
+        cache["misses"] += 1
+
+    value = compute()
+    size = estimate_size(value)
+    if size > VIEW_CACHE_MAX_BYTES:
+        return value, "miss"
+
+    with cache["lock"]:
+        if key not in cache["entries"]:
+            cache["entries"][key] = (value, size)
+            cache["bytes"] += size
+        while cache["bytes"] > VIEW_CACHE_MAX_BYTES:
+            _, (_, evicted_size) = cache["entries"].popitem(last=False)
+            cache["bytes"] -= evicted_size
+            cache["evictions"] += 1
+
+    return value, "miss"
+
+def cached_figure(view, filter_state, build, *params):
+    """
+    Return the Plotly figure for this view, filter state and params, built by
+    build() once and shared by every session through the view cache.
+
+    st.plotly_chart does not modify the figures it draws, but callers must
+    not update a cached figure; pass any per-session changes into build().
+    """
+    figure = cached_view(f"figure:{view}", filter_state, build, *params)
+    if current_rerun() is not None:
+        annotate(f"figure:{view}", payload_bytes=figure_size(figure))
+    return figure
+
+def view_cache_stats():
+    """Snapshot of the cache counters for the debug panel."""
+    cache = get_view_cache()
+    with cache["lock"]:
+        lookups = cache["hits"] + cache["misses"]
+        return {
+            "entries": len(cache["entries"]),
+            "megabytes": round(cache["bytes"] / (1024 * 1024), 2),
+            "hits": cache["hits"],
+            "misses": cache["misses"],
+            "evictions": cache["evictions"],
+            "hit_rate": round(cache["hits"] / lookups * 100, 1) if lookups else None,
+        }
@@ -0,0 +1,76 @@
+# filters/bitmap_index.py
+import numpy as np
+import pandas as pd
+from .time_index import build_time_index, created_range
+
+# Columns that get one bitset per distinct value.
+INDEXED_COLUMNS = [
+    "district_display",
+    "police_district_sector",
+    "equityindex",
+    "summary",
+    "department",
+    "homeless_related",
+    "within_10_blocks_of_shelter",
+]
+
+def build_bitmap_index(df, columns=INDEXED_COLUMNS):
+    """
+    Precompute a packed bitset per distinct value of each filter column.
+
+    Missing values share one bitset stored under the None key. The frame must
+    be sorted by created_at so date ranges resolve through the time index.
+    """
+    bitmaps = {}
+    for column in columns:
+        codes, uniques = pd.factorize(df[column])
+        column_bitmaps = {value: np.packbits(codes == code) for code, value in enumerate(uniques)}
+        if (codes == -1).any():
+            column_bitmaps[None] = np.packbits(codes == -1)
+        bitmaps[column] = column_bitmaps
+
+    return {
+        "row_count": len(df),
+        "bitmaps": bitmaps,
+        "time": build_time_index(df),
+    }
+
+def all_bits(index):
+    """Bitset with every row selected."""
+    return np.packbits(np.ones(index["row_count"], dtype=bool))
+
+def no_bits(index):
+    """Bitset with no row selected."""
+    return np.zeros((index["row_count"] + 7) // 8, dtype=np.uint8)
+
+def value_bits(index, column, values):
+    """OR together the bitsets of the given values of one column."""
+    column_bitmaps = index["bitmaps"][column]
+    keys = {None if pd.isna(value) else value for value in values}
+
+    # Selecting every distinct value is the same as not filtering the column.
+    if keys.issuperset(column_bitmaps):
+        return all_bits(index)
+
+    bits = no_bits(index)
+    for key in keys:
+        if key in column_bitmaps:
+            bits |= column_bitmaps[key]
+    return bits
+
+def select_bits(index, selections):
+    """AND together the bitsets for a list of (column, allowed values) selections."""
+    bits = all_bits(index)
+    for column, values in selections:
+        bits &= value_bits(index, column, values)
+    return bits
+
+def date_range_bits(index, date_range):
+    """Bitset of the rows created within the (start, end) range."""
+    rows = np.zeros(index["row_count"], dtype=bool)
+    rows[created_range(index["time"], *date_range)] = True
+    return np.packbits(rows)
+
+def bits_to_positions(index, bits):
+    """Row positions of the set bits, ready for DataFrame.take."""
+    return np.flatnonzero(np.unpackbits(bits, count=index["row_count"]))
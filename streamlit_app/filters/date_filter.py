@@ -1,7 +1,10 @@
 import streamlit as st
 from datetime import datetime, timedelta
+from .time_index import created_bounds
+from .selections import to_whole_days
+from streamlit_app.data.load_profile import created_at_bounds
 
-def apply_date_filter(df):
+def apply_date_filter(df, time_index=None, profile=None):
     """
     Display quick date range options and return the selected date range.
     
@@ -14,10 +17,19 @@ def apply_date_filter(df):
         - Previous 30 Days: From 30 days ago to today.
         - Rolling 1 Year: From 1 year ago to today.
         - Custom: User selects a range via a slider.
+
+    The range is widened to whole days so it lines up with the daily rollup cube.
+    The dataset boundaries come from the export profile or the ends of the time
+    index when available, instead of scanning the column.
     """
     # Determine the dataset's date boundaries.
-    dataset_min_date = df['created_at'].min().to_pydatetime()
-    dataset_max_date = df['created_at'].max().to_pydatetime()
+    if profile is not None:
+        dataset_min_date, dataset_max_date = created_at_bounds(profile)
+    elif time_index is not None:
+        dataset_min_date, dataset_max_date = (bound.to_pydatetime() for bound in created_bounds(time_index))
+    else:
+        dataset_min_date = df['created_at'].min().to_pydatetime()
+        dataset_max_date = df['created_at'].max().to_pydatetime()
     
     # Use today’s date as a reference, but if the dataset’s max is earlier, use that.
     today = datetime.today()
@@ -87,5 +99,6 @@ def apply_date_filter(df):
             value=(dataset_min_date, dataset_max_date)
         )
     
+    start_date, end_date = to_whole_days(start_date, end_date)
     st.write(f"Selected date range: {start_date.date()} to {end_date.date()}")
-    return (start_date, end_date)
\ No newline at end of file
+    return (start_date, end_date)
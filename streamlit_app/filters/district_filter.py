@@ -1,8 +1,13 @@
 # filters/district_filter.py
 import streamlit as st
+from streamlit_app.data.load_profile import dimension_values
 
-def apply_district_filter(df):
-    options = ["All"] + sorted(df['district_display'].dropna().unique().tolist())
+def apply_district_filter(df, profile=None):
+    if profile is not None:
+        values = dimension_values(profile, 'district_display')
+    else:
+        values = df['district_display'].dropna().unique().tolist()
+    options = ["All"] + sorted(values)
     # Wrap the selectbox in an expander.
     with st.expander("Filter by City Council District", expanded=False):
         selected_district = st.selectbox("Select Council District", options)
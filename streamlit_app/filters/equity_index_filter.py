@@ -1,6 +1,7 @@
 import streamlit as st
+from streamlit_app.data.load_profile import dimension_values
 
-def apply_equity_index_filter(df):
+def apply_equity_index_filter(df, profile=None):
     # Define the custom order
     custom_order = {
         "Very High": 0,
@@ -10,7 +11,10 @@ def apply_equity_index_filter(df):
         "Very Low": 4,
     }
     # Get unique options from the DataFrame and sort them using the custom order.
-    unique_options = df['equityindex'].dropna().unique().tolist()
+    if profile is not None:
+        unique_options = dimension_values(profile, 'equityindex')
+    else:
+        unique_options = df['equityindex'].dropna().unique().tolist()
     options_sorted = sorted(unique_options, key=lambda x: custom_order.get(x, 99))
     
     # Prepend "All" so it appears as the first option.
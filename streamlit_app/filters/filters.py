@@ -1,5 +1,6 @@
 # filters/filters.py
 import streamlit as st
+import numpy as np
 from .date_filter import apply_date_filter
 from .district_filter import apply_district_filter
 from .police_district_filter import apply_police_district_filter
@@ -7,39 +8,68 @@ from .equity_index_filter import apply_equity_index_filter
 from .issue_type_filter import apply_issue_type_filter
 from .homeless_filter import apply_homeless_filter
 from .shelter_proximity_filter import apply_shelter_proximity_filter
+from .bitmap_index import select_bits, date_range_bits, bits_to_positions
+from .selections import filter_selections
+from streamlit_app.data.dataset_identity import issues_data_version
+from streamlit_app.data.load_profile import load_dataset_profile
+from streamlit_app.data.view_cache import cached_view
+
+def apply_filters(df, filter_index=None):
+    """
+    Display UI filters and return the filtered DataFrames and the selected filter state.
+
+    When a bitmap index built over df is given, rows are selected with bitwise
+    operations on it instead of column comparisons, and the selected row
+    positions are shared across sessions through the view cache. Filter options
+    and date bounds come from the export's dataset profile when it is current.
+    """
+    data_version = filter_index["data_version"] if filter_index is not None else issues_data_version()
+    profile = load_dataset_profile(data_version)
 
-def apply_filters(df):
-    """Display UI filters and return the filtered DataFrame."""
-    
     # Apply individual filters.
-    date_range = apply_date_filter(df)
-    selected_district = apply_district_filter(df)
-    selected_police_district_sectors = apply_police_district_filter(df)
-    selected_equity_index = apply_equity_index_filter(df)
-    selected_summaries = apply_issue_type_filter(df)
-    homeless_toggle = apply_homeless_filter()
-    shelter_toggle = apply_shelter_proximity_filter()
+    filter_state = {
+        "date_range": apply_date_filter(df, filter_index["time"] if filter_index is not None else None, profile),
+        "district": apply_district_filter(df, profile),
+        "police_district_sectors": apply_police_district_filter(df, profile),
+        "equity_index": apply_equity_index_filter(df, profile),
+        "summaries": apply_issue_type_filter(df, profile),
+        "homeless_only": apply_homeless_filter(),
+        "shelter_only": apply_shelter_proximity_filter(),
+        "data_version": data_version,
+    }
 
-    if selected_district != "All":
-        df = df[df['district_display'] == selected_district]
+    if filter_index is not None:
+        date_positions, non_date_positions = cached_view(
+            "filter_rows", filter_state, lambda: select_positions(filter_index, filter_state)
+        )
+        return df.take(date_positions), df.take(non_date_positions), filter_state
 
-    if selected_police_district_sectors:
-        df = df[df['police_district_sector'].isin(selected_police_district_sectors)]
+    non_date_df = filter_frame(df, filter_state, date_column=None)
 
-    if selected_equity_index != "All":
-        df = df[df['equityindex'] == selected_equity_index]
+    # Apply the date range to the DataFrame.
+    df = filter_frame(non_date_df, {"date_range": filter_state["date_range"]})
 
-    df = df[df['summary'].isin(selected_summaries)]
+    return df, non_date_df, filter_state
 
-    if homeless_toggle:
-        df = df[df['homeless_related'] == 'homeless-related']
+def select_positions(filter_index, filter_state):
+    """Row positions matching the filter state, with and without the date range."""
+    non_date_bits = select_bits(filter_index, filter_selections(filter_state))
+    date_bits = non_date_bits & date_range_bits(filter_index, filter_state["date_range"])
+    return bits_to_positions(filter_index, date_bits), bits_to_positions(filter_index, non_date_bits)
 
-    if shelter_toggle:
-        df = df[df['within_10_blocks_of_shelter'] == True]
+def filter_frame(df, filter_state, date_column="created_at"):
+    """
+    Apply a filter state to any frame carrying the filter columns.
 
-    non_date_df = df
+    Works on the row-level issues as well as on the daily rollup cube, where
+    the date column is 'day'. Pass date_column=None to skip the date range.
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for column, values in filter_selections(filter_state):
+        mask &= df[column].isin(values).to_numpy()
 
-    # Apply the filters to the DataFrame.
-    df = df[(df['created_at'] >= date_range[0]) & (df['created_at'] <= date_range[1])]
+    if date_column and "date_range" in filter_state:
+        start_date, end_date = filter_state["date_range"]
+        mask &= ((df[date_column] >= start_date) & (df[date_column] <= end_date)).to_numpy()
 
-    return df, non_date_df
+    return df[mask]
@@ -1,8 +1,12 @@
 # filters/issue_type_filter.py
 import streamlit as st
+from streamlit_app.data.load_profile import dimension_values
 
-def apply_issue_type_filter(df):
+def apply_issue_type_filter(df, profile=None):
     with st.expander("Issue Type", expanded=False):
-        options = df['summary'].unique().tolist()
+        if profile is not None:
+            options = dimension_values(profile, 'summary', dropna=False)
+        else:
+            options = df['summary'].unique().tolist()
         selected = st.multiselect("Select Summaries", options, default=options)
     return selected
@@ -1,8 +1,13 @@
 # filters/police_district_filter.py
 import streamlit as st
+from streamlit_app.data.load_profile import dimension_values
 
-def apply_police_district_filter(df):
-    options = sorted(df['police_district_sector'].dropna().unique().tolist())
+def apply_police_district_filter(df, profile=None):
+    if profile is not None:
+        values = dimension_values(profile, 'police_district_sector')
+    else:
+        values = df['police_district_sector'].dropna().unique().tolist()
+    options = sorted(values)
     # Wrap the multiselect in an expander that is collapsed by default.
     with st.expander("Filter by Police Sector - District"):
         selected_options = st.multiselect(
@@ -10,4 +15,8 @@ def apply_police_district_filter(df):
             options,
             default=options
         )
+    # Every sector selected filters nothing; leaving it out of the filter state
+    # lets views answer from the rollup cube, which has no police sector dimension.
+    if len(selected_options) == len(options):
+        return []
     return selected_options
@@ -0,0 +1,38 @@
+# filters/selections.py
+# Streamlit-free helpers shared by the dashboard's filters and the aggregates API.
+
+def filter_selections(filter_state):
+    """
+    Translate a filter state into (column, allowed values) pairs, leaving out
+    the date range. Shared by the row, rollup cube and bitmap index filters.
+    """
+    selections = []
+
+    if filter_state.get("district", "All") != "All":
+        selections.append(('district_display', [filter_state["district"]]))
+
+    if filter_state.get("police_district_sectors"):
+        selections.append(('police_district_sector', filter_state["police_district_sectors"]))
+
+    if filter_state.get("equity_index", "All") != "All":
+        selections.append(('equityindex', [filter_state["equity_index"]]))
+
+    if "summaries" in filter_state:
+        selections.append(('summary', filter_state["summaries"]))
+
+    if filter_state.get("department", "Show All") != "Show All":
+        selections.append(('department', [filter_state["department"]]))
+
+    if filter_state.get("homeless_only"):
+        selections.append(('homeless_related', ['homeless-related']))
+
+    if filter_state.get("shelter_only"):
+        selections.append(('within_10_blocks_of_shelter', [True]))
+
+    return selections
+
+def to_whole_days(start_date, end_date):
+    """Widen a datetime range to midnight of the start day through the end of the end day."""
+    start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    end_date = end_date.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return (start_date, end_date)
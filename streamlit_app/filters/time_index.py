@@ -0,0 +1,65 @@
+# filters/time_index.py
+import numpy as np
+import pandas as pd
+
+def build_time_index(df):
+    """
+    Index a frame sorted by created_at for binary-search date windows.
+
+    Keeps the created_at values as they are and a sorted permutation of the
+    rows by resolved_at, with unresolved rows left out.
+    """
+    created_at = df['created_at'].to_numpy()
+    if not df['created_at'].is_monotonic_increasing:
+        raise ValueError("Frame must be sorted by 'created_at' to build a time index.")
+
+    resolved_at = df['resolved_at'].to_numpy()
+    resolved_rows = np.flatnonzero(~np.isnat(resolved_at))
+    resolved_order = resolved_rows[np.argsort(resolved_at[resolved_rows], kind='stable')]
+
+    return {
+        "created_at": created_at,
+        "resolved_order": resolved_order,
+        "resolved_at": resolved_at[resolved_order],
+    }
+
+def window_bounds(sorted_values, start, end, include_end=True):
+    """Binary-search the [start, end] (or [start, end)) window in sorted datetime values."""
+    lo = np.searchsorted(sorted_values, np.datetime64(pd.Timestamp(start)), side='left')
+    hi = np.searchsorted(sorted_values, np.datetime64(pd.Timestamp(end)), side='right' if include_end else 'left')
+    return lo, max(lo, hi)
+
+def created_range(time_index, start, end, include_end=True):
+    """Slice of row positions created within the window."""
+    lo, hi = window_bounds(time_index["created_at"], start, end, include_end)
+    return slice(lo, hi)
+
+def resolved_range(time_index, start, end, include_end=True):
+    """Row positions resolved within the window, ordered by resolved_at."""
+    lo, hi = window_bounds(time_index["resolved_at"], start, end, include_end)
+    return time_index["resolved_order"][lo:hi]
+
+def subset_created_range(time_index, positions, start, end, include_end=True):
+    """
+    Slice of a subset's rows created within the window. positions are the
+    subset's row positions in the indexed frame, in ascending order.
+    """
+    lo, hi = window_bounds(time_index["created_at"], start, end, include_end)
+    return slice(np.searchsorted(positions, lo), np.searchsorted(positions, hi))
+
+def subset_resolved_range(time_index, positions, start, end, include_end=True):
+    """
+    Positions within a subset of the rows resolved within the window, ordered
+    by resolved_at. Only the window's rows are looked up in positions, so the
+    subset is never re-sorted.
+    """
+    window = resolved_range(time_index, start, end, include_end)
+    at = np.searchsorted(positions, window)
+    found = at < len(positions)
+    found[found] = positions[at[found]] == window[found]
+    return at[found]
+
+def created_bounds(time_index):
+    """First and last created_at as Timestamps."""
+    created_at = time_index["created_at"]
+    return pd.Timestamp(created_at[0]), pd.Timestamp(created_at[-1])
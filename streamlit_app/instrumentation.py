@@ -0,0 +1,129 @@
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+# Reruns are appended here as JSON lines when instrumentation is on.
+PERF_LOG_PATH = "logs/dashboard_perf.jsonl"
+
+# Each session's script runs in its own thread, so the current rerun is thread-local.
+_current = threading.local()
+
+# Allocation tracing is process-wide. The first instrumented rerun starts it and
+# the last one still running stops it, unless something else (such as the
+# benchmark suite) had already started it. Peaks are never reset, since that
+# would zero the peak of another session's rerun.
+_tracing = {"lock": threading.Lock(), "reruns": 0, "owned": False}
+
+def instrumentation_enabled(query_params):
+    """On when the app is opened with ?debug=1 or DASHBOARD_PERF=1 is set."""
+    return bool(query_params.get("debug")) or os.environ.get("DASHBOARD_PERF") == "1"
+
+def start_rerun(enabled):
+    """Begin recording this rerun's stages; does nothing unless enabled."""
+    if not enabled:
+        _current.record = None
+        return
+
+    with _tracing["lock"]:
+        if _tracing["reruns"] == 0:
+            _tracing["owned"] = not tracemalloc.is_tracing()
+            if _tracing["owned"]:
+                tracemalloc.start()
+        _tracing["reruns"] += 1
+
+    _current.record = {"started_at": time.time(), "stages": []}
+    _current.open_stages = []
+    _current.started = time.perf_counter()
+
+def current_rerun():
+    return getattr(_current, "record", None)
+
+@contextmanager
+def timed(stage, rows_in=None):
+    """
+    Time a stage of the rerun. Yields the stage's entry so callers can add
+    rows_out or other values, or None when instrumentation is off.
+    """
+    record = current_rerun()
+    if record is None:
+        yield None
+        return
+
+    entry = {"stage": stage, "parent": _current.open_stages[-1] if _current.open_stages else None}
+    if rows_in is not None:
+        entry["rows_in"] = rows_in
+    _current.open_stages.append(stage)
+    start = time.perf_counter()
+    try:
+        yield entry
+    finally:
+        entry["ms"] = round((time.perf_counter() - start) * 1000, 2)
+        _current.open_stages.pop()
+        record["stages"].append(entry)
+
+def annotate(stage, **values):
+    """Add values to the most recent entry of a stage."""
+    record = current_rerun()
+    if record is None:
+        return
+    for entry in reversed(record["stages"]):
+        if entry["stage"] == stage:
+            entry.update(values)
+            return
+
+def finish_rerun(section=None):
+    """
+    Close the rerun record, append it to the local log and return it.
+
+    process_peak_memory_mb is the whole process's peak traced memory since
+    tracing started, so it includes the allocations of any other session's
+    rerun running at the same time (counted in concurrent_reruns).
+    """
+    record = current_rerun()
+    if record is None:
+        return None
+
+    record["section"] = section
+    record["total_ms"] = round((time.perf_counter() - _current.started) * 1000, 2)
+    with _tracing["lock"]:
+        record["process_peak_memory_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+        record["concurrent_reruns"] = _tracing["reruns"]
+        _tracing["reruns"] -= 1
+        if _tracing["reruns"] == 0 and _tracing["owned"]:
+            tracemalloc.stop()
+
+    os.makedirs(os.path.dirname(PERF_LOG_PATH), exist_ok=True)
+    with open(PERF_LOG_PATH, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, default=str) + "\n")
+
+    _current.record = None
+    return record
+
+def stage_summary(record):
+    """
+    One row per top-level stage with its compute time (time spent in nested
+    stages, such as cached view computations) and the rest as render time.
+    """
+    nested_ms = {}
+    for entry in record["stages"]:
+        if entry["parent"] is not None:
+            nested_ms[entry["parent"]] = nested_ms.get(entry["parent"], 0) + entry["ms"]
+
+    rows = []
+    for entry in record["stages"]:
+        compute_ms = nested_ms.get(entry["stage"], 0) if entry["stage"].startswith("section:") else entry["ms"]
+        rows.append({
+            "stage": entry["stage"],
+            "parent": entry["parent"],
+            "ms": entry["ms"],
+            "compute_ms": round(compute_ms, 2),
+            "render_ms": round(entry["ms"] - compute_ms, 2),
+            "cache": entry.get("cache"),
+            "rows_in": entry.get("rows_in"),
+            "rows_out": entry.get("rows_out"),
+            "payload_bytes": entry.get("payload_bytes"),
+        })
+    return rows
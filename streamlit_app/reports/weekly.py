@@ -0,0 +1,364 @@
+"""
+Weekly static HTML reports, one per council district and one per department.
+
+    python -m streamlit_app.reports.weekly --exports-dir exports --output exports/reports
+
+Each report has the heads-up cards for the last 7 days, the week's top issue
+types, issue volume against resolution time per issue type and an equity map
+of issues per capita. A week's reports go into a folder named after the ISO
+week of the newest issue, with an index page, and load plotly.js from one
+copy next to the week folders.
+
+The export is read once. Reports are rendered across a process pool whose
+workers are forked after the load, so they share the parent's dataset instead
+of each reading the export. With --skip-existing, the week is worked out from
+the dataset profile or the export's Parquet statistics first, so a week that
+is already written is skipped without loading the export. Nothing here imports
+Streamlit; the export DAG runs this module in its own process after each
+export, since Airflow's task processes are daemonic and may not start a pool.
+"""
+import argparse
+import html
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+import pandas as pd
+import pyarrow.parquet as pq
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
+
+from streamlit_app.analytics.equity import tract_issue_counts
+from streamlit_app.analytics.frames import read_only
+from streamlit_app.analytics.group_metrics import compute_group_metrics
+from streamlit_app.analytics.heads_up import weekly_issues, change_percent, top_value_share, value_shares
+from streamlit_app.analytics.resolution import resolution_by_group
+from streamlit_app.data.dataset_identity import SOURCE_VERSION_KEY, issues_data_version
+from streamlit_app.data.readers import read_issues, read_equity_attributes
+from streamlit_app.filters.time_index import build_time_index, created_bounds
+from streamlit_app.visuals.maps.equity_geometry import simplify_tracts
+
+ISSUES_FILE = "seeclickfix_issues_dump.parquet"
+PROFILE_FILE = "seeclickfix_issues_profile.json"
+EQUITY_FILE = "Equity_Index_2024_(Tacoma).geojson"
+PLOTLY_JS_FILE = "plotly.min.js"
+
+# Report kinds: the column each report is limited to and its heading.
+REPORT_DIMENSIONS = {
+    "district": ("district_display", "Council District"),
+    "department": ("department", "Department"),
+}
+TOP_ISSUES = 10
+
+# The scatter and the map cover this many days up to the newest issue, since one week is too sparse.
+TRAILING_DAYS = 365
+
+# Keep in sync with streamlit_app/visuals/equity_map.py.
+EQUITY_SIMPLIFY_TOLERANCE = 0.0001
+MAP_CENTER = {"lat": 47.2529, "lon": -122.4443}
+MAP_ZOOM = 10.5
+
+# The loaded dataset, set in the parent before the pool starts so forked workers inherit it.
+SHARED = {}
+
+PAGE_STYLE = """
+body { font-family: sans-serif; margin: 2em auto; max-width: 1100px; color: #222; }
+h1 { margin-bottom: 0.2em; }
+.subtitle { color: #666; margin-top: 0; }
+.cards { display: flex; gap: 1em; margin: 1em 0; }
+.card { flex: 1; border: 1px solid #ddd; border-radius: 6px; padding: 0.8em 1em; }
+.card .label { color: #666; font-size: 0.9em; }
+.card .value { font-size: 1.8em; }
+table { border-collapse: collapse; width: 100%; }
+th, td { border-bottom: 1px solid #eee; padding: 0.3em 0.6em; text-align: left; }
+"""
+
+# --- Data
+
+def load_report_dataset(exports_dir):
+    """The issues as a read-only view, their time index, the newest issue's date and the equity tract attributes and outlines."""
+    issues_path = os.path.join(exports_dir, ISSUES_FILE)
+    equity_path = os.path.join(exports_dir, EQUITY_FILE)
+
+    df = read_issues(issues_path)
+    if df.empty:
+        raise ValueError(f"No issues in {issues_path} to report on.")
+    with open(equity_path, "r", encoding="utf-8") as f:
+        equity_geojson = json.load(f)
+
+    time_index = build_time_index(df)
+    return {
+        "issues": read_only(df),
+        "time_index": time_index,
+        "current_date": created_bounds(time_index)[1].date(),
+        "data_version": issues_data_version(issues_path),
+        "equity_attributes": read_equity_attributes(equity_path),
+        "equity_geometry": simplify_tracts(equity_geojson, EQUITY_SIMPLIFY_TOLERANCE),
+    }
+
+def newest_issue_date(exports_dir):
+    """
+    The newest issue's date without loading the export: from the dataset
+    profile when it was built from this export, else from the created_at
+    statistics in the export's Parquet footer. None when neither records it.
+    """
+    issues_path = os.path.join(exports_dir, ISSUES_FILE)
+    profile_path = os.path.join(exports_dir, PROFILE_FILE)
+
+    if os.path.exists(profile_path):
+        with open(profile_path, "r", encoding="utf-8") as f:
+            profile = json.load(f)
+        if profile.get(SOURCE_VERSION_KEY) == issues_data_version(issues_path) and profile["created_at"]["max"]:
+            return pd.Timestamp(profile["created_at"]["max"]).date()
+
+    parquet_file = pq.ParquetFile(issues_path)
+    column = parquet_file.schema_arrow.get_field_index("created_at")
+    newest = None
+    for row_group in range(parquet_file.metadata.num_row_groups):
+        statistics = parquet_file.metadata.row_group(row_group).column(column).statistics
+        if statistics is None or not statistics.has_min_max:
+            return None
+        if newest is None or pd.Timestamp(statistics.max) > newest:
+            newest = pd.Timestamp(statistics.max)
+    return newest.date() if newest is not None else None
+
+def week_label(current_date):
+    year, week, _ = current_date.isocalendar()
+    return f"{year}-W{week:02d}"
+
+def slug(value):
+    return re.sub(r"[^a-z0-9]+", "-", str(value).lower()).strip("-")
+
+def report_jobs(dataset):
+    """(kind, value) for every council district and department with issues."""
+    issues = dataset["issues"]
+    return [
+        (kind, value)
+        for kind, (column, _) in REPORT_DIMENSIONS.items()
+        for value in sorted(issues[column].dropna().unique(), key=str)
+    ]
+
+# --- Sections
+
+def cards_html(cards):
+    return '<div class="cards">' + "".join(
+        f'<div class="card"><div class="label">{html.escape(label)}</div><div class="value">{html.escape(str(value))}</div></div>'
+        for label, value in cards
+    ) + "</div>"
+
+def delta_text(current_df, previous_df):
+    delta = change_percent(len(current_df), len(previous_df))
+    return "N/A" if delta is None else f"{delta:.2f}% {'↑' if delta > 0 else '↓'}"
+
+def top_value_text(df):
+    top = top_value_share(df)
+    if top is None:
+        return "N/A"
+    value, count, percent = top
+    return f"{value} ({count:,}, {percent:.2f}%)"
+
+def heads_up_html(weeks, issues):
+    """Created and resolved counts for the last 7 days against the 7 before, with the top issue of each."""
+    sections = [
+        f"<p>Last 7 days: {weeks['current_start']} to {weeks['current_end']} | "
+        f"Previous 7 days: {weeks['previous_start']} to {weeks['previous_end']}</p>"
+    ]
+    for action, current, previous in [
+        ("Created", issues["created_current"], issues["created_previous"]),
+        ("Resolved", issues["resolved_current"], issues["resolved_previous"]),
+    ]:
+        sections.append(cards_html([
+            (f"Issues {action} (Last 7 Days)", f"{len(current):,}"),
+            (f"Issues {action} (Previous 7 Days)", f"{len(previous):,}"),
+            (f"Delta % ({action}: Current vs Previous)", delta_text(current, previous)),
+        ]))
+        sections.append(f"<p><em>Top issue {action.lower()} in the last 7 days: {html.escape(top_value_text(current))}</em></p>")
+    return "\n".join(sections)
+
+def top_issues_html(current, previous):
+    """The week's most reported issue types, with their share and last week's count."""
+    top = value_shares(current, "summary").head(TOP_ISSUES)
+    if top.empty:
+        return "<p>No issues created in the last 7 days.</p>"
+    top = top.assign(**{"Previous 7 Days": top["Category"].map(previous["summary"].value_counts()).fillna(0).astype(int)})
+    top = top.rename(columns={"Category": "Issue Type", "Count": "Last 7 Days", "Percentage": "Share (%)"})
+    return top.to_html(index=False, border=0)
+
+def resolution_figure(trailing):
+    """Issue count against median days to acknowledge or close, per issue type."""
+    data = resolution_by_group(compute_group_metrics(trailing, "summary"), "summary")
+    fig = px.scatter(
+        data,
+        x="median_days_to_resolve",
+        y="issue_count",
+        text="summary",
+        labels={"median_days_to_resolve": "Median Days to Acknowledge/Close", "issue_count": "Number of Issues"},
+    )
+    fig.update_traces(textposition="top center")
+    return fig
+
+def equity_figure(trailing, dataset):
+    """Issues per capita per equity tract; tracts without issues are left unfilled."""
+    tracts = tract_issue_counts(trailing, dataset["equity_attributes"])
+    has_issues = tracts["issue_count"] > 0
+    fig = go.Figure(go.Choroplethmapbox(
+        geojson=dataset["equity_geometry"],
+        locations=tracts["equity_id"],
+        z=tracts["issues_per_capita"].where(has_issues),
+        zmin=0,
+        colorscale=px.colors.diverging.RdYlGn[::-1],  # Reverse so red indicates higher values
+        marker_opacity=0.5,
+        marker_line_width=0.5,
+        customdata=tracts[["equity_id", "population", "issue_count"]].to_numpy(),
+        hovertemplate=(
+            "Equity ID: %{customdata[0]}<br>Population: %{customdata[1]:,.0f}<br>"
+            "Issue Count: %{customdata[2]:,.0f}<br>Issues per Capita: %{z:.4f}<extra></extra>"
+        ),
+    ))
+    fig.update_layout(
+        mapbox=dict(style="open-street-map", center=MAP_CENTER, zoom=MAP_ZOOM),
+        margin=dict(l=0, r=0, t=0, b=0),
+        height=550,
+    )
+    return fig
+
+def figure_html(fig):
+    # plotly.js is loaded once per page from the shared copy.
+    return fig.to_html(full_html=False, include_plotlyjs=False)
+
+def page_html(title, subtitle, sections):
+    body = "\n".join(f"<h2>{html.escape(heading)}</h2>\n{content}" for heading, content in sections)
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<script src="../{PLOTLY_JS_FILE}"></script>
+<style>{PAGE_STYLE}</style>
+</head>
+<body>
+<h1>{html.escape(title)}</h1>
+<p class="subtitle">{html.escape(subtitle)}</p>
+{body}
+</body>
+</html>
+"""
+
+# --- Rendering
+
+def render_report(job):
+    """Write one report into the week folder and describe it for the index."""
+    kind, value, week_dir = job
+    dataset = SHARED["dataset"]
+    column, heading = REPORT_DIMENSIONS[kind]
+
+    issues = dataset["issues"]
+    report_issues = issues[(issues[column] == value).to_numpy()]
+    weeks, week_issues = weekly_issues(report_issues, dataset["time_index"], dataset["current_date"])
+    trailing_start = pd.Timestamp(dataset["current_date"] - timedelta(days=TRAILING_DAYS))
+    trailing = report_issues[(report_issues["created_at"] >= trailing_start).to_numpy()]
+
+    trailing_note = f"<p>Issues created since {trailing_start.date()}.</p>"
+    sections = [
+        ("Heads Up", heads_up_html(weeks, week_issues)),
+        ("Top Issues This Week", top_issues_html(week_issues["created_current"], week_issues["created_previous"])),
+    ]
+    if trailing.empty:
+        sections.append(("Resolution Time and Equity", f"<p>No issues created since {trailing_start.date()}.</p>"))
+    else:
+        sections.append(("Issue Volume vs. Resolution Time by Issue Type", trailing_note + figure_html(resolution_figure(trailing))))
+        sections.append(("Issues per Capita by Equity Tract", trailing_note + figure_html(equity_figure(trailing, dataset))))
+
+    title = f"{heading}: {value}"
+    subtitle = f"Week ending {dataset['current_date']} · data version {dataset['data_version']}"
+    filename = f"{kind}-{slug(value)}.html"
+    with open(os.path.join(week_dir, filename), "w", encoding="utf-8") as f:
+        f.write(page_html(title, subtitle, sections))
+
+    return {"kind": kind, "value": value, "file": filename, "created_this_week": len(week_issues["created_current"])}
+
+def run_jobs(jobs, workers):
+    """
+    Render the reports in a pool of forked workers sharing the loaded dataset,
+    or one by one in this process where it can't fork (including inside a
+    daemonic process, which may not start children).
+    """
+    can_fork = "fork" in multiprocessing.get_all_start_methods() and not multiprocessing.current_process().daemon
+    if workers == 1 or not can_fork:
+        return [render_report(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("fork")) as pool:
+        return list(pool.map(render_report, jobs))
+
+def index_html(week, dataset, reports):
+    items = []
+    for kind, (_, heading) in REPORT_DIMENSIONS.items():
+        links = "".join(
+            f'<li><a href="{report["file"]}">{html.escape(str(report["value"]))}</a> ({report["created_this_week"]:,} created this week)</li>'
+            for report in reports if report["kind"] == kind
+        )
+        items.append((f"{heading} Reports", f"<ul>{links}</ul>"))
+    return page_html(f"Tacoma 311 Weekly Reports, {week}", f"Week ending {dataset['current_date']}", items)
+
+def render_all(exports_dir, output_dir, workers=None, skip_existing=False):
+    """
+    Render every district and department report for the week of the newest
+    issue. With skip_existing, a week whose index page is already written is
+    left alone and None is returned, before the export is loaded when the
+    profile or the Parquet statistics give the newest issue's date.
+    """
+    if skip_existing:
+        newest = newest_issue_date(exports_dir)
+        if newest is not None and os.path.exists(os.path.join(output_dir, week_label(newest), "index.html")):
+            return None
+
+    dataset = load_report_dataset(exports_dir)
+    week = week_label(dataset["current_date"])
+    week_dir = os.path.join(output_dir, week)
+    index_path = os.path.join(week_dir, "index.html")
+    if skip_existing and os.path.exists(index_path):
+        return None
+
+    os.makedirs(week_dir, exist_ok=True)
+    plotly_js_path = os.path.join(output_dir, PLOTLY_JS_FILE)
+    if not os.path.exists(plotly_js_path):
+        with open(plotly_js_path, "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+
+    SHARED["dataset"] = dataset
+    try:
+        reports = run_jobs([(kind, value, week_dir) for kind, value in report_jobs(dataset)], workers or os.cpu_count())
+    finally:
+        SHARED.clear()
+
+    # The index goes last, so its presence marks a complete set.
+    with open(index_path + ".tmp", "w", encoding="utf-8") as f:
+        f.write(index_html(week, dataset, reports))
+    os.replace(index_path + ".tmp", index_path)
+    return {"week": week, "directory": week_dir, "reports": reports}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render weekly HTML reports per council district and department.")
+    parser.add_argument("--exports-dir", default="exports")
+    parser.add_argument("--output", default=os.path.join("exports", "reports"))
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU).")
+    parser.add_argument("--skip-existing", action="store_true", help="Do nothing if this week's reports are already written.")
+    parser.add_argument("--result", help="Also write the result as JSON to this path, null when skipped.")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    result = render_all(args.exports_dir, args.output, args.workers, args.skip_existing)
+    if args.result:
+        with open(args.result, "w", encoding="utf-8") as f:
+            json.dump(result, f, default=str)
+    if result is None:
+        print("This week's reports are already written.")
+    else:
+        print(f"Wrote {len(result['reports'])} reports to {result['directory']} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
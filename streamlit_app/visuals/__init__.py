@@ -1,16 +1,30 @@
-from .issue_mapping import display_map
-from .issues_over_time import display_issues_over_time
-from .issues_over_time import issues_created_by_time_period
-from .issue_summary_chart import display_issue_summary
-from .aging_analysis import display_aging_analysis
-from .assignee_resolution_time import display_assignee_resolution_time
-from .assignee_performance import display_assignee_performance
-from .department_performance import display_department_performance
-from .council_district_review import council_districts
-from .equity_issues_analysis import display_equity_issues_analysis
-from .equity_map import display_equity_map
-from .equity_map import display_equity_scatterplot
-from .about_311_impact import display_311_impact
-from .issue_data_table import issue_data_table
-from .data_stats import stats
-from .heads_up import heads_up
\ No newline at end of file
+import importlib
+
+# Visuals are imported on first use, so pulling in one view does not load the
+# plotting libraries and aggregates of every other view.
+LAZY_EXPORTS = {
+    "display_map": ".issue_mapping",
+    "display_issues_over_time": ".issues_over_time",
+    "issues_created_by_time_period": ".issues_over_time",
+    "display_issue_summary": ".issue_summary_chart",
+    "display_aging_analysis": ".aging_analysis",
+    "display_assignee_resolution_time": ".assignee_resolution_time",
+    "display_assignee_performance": ".assignee_performance",
+    "display_department_performance": ".department_performance",
+    "council_districts": ".council_district_review",
+    "display_equity_issues_analysis": ".equity_issues_analysis",
+    "display_equity_map": ".equity_map",
+    "display_chronic_areas": ".chronic_areas",
+    "display_equity_scatterplot": ".equity_map",
+    "display_311_impact": ".about_311_impact",
+    "display_pipeline_health": ".pipeline_health",
+    "issue_data_table": ".issue_data_table",
+    "stats": ".data_stats",
+    "heads_up": ".heads_up",
+    "display_debug_panel": ".debug_panel",
+}
+
+def __getattr__(name):
+    if name not in LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(LAZY_EXPORTS[name], __name__), name)
@@ -1,7 +1,21 @@
 import streamlit as st
-import pandas as pd
+import plotly.express as px
+from streamlit_app.analytics.aging import aging_summary, aging_summary_from_quantiles
+from streamlit_app.analytics.backlog import backlog_window, top_backlog_groups
+from streamlit_app.data.view_cache import cached_view
+from streamlit_app.data.backlog import query_backlog
+from streamlit_app.data.load_sketches import query_quantiles
 
-def display_aging_analysis(filtered_df):
+# Breakdowns offered for the backlog chart, and how many groups to draw before lumping the rest.
+BACKLOG_DIMENSIONS = {
+    "Department": "department",
+    "Issue Type": "summary",
+    "Council District": "district_display",
+    "Assignee": "assignee_name",
+}
+BACKLOG_TOP_GROUPS = 10
+
+def display_aging_analysis(filtered_df, filter_state=None, non_date_filtered_df=None):
     """Function to compute and display aging analysis."""
     st.subheader("Aging Analysis")
     st.markdown(
@@ -10,26 +24,48 @@ def display_aging_analysis(filtered_df):
         "grouped by the kind of issue."
     )
 
-    # Filter relevant issues
-    aging_df = filtered_df[filtered_df['status'].isin(["Open", "Acknowledged"])].copy()
-    
-    # Compute resolution and acknowledgment times
-    aging_df['days_to_resolution'] = (aging_df['resolved_at'] - aging_df['created_at']).dt.days
-    aging_df['days_to_acknowledge'] = (aging_df['acknowledged_at'] - aging_df['created_at']).dt.days
-    aging_df['acknowledged'] = aging_df['acknowledged_at'].notna()
+    # Merge the open issues' quantile sketches when they are available
+    acknowledge_times = query_quantiles(filter_state, 'summary', 'time_to_acknowledge', open_only=True)
+    if acknowledge_times is not None:
+        summary = aging_summary_from_quantiles(acknowledge_times)
+    else:
+        summary = cached_view("aging_summary", filter_state, lambda: aging_summary(filtered_df))
 
-    # Group by issue summary
-    aging_summary = aging_df.groupby('summary').agg(
-        median_days_to_acknowledge=('days_to_acknowledge', 'median'),
-        count_acknowledged=('acknowledged', 'sum'),
-        issue_count=('summary', 'count')
-    ).reset_index()
+    # Display results
+    st.dataframe(summary)
 
-    # Compute percentage acknowledged
-    aging_summary['percent_acknowledged'] = (aging_summary['count_acknowledged'] / aging_summary['issue_count']) * 100
+    if non_date_filtered_df is not None:
+        st.divider()
+        display_backlog(non_date_filtered_df, filter_state)
 
-    # Sort by issue count
-    aging_summary = aging_summary.sort_values(by='issue_count', ascending=False)
+@st.fragment
+def display_backlog(non_date_filtered_df, filter_state=None):
+    """Open issues at the end of each day in the selected date range, stacked by group."""
+    st.subheader("Open Issue Backlog")
 
-    # Display results
-    st.dataframe(aging_summary)
+    col1, col2 = st.columns(2)
+    with col1:
+        breakdown = st.selectbox("Break down by", list(BACKLOG_DIMENSIONS))
+    with col2:
+        end_label = st.radio("An issue leaves the backlog when it is", ["Closed", "Acknowledged or closed"], horizontal=True)
+    end_column = 'closed_at' if end_label == "Closed" else 'resolved_at'
+
+    backlog = query_backlog(non_date_filtered_df, filter_state, BACKLOG_DIMENSIONS[breakdown], end_column)
+    if filter_state is not None:
+        start_date, end_date = filter_state["date_range"]
+        backlog = backlog_window(backlog, start_date, end_date)
+    if backlog.empty:
+        st.info("No issues in the selected range.")
+        return
+
+    # Keep the groups with the largest backlog at the end of the range and lump the rest.
+    chart_df = top_backlog_groups(backlog, BACKLOG_TOP_GROUPS).reset_index().melt(id_vars='day', var_name=breakdown, value_name='open_issues')
+    fig = px.area(
+        chart_df,
+        x='day',
+        y='open_issues',
+        color=breakdown,
+        title=f"Open Issues by {breakdown}",
+        labels={'day': 'Date', 'open_issues': 'Open Issues'}
+    )
+    st.plotly_chart(fig, use_container_width=True)
@@ -1,8 +1,9 @@
 import streamlit as st
 import plotly.express as px
-import pandas as pd
+from streamlit_app.analytics.resolution import assignee_resolution_stats
+from streamlit_app.data.view_cache import cached_view
 
-def display_assignee_resolution_time(filtered_df):
+def display_assignee_resolution_time(filtered_df, filter_state=None):
     """Function to compute and display issue resolution time by assignee."""
     st.subheader("Issue Resolution Time by Assignee")
     st.markdown(
@@ -11,10 +12,7 @@ def display_assignee_resolution_time(filtered_df):
     )
 
     # Compute assignee statistics
-    assignee_stats = filtered_df.groupby('assignee_name').agg(
-        num_issues=('id', 'count'),
-        avg_time_to_resolution=('time_to_resolution', 'mean')
-    ).reset_index()
+    assignee_stats = cached_view("assignee_resolution_time", filter_state, lambda: assignee_resolution_stats(filtered_df))
 
     # Create scatter plot
     fig_scatter = px.scatter(
@@ -0,0 +1,55 @@
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+from streamlit_app.data.load_hotspots import query_chronic_cells
+
+@st.fragment
+def display_chronic_areas(filter_state=None):
+    """Displays quarter-mile cells that keep drawing reports quarter after quarter."""
+    st.subheader("Chronic Areas")
+    st.markdown(
+        "Quarter-mile cells with at least the selected number of issues in consecutive quarters, "
+        "over every quarter the dashboard shows. Only the issue type filter applies."
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        threshold = st.slider("Issues per quarter", min_value=1, max_value=100, value=10)
+    with col2:
+        min_quarters = st.slider("Consecutive quarters", min_value=1, max_value=8, value=2)
+
+    chronic = query_chronic_cells(filter_state, threshold, min_quarters)
+    if chronic.empty:
+        st.info("No cells reach that many issues in consecutive quarters.")
+        return
+
+    fig = go.Figure(go.Scattermapbox(
+        lat=chronic['lat'],
+        lon=chronic['lng'],
+        mode="markers",
+        marker=dict(
+            size=8 + 4 * np.sqrt(chronic['longest_streak']),
+            color=chronic['total_issues'],
+            colorscale="OrRd",
+            showscale=True,
+            colorbar=dict(title="Issues")
+        ),
+        customdata=chronic[['longest_streak', 'current_streak', 'total_issues']],
+        hovertemplate=(
+            "Longest streak: %{customdata[0]} quarters<br>"
+            "Current streak: %{customdata[1]} quarters<br>"
+            "Total issues: %{customdata[2]:,}<extra></extra>"
+        )
+    ))
+    fig.update_layout(
+        mapbox_style="open-street-map",
+        mapbox_center={"lat": chronic['lat'].mean(), "lon": chronic['lng'].mean()},
+        mapbox_zoom=11,
+        margin=dict(l=0, r=0, t=0, b=0)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(
+        chronic[['lat', 'lng', 'longest_streak', 'current_streak', 'hot_quarters', 'total_issues']].round({'lat': 5, 'lng': 5}),
+        hide_index=True
+    )
@@ -1,10 +1,13 @@
 import streamlit as st
 import plotly.express as px
-import pandas as pd
 import plotly.graph_objects as go
 import json
 import re
-import hashlib
+from streamlit_app.analytics.group_metrics import top_summary_table
+from streamlit_app.analytics.resolution import resolution_by_group
+from streamlit_app.data.group_metrics import group_metrics
+from streamlit_app.data.load_sketches import query_quantiles
+from streamlit_app.data.view_cache import cached_figure
 
 @st.cache_data
 def load_geojson():
@@ -12,21 +15,27 @@ def load_geojson():
         return json.load(f)
 
 
-def council_districts(filtered_df):
+def council_districts(filtered_df, filter_state=None):
     
-    councilmember_scatterplot(filtered_df)
+    councilmember_scatterplot(filtered_df, filter_state)
 
-    top_summary_by_district(filtered_df)
+    top_summary_by_district(filtered_df, filter_state)
 
-def councilmember_scatterplot(df):
+def councilmember_scatterplot(df, filter_state=None):
     """Function to compute and display issue resolution time by council district."""
     st.subheader("Issue Volume vs. Resolution Time by District")
 
-    # Aggregate data by council district
-    district_agg = df.groupby('district_display').agg(
-        issue_count=('id', 'count'),
-        median_days_to_resolve=('days_to_resolve', 'median')
-    ).reset_index()
+    # Display plot in Streamlit, reusing the figure built for this filter state
+    fig_scatter = cached_figure("district_resolution_time", filter_state, lambda: district_resolution_figure(df, filter_state))
+    return st.plotly_chart(fig_scatter)
+
+def district_resolution_figure(df, filter_state=None):
+    """Scatter of issue count against median days to acknowledge or close, per council district."""
+    # Aggregate data by council district, merging quantile sketches when they are available
+    resolution = query_quantiles(filter_state, 'district_display', 'days_to_resolve')
+    if resolution is None:
+        resolution = group_metrics(df, 'district_display', filter_state)
+    district_agg = resolution_by_group(resolution, 'district_display')
 
     # Create scatter plot
     fig_scatter = px.scatter(
@@ -40,10 +49,9 @@ def councilmember_scatterplot(df):
 
     fig_scatter.update_traces(textposition='top center')
 
-    # Display plot in Streamlit
-    return st.plotly_chart(fig_scatter)
+    return fig_scatter
 
-def top_summary_by_district(df):
+def top_summary_by_district(df, filter_state=None):
     st.subheader("Top Issue Type by Council District")
 
     # Ensure the necessary columns exist
@@ -51,17 +59,8 @@ def top_summary_by_district(df):
         st.error("DataFrame must contain 'summary' and 'district_display' columns")
         return None
     
-    # Group by council district and find the most common summary
-    top_summaries = (
-        df.groupby(['district_display', 'summary'])
-        .size()
-        .reset_index(name='count')
-        .sort_values(['district_display', 'count'], ascending=[True, False])
-        .drop_duplicates(subset=['district_display'], keep='first')
-    )
-
-    # Rename 'summary' to 'issue'
-    top_summaries = top_summaries.rename(columns={'summary': 'issue'})
+    # Most common summary per district, from the shared grouped metrics
+    top_summaries = top_summary_table(group_metrics(df, 'district_display', filter_state), 'district_display')
     top_summaries = top_summaries.rename(columns={'district_display': 'district'})
 
     return st.dataframe(top_summaries[['district', 'issue', 'count']])
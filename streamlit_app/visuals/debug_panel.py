@@ -0,0 +1,33 @@
+import streamlit as st
+import pandas as pd
+from streamlit_app.data.view_cache import view_cache_stats
+from streamlit_app.instrumentation import stage_summary, PERF_LOG_PATH
+
+def display_debug_panel(rerun_record=None):
+    """Shows the shared view cache counters and this rerun's timings. Open the app with ?debug=1 to see it."""
+    with st.expander("Debug: View Cache", expanded=False):
+        stats = view_cache_stats()
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Hit Rate", "N/A" if stats["hit_rate"] is None else f"{stats['hit_rate']}%")
+            st.metric("Hits", stats["hits"])
+            st.metric("Entries", stats["entries"])
+        with col2:
+            st.metric("Size (MB)", stats["megabytes"])
+            st.metric("Misses", stats["misses"])
+            st.metric("Evictions", stats["evictions"])
+
+    if rerun_record is None:
+        return
+
+    with st.expander("Debug: Rerun Timings", expanded=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Rerun (ms)", rerun_record["total_ms"])
+        with col2:
+            # Process-wide, so it includes other sessions' reruns running at the same time.
+            st.metric("Process Peak Memory (MB)", rerun_record["process_peak_memory_mb"])
+
+        # Sections split into compute (cached view work) and render (everything else).
+        st.dataframe(pd.DataFrame(stage_summary(rerun_record)), hide_index=True)
+        st.caption(f"Each rerun is appended to {PERF_LOG_PATH}.")
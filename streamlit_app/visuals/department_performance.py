@@ -1,11 +1,16 @@
 import streamlit as st
-import pandas as pd
-import pydeck as pdk
 import plotly.express as px
 import uuid
 from streamlit_app.visuals.maps.heatmap import render_heatmap
-
-def display_department_performance(filtered_df):
+from streamlit_app.analytics.counts import issues_per_department_day, top_issue_per_department
+from streamlit_app.analytics.group_metrics import performance_table
+from streamlit_app.analytics.resolution import resolution_by_group
+from streamlit_app.data.group_metrics import group_metrics
+from streamlit_app.data.load_sketches import query_quantiles
+from streamlit_app.data.view_cache import cached_figure
+
+@st.fragment
+def display_department_performance(filtered_df, filter_state=None):
     """Compute and display department performance statistics by mapped department."""
     st.subheader("Department Performance Summary")
     
@@ -13,22 +18,23 @@ def display_department_performance(filtered_df):
     department_df = filtered_df
     
     # Apply department filter using the separate helper function.
-    df_filtered = filter_by_department(department_df)
+    df_filtered, selected_department = filter_by_department(department_df)
+
+    # Carry the department selection into the filter state used for the rollup cube.
+    if filter_state is not None:
+        filter_state = dict(filter_state, department=selected_department)
 
-    department_performance_stats(df_filtered)
+    department_performance_stats(df_filtered, filter_state)
     
     st.divider()
     
-    display_department_resolution_time(df_filtered)
+    display_department_resolution_time(df_filtered, filter_state)
 
 def plot_issues_over_time(df):
     """Plots a time series of issue counts over time, grouped by department."""
 
-    # Convert 'created_at' to datetime if not already
-    df["created_at"] = pd.to_datetime(df["created_at"])
-
     # Aggregate issue count per department per day
-    time_series = df.groupby([df["created_at"].dt.date, "department"]).size().reset_index(name="issue_count")
+    time_series = issues_per_department_day(df)
 
     # Create line chart
     fig = px.line(
@@ -46,17 +52,8 @@ def plot_issues_over_time(df):
 def plot_top_issue_per_department(df):
     """Creates a scatter plot of the top issue for each department with point size based on issue count."""
 
-    # Group data to count issues per (department, summary)
-    issue_counts = df.groupby(["department", "summary"]).size().reset_index(name="issue_count")
-
     # Find the top issue for each department (highest issue_count)
-    top_issues_per_department = (
-        issue_counts.sort_values(["department", "issue_count"], ascending=[True, False])
-        .drop_duplicates(subset=["department"], keep="first")
-    )
-
-    # Filter original dataframe to only include the top issues per department
-    df_filtered = df[df["summary"].isin(top_issues_per_department["summary"])]
+    top_issues_per_department = top_issue_per_department(df)
 
     # Create scatter plot
     fig = px.scatter(
@@ -76,7 +73,8 @@ def plot_top_issue_per_department(df):
 
 def filter_by_department(department_df):
     """
-    Displays a dropdown for department filtering and returns a filtered DataFrame.
+    Displays a dropdown for department filtering and returns a filtered DataFrame
+    along with the selected department.
     """
     # Get a sorted list of unique, non-null departments from the prepared data.
     departments = sorted(department_df['department'].dropna().unique())
@@ -85,65 +83,40 @@ def filter_by_department(department_df):
     
     if selected_department != "Show All":
         st.write("Filtering by department:", selected_department)
-        return department_df[department_df['department'] == selected_department]
+        return department_df[department_df['department'] == selected_department], selected_department
     else:
-        return department_df
-
-def department_performance_stats(df):
-    # --- Aggregate performance statistics by department ---
-    department_stats = df.groupby('department').agg(
-        total_issues=('id', 'count'),
-        acknowledged_issues=('acknowledged_at', 'count'),
-        closed_issues=('closed_at', 'count'),
-        avg_time_to_acknowledge=('time_to_acknowledge', 'mean'),
-        avg_time_to_close=('time_to_close', 'mean')
-    ).reset_index()
-
-    # Compute acknowledgment and closure rates.
-    department_stats['acknowledgment_rate'] = (department_stats['acknowledged_issues'] / department_stats['total_issues']) * 100
-    department_stats['closure_rate'] = (department_stats['closed_issues'] / department_stats['total_issues']) * 100
-
-    # --- Determine the Top Issue Summary per department ---
-    top_summary = (
-        df.groupby(['department', 'summary'])
-        .size()
-        .reset_index(name='summary_count')
-        .sort_values(['department', 'summary_count'], ascending=[True, False])
-        .drop_duplicates(subset=['department'], keep='first')
-        .rename(columns={'summary': 'top_issue_type'})
-    )
-
-    # Merge the top summary into the aggregated stats.
-    department_stats = department_stats.merge(
-        top_summary[['department', 'top_issue_type']], 
-        on='department', 
-        how='left'
-    )
+        return department_df, selected_department
 
-    # Sort the final results by total issues (descending).
-    department_stats = department_stats.sort_values(by='total_issues', ascending=False)
+def department_performance_stats(df, filter_state=None):
+    # --- Aggregate performance statistics and top issue type by department ---
+    department_stats = performance_table(group_metrics(df, 'department', filter_state), 'department')
 
     # --- Display the Results ---
     return st.dataframe(department_stats)
 
-def display_department_resolution_time(filtered_df):
+def display_department_resolution_time(filtered_df, filter_state=None):
     """Function to compute and display issue resolution time by department."""
     st.subheader("Issue Volume vs. Resolution Time by Department")
 
-    # Compute median days to acknowledge or close
-    filtered_df['median_days_to_resolve'] = (
-        (filtered_df[['acknowledged_at', 'closed_at']].min(axis=1) - filtered_df['created_at']).dt.days
-    )
-
-    # Aggregate data by department
-    department_agg = filtered_df.groupby('department').agg(
-        issue_count=('id', 'count'),
-        median_days_to_resolve=('median_days_to_resolve', 'median')
-    ).reset_index()
-
     # User option to switch between logarithmic and linear scale
     axis_scale = st.radio("Select axis scale:", ('Linear', 'Logarithmic'), index=0)
 
+    # Display plot in Streamlit, reusing the figure built for this filter state and scale
+    fig_scatter = cached_figure(
+        "department_resolution_time", filter_state,
+        lambda: department_resolution_figure(filtered_df, filter_state, axis_scale),
+        axis_scale
+    )
+    st.plotly_chart(fig_scatter)
+
+def department_resolution_figure(filtered_df, filter_state, axis_scale):
+    """Scatter of issue count against median days to acknowledge or close, per department."""
+    # Median from the merged quantile sketches when they are available
+    resolution = query_quantiles(filter_state, 'department', 'days_to_resolve')
+    if resolution is None:
+        resolution = group_metrics(filtered_df, 'department', filter_state)
+    department_agg = resolution_by_group(resolution, 'department')
+
     # Create scatter plot
     fig_scatter = px.scatter(
         department_agg, 
@@ -163,5 +136,4 @@ def display_department_resolution_time(filtered_df):
         yaxis_type=scale_type
     )
 
-    # Display plot in Streamlit
-    st.plotly_chart(fig_scatter)
+    return fig_scatter
@@ -1,84 +1,56 @@
 import streamlit as st
-import pandas as pd
-from datetime import timedelta, date
 import plotly.express as px
-from streamlit_app.visuals import issues_created_by_time_period
-
-def heads_up(filtered_df):
-    # Convert string dates to date objects
-    filtered_df['created_at_date'] = pd.to_datetime(filtered_df['created_at'], errors='coerce').dt.date
-    filtered_df['resolved_at_date'] = pd.to_datetime(filtered_df['resolved_at'], errors='coerce').dt.date
-
-    # Determine the current date as the max date in the created_at_date column
-    current_date = filtered_df['created_at_date'].max()
-        
-    # Get the maximum created_at value from filtered_df and convert it to a date
-    max_created_at = filtered_df['created_at'].max()
-    current_date = max_created_at.date()
-
-    # Define rolling 7-day periods:
-    # Current period: from (current_date - 6 days) to current_date (inclusive)
-    current_rolling_start = current_date - timedelta(days=6)
-    # Previous period: from (current_date - 13 days) to (current_date - 7 days)
-    previous_rolling_start = current_rolling_start - timedelta(days=7)
-    previous_rolling_end = current_date - timedelta(days=7)
-
-    # Filter the DataFrame for created and resolved issues in each rolling period,
-    # excluding the current date from the current period
-    created_at_current_df = filtered_df[
-        (filtered_df['created_at_date'] >= current_rolling_start) & 
-        (filtered_df['created_at_date'] < current_date)
-    ]
-    resolved_at_current_df = filtered_df[
-        (filtered_df['resolved_at_date'] >= current_rolling_start) & 
-        (filtered_df['resolved_at_date'] < current_date)
-    ]
-    created_at_previous_df = filtered_df[
-        (filtered_df['created_at_date'] >= previous_rolling_start) & 
-        (filtered_df['created_at_date'] <= previous_rolling_end)
-    ]
-    resolved_at_previous_df = filtered_df[
-        (filtered_df['resolved_at_date'] >= previous_rolling_start) & 
-        (filtered_df['resolved_at_date'] <= previous_rolling_end)
-    ]
-    
-    value_column = 'summary'
+import plotly.graph_objects as go
+from streamlit_app.analytics.heads_up import weekly_issues, change_percent, top_value_share, value_shares, treemap_nodes
+from streamlit_app.data.dataset_identity import without_date_range
+from streamlit_app.data.view_cache import cached_figure
+
+def heads_up(filtered_df, filter_state=None, time_index=None):
+    # Issues created and resolved in the last 7 days and the 7 days before,
+    # found through the loaded issues' time index when it is given
+    weeks, issues = weekly_issues(filtered_df, time_index)
     
-    st.markdown("**Created (Last 7 Days vs Previous 7 Days)**")
-    st.markdown(
-        f"Comparing dates: **Last 7 Days:** {current_rolling_start} to {current_date} | **Previous 7 Days:** {previous_rolling_start} to {previous_rolling_end}"
+    comparing = (
+        f"Comparing dates: **Last 7 Days:** {weeks['current_start']} to {weeks['current_end']} | "
+        f"**Previous 7 Days:** {weeks['previous_start']} to {weeks['previous_end']}"
     )
+
+    st.markdown("**Created (Last 7 Days vs Previous 7 Days)**")
+    st.markdown(comparing)
     created_card(
-        created_at_current_df, 
-        created_at_previous_df, 
+        issues["created_current"], 
+        issues["created_previous"], 
         label_current="Issues Created (Last 7 Days)", 
         label_previous="Issues Created (Previous 7 Days)"
     )
-    top_current_value = get_top_value(created_at_current_df, value_column)
-    st.write(f"*Top Issue in Last 7 Days: {top_current_value} ({top_value_percent_of_whole(top_current_value, value_column, created_at_current_df)})*")
+    st.write(f"*Top Issue in Last 7 Days: {top_value_text(issues['created_current'])}*")
     
     st.write("---")
     
     st.markdown("**Resolved (Last 7 Days vs Previous 7 Days)**")
-    st.markdown(
-        f"Comparing dates: **Last 7 Days:** {current_rolling_start} to {current_date} | **Previous 7 Days:** {previous_rolling_start} to {previous_rolling_end}"
-    )
+    st.markdown(comparing)
     resolved_card(
-        resolved_at_current_df, 
-        resolved_at_previous_df, 
+        issues["resolved_current"], 
+        issues["resolved_previous"], 
         label_current="Issues Resolved (Last 7 Days)", 
         label_previous="Issues Resolved (Previous 7 Days)"
     )
-    top_resolved_value = get_top_value(resolved_at_current_df, value_column)
-    st.write(f"*Top Issue Resolved in Last 7 Days: {top_resolved_value} ({top_value_percent_of_whole(top_resolved_value, value_column, resolved_at_current_df)})*")
+    st.write(f"*Top Issue Resolved in Last 7 Days: {top_value_text(issues['resolved_current'])}*")
     
     st.write("---")
 
-    st.plotly_chart(plot_homeless_stacked_horizontal_bar_chart(created_at_current_df))
+    # The weekly figures depend only on the non-date filters, so reuse them across date ranges.
+    figure_state = without_date_range(filter_state)
+
+    st.plotly_chart(cached_figure(
+        "homeless_share_this_week", figure_state, lambda: plot_homeless_stacked_horizontal_bar_chart(issues["created_current"])
+    ))
 
     st.write("---")
 
-    st.plotly_chart(plot_summary_treemap(created_at_current_df))
+    st.plotly_chart(cached_figure(
+        "summary_treemap_this_week", figure_state, lambda: plot_summary_treemap(issues["created_current"])
+    ))
 
 
 def created_card(this_df, previous_df, label_current="Current Period", label_previous="Previous Period"):
@@ -104,24 +76,17 @@ def card_metric(df, label):
     st.metric(label=label, value=count)
 
 def card_delta_percent(current_df, previous_df, action):
-    current_count = current_df.shape[0]
-    previous_count = previous_df.shape[0]
-    if previous_count == 0:
-        delta_str = "N/A"
-    else:
-        delta = ((current_count - previous_count) / previous_count) * 100
-        delta_str = f"{delta:.2f}% {'↑' if delta > 0 else '↓'}"
+    delta = change_percent(current_df.shape[0], previous_df.shape[0])
+    delta_str = "N/A" if delta is None else f"{delta:.2f}% {'↑' if delta > 0 else '↓'}"
     st.metric(label=f"Delta % ({action}: Current vs Previous)", value=delta_str)
 
-def get_top_value(df: pd.DataFrame, column: str = "summary") -> str:
-    if column not in df.columns:
-        raise ValueError(f"Column '{column}' not found in DataFrame.")
-    return df[column].value_counts().idxmax()
-
-def top_value_percent_of_whole(value, value_column, df):
-    total_count = df[value_column].count()
-    value_count = df[df[value_column] == value][value_column].count()
-    return f"{value_count:,}, {(value_count / total_count) * 100:.2f}%"
+def top_value_text(df, value_column="summary"):
+    """The top value with its count and share, like "Pothole (12, 30.00%)"."""
+    top = top_value_share(df, value_column)
+    if top is None:
+        return "N/A"
+    value, count, percent = top
+    return f"{value} ({count:,}, {percent:.2f}%)"
 
 
 def plot_homeless_stacked_horizontal_bar_chart(df, col='homeless_related'):
@@ -140,21 +105,8 @@ def plot_homeless_stacked_horizontal_bar_chart(df, col='homeless_related'):
         fig = plot_homeless_stacked_horizontal_bar_chart(your_dataframe)
         st.plotly_chart(fig)
     """
-    # Count the values in the specified column.
-    counts = df[col].value_counts()
-    total = counts.sum()
-    
-    # Calculate percentages for each category.
-    percentages = (counts / total * 100).round(2)
-    
-    # Create a DataFrame for plotting.
-    # We'll use a dummy category so that all segments are in one stacked bar.
-    data = pd.DataFrame({
-        'Category': counts.index.astype(str),
-        'Count': counts.values,
-        'Percentage': percentages.values,
-        'Dummy': 'All Records'
-    })
+    # Share of each value, all in one stacked bar under a dummy category.
+    data = value_shares(df, col).assign(Dummy='All Records')
     
     # Create the horizontal stacked bar chart.
     fig = px.bar(
@@ -200,69 +152,18 @@ def plot_summary_treemap(df, col='summary', threshold=5):
         fig = plot_summary_treemap(your_dataframe)
         st.plotly_chart(fig)
     """
-    import plotly.graph_objects as go
-    import pandas as pd
-
-    # Count the unique values and calculate percentages.
-    counts = df[col].value_counts()
-    total = counts.sum()
-    percentages = (counts / total * 100).round(2)
-
-    # Separate significant and small categories.
-    significant = counts[percentages >= threshold]
-    small = counts[percentages < threshold]
-    significant_pct = percentages[percentages >= threshold]
-    small_pct = percentages[percentages < threshold]
-
-    # Build lists for the treemap hierarchy.
-    ids = []
-    labels = []
-    parents = []
-    values = []
-    percents = []  # To hold percentage of the whole for hover display.
-
-    # Root node.
-    ids.append("All Records")
-    labels.append("All Records")
-    parents.append("")
-    values.append(total)
-    percents.append(100)
-
-    # Add significant categories as direct children of the root.
-    for cat in significant.index:
-        ids.append(cat)
-        labels.append(cat)
-        parents.append("All Records")
-        values.append(significant[cat])
-        percents.append(significant_pct[cat])
-
-    # For small categories, create an aggregated "Other" node.
-    if not small.empty:
-        other_value = small.sum()
-        other_pct = small_pct.sum()
-        ids.append("Other")
-        labels.append("Other")
-        parents.append("All Records")
-        values.append(other_value)
-        percents.append(other_pct)
-        # Then add each small category as a child of "Other".
-        for cat in small.index:
-            # Create a unique id for each small category.
-            ids.append("Other_" + cat)
-            labels.append(cat)
-            parents.append("Other")
-            values.append(small[cat])
-            percents.append(small_pct[cat])
+    # Root, significant categories, and the small ones under "Other".
+    nodes = treemap_nodes(df, col, threshold)
 
     # Create the treemap figure using graph_objects.
     fig = go.Figure(go.Treemap(
-        ids=ids,
-        labels=labels,
-        parents=parents,
-        values=values,
+        ids=nodes['ids'],
+        labels=nodes['labels'],
+        parents=nodes['parents'],
+        values=nodes['values'],
         branchvalues="total",
         # Use customdata to pass the percentage value and show it in the hover.
-        customdata=percents,
+        customdata=nodes['percents'],
         hovertemplate='<b>%{label}</b><br>Count: %{value}<br>Percentage of total: %{customdata:.2f}%<extra></extra>',
     ))
     fig.update_layout(title="Issue Distribution This Week")
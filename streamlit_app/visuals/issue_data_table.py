@@ -1,21 +1,52 @@
 import streamlit as st
+import numpy as np
+from streamlit_app.data.view_cache import cached_view
 
-def issue_data_table(df):
+SORTABLE_COLUMNS = [
+    "created_at", "updated_at", "acknowledged_at", "closed_at", "time_to_resolution",
+    "status", "summary", "department", "district_display",
+]
+DEFAULT_TABLE_COLUMNS = ["id", "created_at", "summary", "status", "department", "district_display", "description"]
+
+def sort_order(df, sort_column, ascending):
+    """
+    Row positions of df in the requested order, missing values last.
+    Filtered frames are already in created_at order, so that sort is free.
+    """
+    if sort_column == "created_at":
+        positions = np.arange(len(df))
+        return positions if ascending else positions[::-1].copy()
+
+    values = df[sort_column].reset_index(drop=True)
+    return values.sort_values(ascending=ascending, na_position="last", kind="stable").index.to_numpy()
+
+@st.fragment
+def issue_data_table(df, filter_state=None):
     st.subheader("Issue Data Table")
     st.markdown("Details on each issue.")
 
-    # Sort DataFrame by created_at in descending order
-    df = df.sort_values(by="created_at", ascending=False)
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        sort_column = st.selectbox("Sort by", options=[c for c in SORTABLE_COLUMNS if c in df.columns], index=0)
+    with col2:
+        ascending = st.radio("Order", options=["Descending", "Ascending"], horizontal=True) == "Ascending"
+    with col3:
+        # Allow the user to select the number of rows per page
+        page_size = st.selectbox("Select page size", options=[5, 10, 20, 50], index=1)
 
-    # Allow the user to select the number of rows per page
-    page_size = st.selectbox("Select page size", options=[5, 10, 20, 50], index=1)
+    columns = st.multiselect(
+        "Columns",
+        options=df.columns.tolist(),
+        default=[c for c in DEFAULT_TABLE_COLUMNS if c in df.columns]
+    )
 
     # Initialize the current page in session state if it doesn't exist
     if 'page_number' not in st.session_state:
         st.session_state.page_number = 1
 
     total_rows = len(df)
-    total_pages = (total_rows - 1) // page_size + 1
+    total_pages = max(1, (total_rows - 1) // page_size + 1)
+    st.session_state.page_number = min(st.session_state.page_number, total_pages)
 
     # Create navigation buttons for pagination
     col1, col2, col3 = st.columns(3)
@@ -30,9 +61,15 @@ def issue_data_table(df):
     # Display the current page number and total pages
     st.write(f"Page {st.session_state.page_number} of {total_pages}")
 
-    # Calculate the index range for the current page and display the subset of the DataFrame
+    # The sort order is computed once per filter state and reused for every page;
+    # only the rows and columns of the visible page are materialized.
+    order = cached_view(
+        "issue_table_order", filter_state,
+        lambda: sort_order(df, sort_column, ascending),
+        sort_column, ascending
+    )
     start_idx = (st.session_state.page_number - 1) * page_size
     end_idx = start_idx + page_size
-    df_page = df.iloc[start_idx:end_idx]
+    df_page = df.iloc[order[start_idx:end_idx], [df.columns.get_loc(c) for c in columns]]
 
-    st.dataframe(df_page)
\ No newline at end of file
+    st.dataframe(df_page)
@@ -2,9 +2,19 @@ import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 from streamlit_app.visuals.maps.heatmap import render_heatmap
-from streamlit_app.visuals.maps.scatter_map import render_scatter_map
+from streamlit_app.visuals.maps.scatter_map import render_scatter_map, display_selected_issues
+from streamlit_app.visuals.maps.point_pyramid import pan_center
 
-def display_map(issue_mapping_df):
+# Pan buttons: label and the move right and down, as fractions of the clustered view's window.
+PAN_STEPS = [
+    ("← West", -0.4, 0),
+    ("↑ North", 0, -0.4),
+    ("↓ South", 0, 0.4),
+    ("→ East", 0.4, 0),
+]
+
+@st.fragment
+def display_map(issue_mapping_df, filter_state=None):
     """Displays the interactive map section with buttons for Clustered vs. Heatmap views."""
 
     st.subheader("Tacoma 311 Issues Map")
@@ -26,11 +36,34 @@ def display_map(issue_mapping_df):
         horizontal=True
     )
 
+    # Heatmap cells and clusters are computed on the server for this zoom level, which
+    # the browser does not report back, so zooming goes through the slider.
+    st.session_state.map_zoom = st.slider(
+        "Zoom level",
+        min_value=9,
+        max_value=16,
+        value=int(round(st.session_state.map_zoom)),
+        key="map_zoom_level"
+    )
+
+    # Clusters are computed for the area around the map center, so panning goes
+    # through these buttons too, and dragging the clustered map is turned off.
+    pan_columns = st.columns(len(PAN_STEPS) + 1)
+    for column, (label, right, down) in zip(pan_columns, PAN_STEPS):
+        if column.button(label, key=f"map_pan_{label}", use_container_width=True):
+            st.session_state.map_center_lat, st.session_state.map_center_lon = pan_center(
+                (st.session_state.map_center_lat, st.session_state.map_center_lon),
+                st.session_state.map_zoom, right, down
+            )
+    if pan_columns[-1].button("Recenter", key="map_recenter", use_container_width=True):
+        st.session_state.map_center_lat = issue_mapping_df['lat'].mean()
+        st.session_state.map_center_lon = issue_mapping_df['lng'].mean()
+
     # Choose the appropriate rendering function based on the selection.
     if map_view == "Heatmap":
-        fig = render_heatmap(issue_mapping_df)
+        fig = render_heatmap(issue_mapping_df, filter_state)
     else:
-        fig = render_scatter_map(issue_mapping_df)
+        fig = render_scatter_map(issue_mapping_df, filter_state)
 
     # Apply session state zoom & center settings.
     fig.update_layout(
@@ -39,8 +72,16 @@ def display_map(issue_mapping_df):
         mapbox_zoom=st.session_state.map_zoom
     )
 
-    # Render the chart
-    st.plotly_chart(fig, use_container_width=True)
+    # Render the chart; on the clustered view, selecting issues shows their descriptions.
+    # Wheel zoom is off so the drawn zoom always matches the zoom the server binned for.
+    if map_view == "Heatmap":
+        st.plotly_chart(fig, use_container_width=True, config={"scrollZoom": False})
+    else:
+        fig.update_layout(dragmode=False)
+        selection = st.plotly_chart(
+            fig, use_container_width=True, on_select="rerun", selection_mode="points", config={"scrollZoom": False}
+        )
+        display_selected_issues(issue_mapping_df, selection)
 
     # Manually update the stored map state after rendering.
     if fig.layout.mapbox.zoom is not None:
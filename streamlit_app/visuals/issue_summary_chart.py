@@ -1,21 +1,28 @@
 import streamlit as st
 import plotly.express as px
+from streamlit_app.analytics.counts import summary_counts, rollup_summary_counts
+from streamlit_app.data.load_rollup import query_rollup
+from streamlit_app.data.view_cache import cached_figure
 
-def display_issue_summary(filtered_df):
+def display_issue_summary(filtered_df, filter_state=None):
     """Function to display the horizontal bar chart for issue summary counts."""
     st.subheader("Issues by Type")
     st.markdown("Shows the most reported issues.")
 
-    # Compute summary counts
-    summary_counts = filtered_df['summary'].value_counts().sort_values(ascending=True)
+    # Display the chart, reusing the figure built for this filter state
+    st.plotly_chart(cached_figure("issue_summary", filter_state, lambda: issue_summary_figure(filtered_df, filter_state)))
+
+def issue_summary_figure(filtered_df, filter_state=None):
+    """Horizontal bar chart of issue counts per summary."""
+    # Compute summary counts, from the rollup cube when one is available
+    summary_rollup = query_rollup(filter_state, 'summary')
+    if summary_rollup is not None:
+        counts = rollup_summary_counts(summary_rollup)
+    else:
+        counts = summary_counts(filtered_df)
 
     # Create horizontal bar chart
-    fig_bar = px.bar(summary_counts, x=summary_counts.values, y=summary_counts.index, 
+    fig_bar = px.bar(counts, x=counts.values, y=counts.index, 
                      orientation='h', labels={'x': 'Count', 'y': 'Request Type'})
 
-    # Display the chart
-    st.plotly_chart(fig_bar)
-
-    # Compute resolution time
-    filtered_df['resolved_at'] = filtered_df[['acknowledged_at', 'closed_at']].min(axis=1)
-    filtered_df['time_to_resolution'] = (filtered_df['resolved_at'] - filtered_df['created_at']).dt.days
+    return fig_bar
@@ -2,13 +2,16 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-import uuid
+from streamlit_app.analytics.counts import issues_per_period, rollup_issues_per_period
+from streamlit_app.data.load_rollup import query_rollup
+from streamlit_app.data.view_cache import cached_figure
 
-def display_issues_over_time(df):
+@st.fragment
+def display_issues_over_time(df, filter_state=None):
     # Get the selected time granularity from the radio buttons.
     selected_grandularity, human_readable_time_unit = select_time_granularity(default="Week")
     
-    issues_created_by_time_period(df, selected_grandularity, human_readable_time_unit)
+    issues_created_by_time_period(df, selected_grandularity, human_readable_time_unit, filter_state)
 
     
 def select_time_granularity(default="Week"):
@@ -34,15 +37,28 @@ def select_time_granularity(default="Week"):
 
     return period_code, human_readable_time_unit
 
-def issues_created_by_time_period(df, period_code, human_readable_time_unit):
-    # Convert 'created_at' to the chosen time period.
-    df['time_period'] = df['created_at'].dt.to_period(period_code).apply(lambda r: r.start_time)
-    
-    # Count the number of issues per period.
-    time_series = df.groupby('time_period').count()['id']
+def issues_created_by_time_period(df, period_code, human_readable_time_unit, filter_state=None):
+    # Reuse the figure built for this filter state and granularity.
+    fig = cached_figure(
+        "issues_over_time", filter_state,
+        lambda: issues_over_time_figure(df, period_code, human_readable_time_unit, filter_state),
+        period_code
+    )
+
+    # A stable key lets the frontend keep the chart mounted across reruns.
+    return st.plotly_chart(fig, key=f"issues_chart_{period_code}_{human_readable_time_unit}")
+
+def issues_over_time_figure(df, period_code, human_readable_time_unit, filter_state=None):
+    """Line chart of the number of issues created per time period, with a label on each point."""
+    daily_rollup = query_rollup(filter_state, 'day')
+    if daily_rollup is not None:
+        # Roll the cube's daily counts up to the chosen time period.
+        time_series = rollup_issues_per_period(daily_rollup, period_code)
+    else:
+        # Count the number of issues per period.
+        time_series = issues_per_period(df, period_code)
     
-    # Convert the Series into a DataFrame for Plotly.
-    time_series_df = time_series.reset_index().rename(columns={'time_period': 'Date', 'id': 'Number of Issues'})
+    time_series_df = time_series.rename(columns={'time_period': 'Date', 'issue_count': 'Number of Issues'})
     
     # Create the line chart with markers.
     fig = px.line(
@@ -75,7 +91,5 @@ def issues_created_by_time_period(df, period_code, human_readable_time_unit):
         xaxis_title="Date",
         yaxis_title="Number of Issues"
     )
-    
-    # Generate a truly unique key using uuid4.
-    unique_key = f"issues_chart_{period_code}_{human_readable_time_unit}_{uuid.uuid4()}"
-    return st.plotly_chart(fig, key=unique_key)
+
+    return fig
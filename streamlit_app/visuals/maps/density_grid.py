@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+
+# Web maps draw the world 256 pixels wide at zoom 0, doubling with each zoom level.
+TILE_SIZE_PIXELS = 256
+
+def cell_size_degrees(zoom, latitude, cell_pixels):
+    """
+    Width and height in degrees of a grid cell that covers cell_pixels on screen
+    at the given zoom. Heights shrink with latitude so cells stay square on the map.
+    """
+    cell_lng = 360 / (TILE_SIZE_PIXELS * 2 ** zoom) * cell_pixels
+    cell_lat = cell_lng * np.cos(np.radians(latitude))
+    return cell_lng, cell_lat
+
+def bin_points(lat, lng, zoom, cell_pixels=4):
+    """
+    Aggregate points into square grid cells sized for the current zoom.
+
+    Returns one row per occupied cell with the mean position of its points
+    (lat, lng) and the number of points (weight), so the payload is bounded
+    by the number of cells instead of the number of points.
+    """
+    lat = np.asarray(lat, dtype=float)
+    lng = np.asarray(lng, dtype=float)
+    valid = ~(np.isnan(lat) | np.isnan(lng))
+    lat, lng = lat[valid], lng[valid]
+    if len(lat) == 0:
+        return pd.DataFrame({"lat": [], "lng": [], "weight": []})
+
+    cell_lng, cell_lat = cell_size_degrees(zoom, lat.mean(), cell_pixels)
+    column = np.floor(lng / cell_lng).astype(np.int64)
+    row = np.floor(lat / cell_lat).astype(np.int64)
+
+    # One integer key per cell, then sum positions and counts per key.
+    grid_width = column.max() - column.min() + 1
+    cell_keys = (row - row.min()) * grid_width + (column - column.min())
+    cell_codes, cells = np.unique(cell_keys, return_inverse=True)
+    weight = np.bincount(cells, minlength=len(cell_codes))
+    return pd.DataFrame({
+        "lat": np.bincount(cells, weights=lat, minlength=len(cell_codes)) / weight,
+        "lng": np.bincount(cells, weights=lng, minlength=len(cell_codes)) / weight,
+        "weight": weight,
+    })
@@ -0,0 +1,29 @@
+from shapely.geometry import shape, mapping
+
+def simplify_tracts(equity_geojson, tolerance):
+    """
+    Equity tract outlines simplified to the tolerance (in degrees), with the
+    objectid as the feature id and no other properties.
+    """
+    features = []
+    for feature in equity_geojson["features"]:
+        geometry = shape(feature["geometry"]).simplify(tolerance, preserve_topology=True)
+        features.append({
+            "type": "Feature",
+            "id": feature["properties"].get("objectid"),
+            "properties": {},
+            "geometry": round_coordinates(mapping(geometry)),
+        })
+
+    return {"type": "FeatureCollection", "features": features}
+
+def round_coordinates(geometry, digits=5):
+    """Round polygon coordinates (5 digits is about a meter) to shrink the payload."""
+    def round_ring(ring):
+        return [[round(x, digits), round(y, digits)] for x, y in ring]
+
+    if geometry["type"] == "Polygon":
+        coordinates = [round_ring(ring) for ring in geometry["coordinates"]]
+    else:
+        coordinates = [[round_ring(ring) for ring in polygon] for polygon in geometry["coordinates"]]
+    return {"type": geometry["type"], "coordinates": coordinates}
@@ -1,25 +1,34 @@
 import streamlit as st
 import plotly.graph_objects as go
-import hashlib
-import pandas as pd
+from streamlit_app.data.dataset_identity import view_key
+from streamlit_app.data.view_cache import cached_view
+from streamlit_app.visuals.maps.density_grid import bin_points
 
-def render_heatmap(issue_mapping_df):
-    df_hash = hashlib.md5(pd.util.hash_pandas_object(issue_mapping_df).values).hexdigest()
-    
+def render_heatmap(issue_mapping_df, filter_state=None):
     radius_value = st.slider(
         "Select radius for heatmap",
-        min_value=1, 
-        max_value=100, 
+        min_value=1,
+        max_value=100,
         value=2,
-        key=f"heatmap_radius_slider_{df_hash}"  # Unique key per dataset
+        key=view_key("heatmap_radius_slider", filter_state)  # Unique key per filtered dataset
+    )
+
+    # Bin issues into grid cells smaller than the smoothing radius at the current zoom,
+    # so the browser receives one weighted point per cell instead of one per issue.
+    zoom = st.session_state.map_zoom
+    cell_pixels = max(1, radius_value / 2)
+    cells = cached_view(
+        "heatmap_cells", filter_state,
+        lambda: bin_points(issue_mapping_df['lat'], issue_mapping_df['lng'], zoom=zoom, cell_pixels=cell_pixels),
+        zoom, cell_pixels
     )
 
     fig = go.Figure(go.Densitymapbox(
-        lat=issue_mapping_df['lat'],
-        lon=issue_mapping_df['lng'],
-        z=[1] * len(issue_mapping_df),  # Each point contributes equally
+        lat=cells['lat'],
+        lon=cells['lng'],
+        z=cells['weight'],  # Each cell contributes its issue count
         radius=radius_value,  # User-controlled radius
         colorscale="Viridis"
     ))
 
-    return fig
\ No newline at end of file
+    return fig
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+from streamlit_app.data.load_issues import load_issues
+
+# Quadtree depth of the finest cells; depth d splits the world into 2^d x 2^d cells.
+MAX_DEPTH = 24
+# Web maps draw the world 256 pixels wide at zoom 0, doubling with each zoom level.
+TILE_SIZE_PIXELS = 256
+# Clusters cover roughly this many screen pixels (256 / 16 = 2^4, so depth = zoom + 4).
+CLUSTER_CELL_PIXELS = 16
+CLUSTER_DEPTH_OFFSET = 4
+# Only issues in a window this many pixels wide and high around the map center are
+# clustered, so at most about (1400 / 16) x (700 / 16) clusters are sent at any zoom.
+VIEWPORT_PIXELS = (1400, 700)
+
+def to_world(lat, lng):
+    """Web Mercator world coordinates in [0, 1), x growing east and y growing south."""
+    lat = np.clip(lat, -85.05112878, 85.05112878)
+    x = (lng + 180) / 360
+    y = (1 - np.log(np.tan(np.radians(lat)) + 1 / np.cos(np.radians(lat))) / np.pi) / 2
+    return x, y
+
+def from_world(x, y):
+    """Latitude and longitude of Web Mercator world coordinates."""
+    lng = x * 360 - 180
+    lat = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * y))))
+    return lat, lng
+
+def viewport_bounds(center, zoom):
+    """World coordinates (left, top, right, bottom) of the viewport window around a (lat, lng) center."""
+    x, y = to_world(center[0], center[1])
+    scale = TILE_SIZE_PIXELS * 2 ** zoom
+    half_width, half_height = VIEWPORT_PIXELS[0] / 2 / scale, VIEWPORT_PIXELS[1] / 2 / scale
+    return x - half_width, y - half_height, x + half_width, y + half_height
+
+def pan_center(center, zoom, right, down):
+    """The (lat, lng) center moved by the given fractions of the viewport's width and height."""
+    x, y = to_world(center[0], center[1])
+    scale = TILE_SIZE_PIXELS * 2 ** zoom
+    lat, lng = from_world(x + right * VIEWPORT_PIXELS[0] / scale, y + down * VIEWPORT_PIXELS[1] / scale)
+    return float(lat), float(lng)
+
+def spread_bits(values):
+    """Insert a zero bit between each of the low 32 bits of values."""
+    v = values.astype(np.uint64)
+    for shift, mask in [(16, 0x0000FFFF0000FFFF), (8, 0x00FF00FF00FF00FF), (4, 0x0F0F0F0F0F0F0F0F),
+                        (2, 0x3333333333333333), (1, 0x5555555555555555)]:
+        v = (v | (v << np.uint64(shift))) & np.uint64(mask)
+    return v
+
+def build_point_pyramid(df):
+    """
+    Sort issue locations along a Morton (Z-order) curve of quadtree cells.
+
+    Every quadtree cell at every depth is then a contiguous run of the sorted
+    codes, so clusters for any zoom come from one linear pass without re-sorting.
+    Rows without coordinates are left out.
+    """
+    lat = df['lat'].to_numpy(dtype=float)
+    lng = df['lng'].to_numpy(dtype=float)
+    positions = np.flatnonzero(~(np.isnan(lat) | np.isnan(lng)))
+    x, y = to_world(lat[positions], lng[positions])
+
+    cells = 2 ** MAX_DEPTH
+    column = np.clip((x * cells).astype(np.int64), 0, cells - 1)
+    row = np.clip((y * cells).astype(np.int64), 0, cells - 1)
+    morton = spread_bits(column) | (spread_bits(row) << np.uint64(1))
+
+    order = np.argsort(morton, kind='stable')
+    return {
+        "row_count": len(df),
+        "morton": morton[order],
+        "positions": positions[order],
+        "x": x[order],
+        "y": y[order],
+        "lat": lat[positions][order],
+        "lng": lng[positions][order],
+    }
+
+@st.cache_resource
+def load_point_pyramid():
+    """Builds the point pyramid over the loaded issues once per process."""
+    return build_point_pyramid(load_issues())
+
+def cluster_points(pyramid, positions, zoom, center=None):
+    """
+    Cluster the given row positions into quadtree cells about
+    CLUSTER_CELL_PIXELS across at the zoom level.
+
+    With a map center (lat, lng), only issues in the VIEWPORT_PIXELS window
+    around it are clustered, which bounds the number of clusters at any zoom.
+    Returns one row per cluster with its mean lat/lng, its issue count and the
+    row position of one member (the issue itself for single-issue clusters).
+    """
+    selected = np.zeros(pyramid["row_count"], dtype=bool)
+    selected[positions] = True
+    keep = selected[pyramid["positions"]]
+    if center is not None:
+        left, top, right, bottom = viewport_bounds(center, zoom)
+        keep &= (pyramid["x"] >= left) & (pyramid["x"] <= right) & (pyramid["y"] >= top) & (pyramid["y"] <= bottom)
+
+    morton = pyramid["morton"][keep]
+    if len(morton) == 0:
+        return pd.DataFrame({"lat": [], "lng": [], "count": [], "position": []})
+
+    # Each run of equal keys is one cluster.
+    depth = int(np.clip(round(zoom) + CLUSTER_DEPTH_OFFSET, 0, MAX_DEPTH))
+    keys = morton >> np.uint64(2 * (MAX_DEPTH - depth))
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+
+    counts = np.diff(np.r_[starts, len(keys)])
+    return pd.DataFrame({
+        "lat": np.add.reduceat(pyramid["lat"][keep], starts) / counts,
+        "lng": np.add.reduceat(pyramid["lng"][keep], starts) / counts,
+        "count": counts,
+        "position": pyramid["positions"][keep][starts],
+    })
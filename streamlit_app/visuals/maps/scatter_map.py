@@ -1,20 +1,51 @@
 import streamlit as st
-import plotly.express as px
+import numpy as np
+import plotly.graph_objects as go
+from streamlit_app.data.view_cache import cached_view
+from streamlit_app.visuals.maps.point_pyramid import load_point_pyramid, cluster_points
 
-def render_scatter_map(issue_mapping_df):
-    fig = px.scatter_mapbox(
-        issue_mapping_df, 
-        lat="lat", lon="lng", 
-        hover_data=["description", "status"],
-        mapbox_style="open-street-map", 
-        zoom=st.session_state.map_zoom,  # Keep last zoom level
-        center={"lat": st.session_state.map_center_lat, "lon": st.session_state.map_center_lon},  # Keep last center
-        color_discrete_sequence=["yellow"],  # Use a consistent color
+def render_scatter_map(issue_mapping_df, filter_state=None):
+    # Cluster on the server from the precomputed point pyramid, only around the map
+    # center so the payload stays bounded; descriptions are loaded when a point is selected.
+    zoom = st.session_state.map_zoom
+    center = (st.session_state.map_center_lat, st.session_state.map_center_lon)
+    clusters = cached_view(
+        "scatter_clusters", filter_state,
+        lambda: cluster_points(load_point_pyramid(), issue_mapping_df.index.to_numpy(), zoom, center),
+        zoom, center
     )
 
-    fig.update_traces(
-        marker=dict(size=6, opacity=0.8),  # Adjust marker appearance
-        cluster=dict(enabled=True)  # Enable clustering
-    )
+    single = clusters['count'].eq(1).to_numpy()
+    status = np.full(len(clusters), "", dtype=object)
+    status[single] = issue_mapping_df.loc[clusters.loc[single, 'position'], 'status'].astype(str).to_numpy()
+    hover_text = np.where(single, status, clusters['count'].astype(str) + " issues")
+
+    fig = go.Figure(go.Scattermapbox(
+        lat=clusters['lat'],
+        lon=clusters['lng'],
+        mode="markers+text",
+        text=np.where(single, "", clusters['count'].astype(str)),
+        hovertext=hover_text,
+        hoverinfo="text",
+        customdata=clusters[['position', 'count']],
+        marker=dict(
+            size=np.where(single, 6, 10 + 4 * np.sqrt(clusters['count'])),  # Bubble area follows issue count
+            color="yellow",
+            opacity=0.8
+        )
+    ))
 
     return fig
+
+def display_selected_issues(issue_mapping_df, selection):
+    """Shows the description and status of the issues selected on the scatter map."""
+    points = selection.get("selection", {}).get("points", []) if selection else []
+    positions = [point["customdata"][0] for point in points if point.get("customdata") and point["customdata"][1] == 1]
+    if points and not positions:
+        st.caption("Zoom in to select individual issues.")
+    if positions:
+        st.dataframe(
+            issue_mapping_df.loc[positions, ['created_at', 'summary', 'status', 'description']],
+            hide_index=True,
+            use_container_width=True
+        )
@@ -0,0 +1,99 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from streamlit_app.data.load_pipeline_metrics import load_pipeline_metrics, metric_series, histogram_quantiles
+
+# A task with no metrics for longer than this is flagged as stalled.
+# The fetch DAG runs every 6 hours and the export DAG hourly.
+STALL_AFTER = {
+    "store_data": pd.Timedelta(hours=12),
+    "export_to_parquet": pd.Timedelta(hours=3),
+}
+
+def display_pipeline_health():
+    """Charts the Airflow pipeline's throughput and data freshness from the metrics its tasks record."""
+    st.subheader("Pipeline Health")
+
+    metrics = load_pipeline_metrics()
+    if metrics is None or metrics.empty:
+        st.info("No pipeline metrics yet. The Airflow tasks record them in the pipeline_metrics table as they run.")
+        return
+
+    now = pd.Timestamp.now(tz="UTC").tz_localize(None)
+    for task_id, stall_after in STALL_AFTER.items():
+        task_runs = metrics[metrics['task_id'] == task_id]
+        if task_runs.empty:
+            continue
+        last_run = task_runs['recorded_at'].max()
+        if now - last_run > stall_after:
+            st.warning(f"{task_id} last recorded metrics {(now - last_run).total_seconds() / 3600:.1f} hours ago.")
+
+    # --- Freshness
+    freshness = metric_series(metrics, "freshness_lag_seconds")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        latest_export = freshness[freshness['task_id'] == "export_to_parquet"]
+        st.metric("Export Freshness Lag (hours)", "N/A" if latest_export.empty else round(latest_export['value'].iloc[-1] / 3600, 1))
+    with col2:
+        fetched = metric_series(metrics, "issues_fetched")
+        st.metric("Issues Fetched (last run)", "N/A" if fetched.empty else int(fetched['value'].iloc[-1]))
+    with col3:
+        exported = metric_series(metrics, "rows_exported")
+        st.metric("Rows Exported (last run)", "N/A" if exported.empty else int(exported['value'].iloc[-1]))
+
+    if not freshness.empty:
+        freshness['hours'] = freshness['value'] / 3600
+        fig = px.line(
+            freshness, x='recorded_at', y='hours', color='task_id', markers=True,
+            title="Freshness Lag: Newest Change Behind Now",
+            labels={'recorded_at': 'Run', 'hours': 'Hours', 'task_id': 'Task'}
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    # --- Throughput
+    throughput = pd.concat([
+        metric_series(metrics, name).assign(measure=label)
+        for name, label in [
+            ("issues_fetched", "Issues fetched"),
+            ("rows_inserted", "Rows inserted"),
+            ("rows_updated", "Rows updated"),
+            ("rows_failed", "Rows failed"),
+        ]
+    ])
+    if not throughput.empty:
+        fig = px.bar(
+            throughput, x='recorded_at', y='value', color='measure', barmode='group',
+            title="Fetch and Store Throughput per Run",
+            labels={'recorded_at': 'Run', 'value': 'Rows', 'measure': ''}
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    latency = histogram_quantiles(metrics, "request_latency_seconds")
+    if not latency.empty:
+        fig = px.line(
+            latency.melt(id_vars=['recorded_at', 'run_id'], var_name='quantile', value_name='seconds'),
+            x='recorded_at', y='seconds', color='quantile', markers=True,
+            title="API Request Latency per Fetch Run (bucket upper bound)",
+            labels={'recorded_at': 'Run', 'seconds': 'Seconds', 'quantile': ''}
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    # --- Export cost
+    enrichment = metric_series(metrics, "enrichment_seconds", label="layer")
+    if not enrichment.empty:
+        fig = px.bar(
+            enrichment, x='recorded_at', y='value', color='layer',
+            title="Export Enrichment Time by Layer",
+            labels={'recorded_at': 'Run', 'value': 'Seconds', 'layer': 'Layer'}
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+    written = metric_series(metrics, "parquet_bytes_written")
+    if not written.empty:
+        written['megabytes'] = written['value'] / (1024 * 1024)
+        fig = px.line(
+            written, x='recorded_at', y='megabytes', markers=True,
+            title="Parquet Export Size",
+            labels={'recorded_at': 'Run', 'megabytes': 'MB'}
+        )
+        st.plotly_chart(fig, use_container_width=True)